@@ -0,0 +1,150 @@
+# assetBake.py
+"""
+Bakes every background, map and sprite sheet the game loads into raw display-format pixels.
+
+Each image is decoded, scaled to the size the game asks for and converted exactly like
+AssetCache does at runtime, then written as a BGRA blob next to a manifest recording the
+source file's content hash. At runtime bakedAssets memory-maps the blobs (no decoding) and
+falls back to the source file whenever its hash no longer matches.
+
+Examples:
+    python assetBake.py            # bake everything, then report load time savings per asset
+    python assetBake.py --check    # list stale or missing bakes (exit code 1 if there are any)
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+
+import pygame
+import config
+import assetCache
+import bakedAssets
+import levelSelectMap
+
+# Images loaded outside the fight stages: (path, size, pixel format)
+UI_IMAGES = [
+    ("assests/bootUpscreen.jpg", None, assetCache.FORMAT_OPAQUE),
+    ("assests/DiologBG.jpg", None, assetCache.FORMAT_OPAQUE),
+    (levelSelectMap.MAP_IMAGE_PATH, levelSelectMap.map_display_size(), assetCache.FORMAT_ALPHA),
+    ("assests/sprites/EmployeePlaceHolder_Male.png", None, assetCache.FORMAT_ALPHA),
+    ("assests/sprites/EmployeePlaceHolder_Female.bmp", None, assetCache.FORMAT_ALPHA),
+]
+
+def bake_targets():
+    """Asset cache keys of every image worth baking (UI images, stage backgrounds, sprite sheets or atlas)."""
+    import stages
+    from fightingLogic.fightingLogic import CHARACTER_SPRITE_SHEETS
+
+    keys = [assetCache.asset_cache.make_key(path, size, pixel_format=pixel_format)
+            for path, size, pixel_format in UI_IMAGES]
+    for stage_id in stages.STAGE_REGISTRY:
+        spec = stages.get_stage_spec(stage_id)
+        for character_name in CHARACTER_SPRITE_SHEETS:
+            keys.extend(spec.asset_keys(character_name))
+    return list(dict.fromkeys(keys)) # Drop duplicates, keep order
+
+def blob_name(key):
+    entry_id = bakedAssets.key_id(key)
+    base = os.path.splitext(os.path.basename(key[0]))[0]
+    return f"{base}-{hashlib.blake2b(entry_id.encode(), digest_size=4).hexdigest()}.bgra"
+
+def decode_from_source(key):
+    """Decodes key the way the game does without a bake."""
+    path, size, flip, pixel_format = key
+    return assetCache.convert_surface(assetCache.decode_image(path, size, flip), pixel_format)
+
+def bake(keys, directory):
+    """Writes a blob per key plus the manifest. Returns the manifest."""
+    os.makedirs(directory, exist_ok=True)
+    assets = {}
+    for key in keys:
+        try:
+            surface = decode_from_source(key)
+        except (pygame.error, OSError) as e:
+            print(f"Skipping {key[0]}: {e}")
+            continue
+        name = blob_name(key)
+        with open(os.path.join(directory, name), "wb") as blob:
+            blob.write(pygame.image.tobytes(surface, bakedAssets.BYTE_FORMAT))
+        assets[bakedAssets.key_id(key)] = {
+            "source": key[0],
+            "source_hash": bakedAssets.file_hash(key[0]),
+            "size": list(surface.get_size()),
+            "pixel_format": key[3],
+            "blob": name,
+        }
+        print(f"Baked {bakedAssets.key_id(key)} -> {name}")
+
+    manifest = {"version": bakedAssets.MANIFEST_VERSION, "byte_format": bakedAssets.BYTE_FORMAT, "assets": assets}
+    with open(os.path.join(directory, bakedAssets.MANIFEST_NAME), "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    return manifest
+
+def check(keys, directory):
+    """Returns the keys whose bake is missing or stale."""
+    baked = bakedAssets.BakedAssets(directory)
+    entries = baked.get_manifest()["assets"]
+    outdated = []
+    for key in keys:
+        entry = entries.get(bakedAssets.key_id(key))
+        if entry is None or not baked.is_fresh(entry):
+            outdated.append(key)
+    return outdated
+
+def _best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - started) * 1000.0)
+    return best
+
+def report(keys, directory, repeats=3):
+    """Prints source decode time vs baked load time (including the hash check) for every key."""
+    print(f"{'asset':<64} {'decode':>9} {'baked':>9} {'saved':>9}")
+    total_decode = total_baked = 0.0
+    for key in keys:
+        opaque = key[3] == assetCache.FORMAT_OPAQUE
+        # A fresh BakedAssets every time, so the source hash is checked like on a real startup
+        if bakedAssets.BakedAssets(directory).load(key, opaque) is None:
+            print(f"{bakedAssets.key_id(key):<64} {'not baked or stale':>29}")
+            continue
+        decode_ms = _best_of(lambda: decode_from_source(key), repeats)
+        baked_ms = _best_of(lambda: bakedAssets.BakedAssets(directory).load(key, opaque), repeats)
+        total_decode += decode_ms
+        total_baked += baked_ms
+        print(f"{bakedAssets.key_id(key):<64} {decode_ms:7.2f}ms {baked_ms:7.2f}ms {decode_ms - baked_ms:7.2f}ms")
+    print(f"{'total':<64} {total_decode:7.2f}ms {total_baked:7.2f}ms {total_decode - total_baked:7.2f}ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bake images into memory-mappable display-format pixels.")
+    parser.add_argument("--out", default=config.BAKED_ASSET_DIR, help="Bake directory (default: config.BAKED_ASSET_DIR)")
+    parser.add_argument("--check", action="store_true", help="Only list missing or stale bakes")
+    parser.add_argument("--no-report", action="store_true", help="Skip the load time comparison")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    # Same display format as the game, so the converted pixels match what it would produce
+    pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    keys = bake_targets()
+
+    if args.check:
+        outdated = check(keys, args.out)
+        for key in outdated:
+            print(f"Needs baking: {bakedAssets.key_id(key)}")
+        print(f"{len(keys) - len(outdated)} of {len(keys)} images baked and up to date")
+        return 1 if outdated else 0
+
+    bake(keys, args.out)
+    if not args.no_report:
+        report(keys, args.out)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+# assetCache.py
+import os
+from collections import OrderedDict
+
+import pygame
+import config
+import bakedAssets
+
+# Pixel formats a cached surface can be converted to
+FORMAT_OPAQUE = "opaque"   # Surface.convert()
+FORMAT_ALPHA = "alpha"     # Surface.convert_alpha()
+FORMAT_RAW = "raw"         # Left exactly as decoded (no display needed)
+
+
+def surface_bytes(surface):
+    """Returns how much pixel memory a surface holds."""
+    return surface.get_pitch() * surface.get_height()
+
+
+def decode_image(path, size=None, flip=(False, False)):
+    """
+    Decodes, scales and flips an image without converting it to the display format.
+
+    Nothing here needs the display, so it is safe to call from a worker thread
+    (see assetPreloader). Scaling before conversion gives the same pixels, since
+    pygame.transform.scale is nearest neighbour.
+    """
+    surface = pygame.image.load(path)
+    if size is not None and surface.get_size() != size:
+        surface = pygame.transform.scale(surface, size)
+    if flip[0] or flip[1]:
+        surface = pygame.transform.flip(surface, flip[0], flip[1])
+    return surface
+
+
+def load_baked(key):
+    """Returns the baked, display-ready surface for key if assetBake.py produced an up to date one."""
+    if key[3] == FORMAT_RAW:
+        return None
+    return bakedAssets.baked_assets.load(key, opaque=key[3] == FORMAT_OPAQUE)
+
+
+def convert_surface(surface, pixel_format):
+    """Converts a decoded surface to the display's pixel format (main thread only)."""
+    if pixel_format == FORMAT_ALPHA:
+        return surface.convert_alpha()
+    if pixel_format == FORMAT_OPAQUE:
+        return surface.convert()
+    return surface
+
+
+class AssetCache:
+    """
+    Process-wide cache of decoded images.
+
+    Entries are keyed by (path, target size, flip, pixel format) so a stage that asks
+    for its 1000x700 background twice only decodes the file once. Least recently used
+    entries are evicted once the byte budget is exceeded.
+    """
+
+    def __init__(self, budget_bytes=config.ASSET_CACHE_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()  # key -> (surface, size_in_bytes)
+        self.bytes_held = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(path, size=None, flip=(False, False), pixel_format=FORMAT_OPAQUE):
+        """Builds the cache key for a request, normalising the path and size."""
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+        if isinstance(flip, bool):
+            flip = (flip, False)
+        return (os.path.normpath(path), size, tuple(flip), pixel_format)
+
+    def load_image(self, path, size=None, flip=False, pixel_format=FORMAT_OPAQUE):
+        """
+        Returns the decoded (and optionally scaled/flipped/converted) image for path.
+
+        The returned surface is shared between all callers, so it must be treated as
+        read-only. Raises the same errors as pygame.image.load.
+
+        Args:
+            path (str): Image file to load.
+            size (tuple): Optional (width, height) to scale the image to.
+            flip (bool | tuple): Horizontal flip, or an (x, y) flip pair.
+            pixel_format (str): FORMAT_OPAQUE, FORMAT_ALPHA or FORMAT_RAW.
+        """
+        key = self.make_key(path, size, flip, pixel_format)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        surface = load_baked(key) or self._decode(path, key[1], key[2], pixel_format)
+        self.put(key, surface)
+        return surface
+
+    def _decode(self, path, size, flip, pixel_format):
+        return convert_surface(decode_image(path, size, flip), pixel_format)
+
+    def __contains__(self, key):
+        """True if key is cached (doesn't count as a use or a hit)."""
+        return key in self._entries
+
+    def get(self, key):
+        """Returns the cached surface for key without loading it (None on a miss)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, surface):
+        """Stores an already prepared surface under key, evicting old entries if needed."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes_held -= old[1]
+
+        size_in_bytes = surface_bytes(surface)
+        self._entries[key] = (surface, size_in_bytes)
+        self.bytes_held += size_in_bytes
+        self._evict()
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone is over budget
+        while self.bytes_held > self.budget_bytes and len(self._entries) > 1:
+            _, (_, size_in_bytes) = self._entries.popitem(last=False)
+            self.bytes_held -= size_in_bytes
+            self.evictions += 1
+
+    def set_budget(self, budget_bytes):
+        """Changes the byte budget and evicts immediately if the cache is now too big."""
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def clear(self):
+        """Drops every cached surface (statistics are kept)."""
+        self._entries.clear()
+        self.bytes_held = 0
+
+    def get_stats(self):
+        """Returns hit/miss/byte counters, handy for sizing the budget."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes_held": self.bytes_held,
+            "budget_bytes": self.budget_bytes,
+        }
+
+
+# The shared cache used by screens, the level select map, stages and sprite sheets
+asset_cache = AssetCache()
+
+
+def load_image(path, size=None, flip=False, pixel_format=FORMAT_OPAQUE):
+    """Loads an image through the shared asset cache."""
+    return asset_cache.load_image(path, size, flip, pixel_format)
+
+
+def get_stats():
+    """Returns the shared asset cache statistics."""
+    return asset_cache.get_stats()
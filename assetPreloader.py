@@ -0,0 +1,169 @@
+# assetPreloader.py
+import threading
+import time
+from collections import deque
+
+import pygame
+import config
+import assetCache
+
+class AssetPreloader:
+    """
+    Decodes images on a worker thread before they are needed and hands them to the asset cache.
+
+    The worker maps baked images or decodes, scales and flips the source (assetCache.decode_image).
+    Converting to the display format has to happen on the main thread, so finished images wait until pump() is called from the
+    game loop. Requests are asset cache keys (AssetCache.make_key). Speculative requests are dropped
+    once the images this preloader put in the cache would go over memory_cap_bytes; requests for
+    something the player is pointing at are always loaded.
+    """
+    def __init__(self, cache=None, memory_cap_bytes=config.PRELOAD_MEMORY_CAP_BYTES):
+        self.cache = cache or assetCache.asset_cache
+        self.memory_cap_bytes = memory_cap_bytes
+
+        self._condition = threading.Condition()
+        self._pending = deque()      # (key, speculative) waiting for the worker, in order
+        self._in_flight = None       # key the worker is decoding
+        self._finished = deque()     # (key, speculative, surface or None on error, display ready)
+        self._preloaded_bytes = {}   # key -> bytes, for images this preloader put in the cache
+        self._thread = None
+
+        self.stats = {"decoded": 0, "converted": 0, "cancelled": 0, "over_cap": 0, "errors": 0}
+
+    # --- REQUESTS (main thread) ---
+
+    def request(self, keys, speculative=False):
+        """
+        Queues images for decoding. Non-speculative requests jump ahead of speculative ones.
+
+        Keys that are already cached, queued or being decoded are ignored.
+        """
+        with self._condition:
+            queued = {job[0] for job in self._pending} | {job[0] for job in self._finished}
+            new_jobs = [(key, speculative) for key in keys
+                        if key not in self.cache and key not in queued and key != self._in_flight]
+            if speculative:
+                if self.held_bytes() >= self.memory_cap_bytes:
+                    self.stats["over_cap"] += len(new_jobs)
+                    return
+                self._pending.extend(new_jobs)
+            else:
+                # Keep the new jobs in order, ahead of everything already queued
+                self._pending.extendleft(reversed(new_jobs))
+            if new_jobs:
+                self._start_worker()
+                self._condition.notify()
+
+    def cancel(self, keep=()):
+        """Drops queued jobs (except keys in keep). An image already being decoded still finishes."""
+        keep = set(keep)
+        with self._condition:
+            kept = deque(job for job in self._pending if job[0] in keep)
+            self.stats["cancelled"] += len(self._pending) - len(kept)
+            self._pending = kept
+
+    def is_ready(self, keys):
+        """True when every key is in the asset cache."""
+        return all(key in self.cache for key in keys)
+
+    def busy(self):
+        """True while images are queued, being decoded or waiting for pump()."""
+        with self._condition:
+            return bool(self._pending or self._in_flight is not None or self._finished)
+
+    def held_bytes(self):
+        """Bytes of preloaded images that are still in the asset cache."""
+        for key in [key for key in self._preloaded_bytes if key not in self.cache]:
+            del self._preloaded_bytes[key] # Evicted (or cleared) since
+        return sum(self._preloaded_bytes.values())
+
+    # --- MAIN THREAD HAND-OFF ---
+
+    def pump(self, budget_ms=config.PRELOAD_PUMP_BUDGET_MS):
+        """Converts finished images and puts them in the cache until budget_ms is used up."""
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        converted = 0
+        while True:
+            with self._condition:
+                if not self._finished:
+                    break
+                key, speculative, surface, display_ready = self._finished.popleft()
+            if surface is not None:
+                if not display_ready:
+                    surface = assetCache.convert_surface(surface, key[3])
+                size_in_bytes = assetCache.surface_bytes(surface)
+                if speculative and self.held_bytes() + size_in_bytes > self.memory_cap_bytes:
+                    self.stats["over_cap"] += 1
+                else:
+                    self.cache.put(key, surface)
+                    self._preloaded_bytes[key] = size_in_bytes
+                    self.stats["converted"] += 1
+                    converted += 1
+            if time.perf_counter() >= deadline:
+                break
+        return converted
+
+    def wait_for(self, keys, timeout=10.0):
+        """
+        Makes sure keys are cached before returning: drops every other queued job, queues missing
+        keys, then waits for the worker. Returns False if it timed out (callers just load normally).
+        """
+        keys = list(keys)
+        self.cancel(keep=keys)
+        self.request(keys)
+        deadline = time.perf_counter() + timeout
+        while True:
+            self.pump(budget_ms=float("inf"))
+            if self.is_ready(keys):
+                return True
+            with self._condition:
+                busy = self._pending or self._in_flight is not None or self._finished
+                if not busy:
+                    return False # Failed to decode; the caller's own load will report the error
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False
+                if not self._finished:
+                    self._condition.wait(remaining)
+
+    # --- WORKER THREAD ---
+
+    def _start_worker(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="AssetPreloader", daemon=True)
+            self._thread.start()
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                key, speculative = self._pending.popleft()
+                self._in_flight = key
+
+            path, size, flip, _ = key
+            # Baked images come back display-ready; anything else is decoded for pump() to convert
+            surface = assetCache.load_baked(key)
+            display_ready = surface is not None
+            if surface is None:
+                try:
+                    surface = assetCache.decode_image(path, size, flip)
+                except (pygame.error, OSError) as e:
+                    print(f"Preloading {path} failed: {e}")
+
+            with self._condition:
+                self._finished.append((key, speculative, surface, display_ready))
+                self._in_flight = None
+                self.stats["decoded" if surface is not None else "errors"] += 1
+                self._condition.notify_all()
+
+    def get_stats(self):
+        with self._condition:
+            stats = dict(self.stats)
+            stats["queued"] = len(self._pending)
+            stats["waiting_for_main_thread"] = len(self._finished)
+        stats["held_bytes"] = self.held_bytes()
+        return stats
+
+# Shared preloader used by the level select map
+preloader = AssetPreloader()
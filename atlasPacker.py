@@ -0,0 +1,165 @@
+# atlasPacker.py
+"""
+Packs every fighter animation frame into one texture atlas plus a JSON frame index.
+
+Frames are cut from each character's sprite sheet with the same layout the game uses
+(fightingLogic.CHARACTER_FRAME_LAYOUT), trimmed to their non-transparent pixels, stored for
+both facings (so nothing is flipped at runtime) and de-duplicated. The index records each
+frame's rectangle in the atlas and its offset inside the full SPRITE_FRAME_SIZE cell, so
+trimmed frames are drawn exactly where the untrimmed ones were. At runtime
+fightingLogic.spriteAtlas hands the frames out as subsurfaces of the atlas.
+
+Example:
+    python atlasPacker.py          # writes config.SPRITE_ATLAS_INDEX and the atlas image next to it
+    python assetBake.py            # optional: bake the atlas too, so it is memory-mapped at runtime
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import sys
+import time
+
+import pygame
+import config
+import assetCache
+import bakedAssets
+
+PADDING = 1 # Transparent pixels between frames
+
+def cut_cells(sheet, layout, cell_size):
+    """Yields (state, index, cell surface) with off-sheet parts left transparent, like Spritesheet."""
+    for state, cells in layout.items():
+        for i, (x, y) in enumerate(cells):
+            cell = pygame.Surface(cell_size, pygame.SRCALPHA)
+            cell.blit(sheet, (0, 0), (x, y, cell_size[0], cell_size[1]))
+            yield state, i, cell
+
+def trim(cell):
+    """Returns (trimmed copy, offset of its top-left inside the cell)."""
+    bounds = cell.get_bounding_rect(min_alpha=1)
+    if bounds.width == 0 or bounds.height == 0:
+        bounds = pygame.Rect(0, 0, 1, 1) # Fully transparent frame
+    return cell.subsurface(bounds).copy(), bounds.topleft
+
+def shelf_pack(sizes, max_width):
+    """
+    Places rectangles on shelves, tallest first. Returns (positions in input order, atlas size).
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    positions = [None] * len(sizes)
+    x = y = shelf_height = used_width = 0
+    for i in order:
+        w, h = sizes[i]
+        if x and x + w > max_width:
+            y += shelf_height + PADDING
+            x = shelf_height = 0
+        positions[i] = (x, y)
+        x += w + PADDING
+        used_width = max(used_width, x - PADDING)
+        shelf_height = max(shelf_height, h)
+    return positions, (max(used_width, 1), max(y + shelf_height, 1))
+
+def build_atlas(sheets, layout, cell_size, max_width):
+    """
+    sheets maps character name -> sprite sheet path. Returns (atlas surface, index dict).
+    """
+    from fightingLogic import fightingLogic
+    frames = []        # (surface, offset)
+    frame_ids = {}     # (pixels, size, offset) -> frame id, to store identical frames once
+    characters = {}
+    for character_name, path in sheets.items():
+        sheet = pygame.image.load(path).convert_alpha()
+        # Record the sheet's background color for FrameBank's hit masks (the frames can't tell)
+        mask_key = fightingLogic.background_key(sheet)
+        entry = {"source": path, "source_hash": bakedAssets.file_hash(path),
+                 "mask_key": list(mask_key) if mask_key else None, "right": {}, "left": {}}
+        for state, i, cell in cut_cells(sheet, layout, cell_size):
+            for facing, surface in (("right", cell), ("left", pygame.transform.flip(cell, True, False))):
+                trimmed, offset = trim(surface)
+                identity = (pygame.image.tobytes(trimmed, "RGBA"), trimmed.get_size(), offset)
+                if identity not in frame_ids:
+                    frame_ids[identity] = len(frames)
+                    frames.append((trimmed, offset))
+                entry[facing].setdefault(state, []).append(frame_ids[identity])
+        characters[character_name] = entry
+
+    positions, atlas_size = shelf_pack([surface.get_size() for surface, _ in frames], max_width)
+    atlas = pygame.Surface(atlas_size, pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    index_frames = []
+    for (surface, offset), position in zip(frames, positions):
+        atlas.blit(surface, position)
+        index_frames.append({"rect": [position[0], position[1], surface.get_width(), surface.get_height()],
+                             "offset": list(offset)})
+
+    from fightingLogic import spriteAtlas
+    index = {
+        "version": spriteAtlas.INDEX_VERSION,
+        "frame_size": list(cell_size),
+        "layout": spriteAtlas.layout_signature(layout),
+        "characters": characters,
+        "frames": index_frames,
+    }
+    return atlas, index
+
+def report(sheets, layout, cell_size):
+    """Compares loading the sheets and slicing/flipping frames against loading the atlas."""
+    from fightingLogic import fightingLogic, spriteAtlas
+    spriteAtlas.reload_index()
+
+    def build_banks(use_atlas):
+        assetCache.asset_cache.clear()
+        fightingLogic._frame_banks.clear()
+        started = time.perf_counter()
+        for character_name, path in sheets.items():
+            if use_atlas:
+                frames = spriteAtlas.load_character(character_name, path, layout)
+                surfaces = [s for animations in (frames[0], frames[2]) for s in animations.values()]
+            else:
+                bank = fightingLogic.FrameBank(fightingLogic._slice_character_frames(fightingLogic.Spritesheet(path), *cell_size))
+                surfaces = list(bank.animations.values()) + list(bank.flipped_animations.values())
+        elapsed = (time.perf_counter() - started) * 1000.0
+        # Resident pixels: everything the cache holds plus frames that own their pixels (not subsurfaces)
+        own_frames = {id(frame): frame for frame_list in surfaces for frame in frame_list if frame.get_parent() is None}
+        resident = assetCache.get_stats()["bytes_held"] + sum(assetCache.surface_bytes(f) for f in own_frames.values())
+        return elapsed, resident
+
+    sheet_ms, sheet_bytes = build_banks(False)
+    atlas_ms, atlas_bytes = build_banks(True)
+    print(f"sheets: {sheet_ms:7.1f} ms, {sheet_bytes / 1024 / 1024:6.1f} MB of pixels")
+    print(f"atlas:  {atlas_ms:7.1f} ms, {atlas_bytes / 1024 / 1024:6.1f} MB of pixels")
+
+def main(argv=None):
+    from fightingLogic import fightingLogic
+    parser = argparse.ArgumentParser(description="Pack fighter animation frames into a texture atlas.")
+    parser.add_argument("--index", default=config.SPRITE_ATLAS_INDEX, help="Index file to write (the atlas PNG goes next to it)")
+    parser.add_argument("--max-width", type=int, default=2048, help="Maximum atlas width in pixels")
+    parser.add_argument("--no-report", action="store_true", help="Skip the load time / memory comparison")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT)) # convert_alpha needs a display
+
+    sheets = dict(fightingLogic.CHARACTER_SPRITE_SHEETS)
+    layout = fightingLogic.CHARACTER_FRAME_LAYOUT
+    cell_size = fightingLogic.SPRITE_FRAME_SIZE
+    atlas, index = build_atlas(sheets, layout, cell_size, args.max_width)
+
+    directory = os.path.dirname(args.index) or "."
+    os.makedirs(directory, exist_ok=True)
+    index["image"] = os.path.splitext(os.path.basename(args.index))[0] + ".png"
+    pygame.image.save(atlas, os.path.join(directory, index["image"]))
+    with open(args.index, "w") as index_file:
+        json.dump(index, index_file, indent=2)
+    print(f"Packed {len(index['frames'])} frames for {len(sheets)} characters into a "
+          f"{atlas.get_width()}x{atlas.get_height()} atlas ({args.index})")
+
+    if not args.no_report and args.index == config.SPRITE_ATLAS_INDEX:
+        report(sheets, layout, cell_size)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# bakedAssets.py
+"""
+Loads images baked by assetBake.py: raw display-format pixels memory-mapped straight into a Surface.
+
+A baked image is only used while its source file still has the content hash recorded in the
+manifest; a stale or missing bake returns None and the caller decodes the original file instead.
+"""
+import hashlib
+import json
+import mmap
+import os
+import time
+
+import pygame
+import config
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+BYTE_FORMAT = "BGRA" # Same layout as convert()/convert_alpha() on a 32-bit display
+
+def key_id(key):
+    """Turns an asset cache key into the string used in the manifest."""
+    path, size, flip, pixel_format = key
+    size_text = f"{size[0]}x{size[1]}" if size else "native"
+    return f"{path.replace(os.sep, '/')}|{size_text}|flip{int(flip[0])}{int(flip[1])}|{pixel_format}"
+
+def file_hash(path):
+    """Content hash used to tell whether a bake is still up to date."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def display_ready_masks():
+    """True if the display uses the pixel layout baked blobs are stored in (or there is no display)."""
+    display = pygame.display.get_surface()
+    return display is None or (display.get_bitsize() == 32 and display.get_masks()[:3] == (0xFF0000, 0xFF00, 0xFF))
+
+class BakedAssets:
+    """
+    Finds and maps baked images.
+
+    load() is safe to call from the preloader's worker thread: it only reads files and wraps
+    memory, it never converts. The returned surfaces are already in display format.
+    """
+    def __init__(self, directory=config.BAKED_ASSET_DIR, enabled=config.USE_BAKED_ASSETS):
+        self.directory = directory
+        self.enabled = enabled
+        self._manifest = None
+        self._source_hashes = {} # path -> (mtime_ns, size, hash), so each source is hashed once per run
+        self._maps = {}          # key id -> mmap backing a surface that was handed out
+
+        self.load_ms = {} # key id -> time the last baked load took
+        self.stats = {"loaded": 0, "stale": 0, "not_baked": 0}
+
+    def get_manifest(self):
+        if self._manifest is None:
+            manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+            try:
+                with open(manifest_path) as manifest_file:
+                    manifest = json.load(manifest_file)
+            except (OSError, ValueError):
+                manifest = {}
+            if manifest.get("version") != MANIFEST_VERSION:
+                manifest = {"assets": {}}
+            self._manifest = manifest
+        return self._manifest
+
+    def source_hash(self, path):
+        """Content hash of path, recomputed only when its size or modification time changes."""
+        status = os.stat(path)
+        known = self._source_hashes.get(path)
+        if known and known[:2] == (status.st_mtime_ns, status.st_size):
+            return known[2]
+        digest = file_hash(path)
+        self._source_hashes[path] = (status.st_mtime_ns, status.st_size, digest)
+        return digest
+
+    def is_fresh(self, entry):
+        """True if the entry's source file still matches the hash it was baked from."""
+        try:
+            return self.source_hash(entry["source"]) == entry["source_hash"]
+        except OSError:
+            return False
+
+    def load(self, key, opaque):
+        """
+        Returns the baked surface for an asset cache key, or None if it isn't baked or is stale.
+
+        opaque should be True for keys that would be convert()ed rather than convert_alpha()ed.
+        """
+        if not self.enabled:
+            return None
+        started = time.perf_counter()
+        entry_id = key_id(key)
+        entry = self.get_manifest()["assets"].get(entry_id)
+        if entry is None or not display_ready_masks():
+            self.stats["not_baked"] += 1
+            return None
+        if not self.is_fresh(entry):
+            self.stats["stale"] += 1
+            return None
+
+        try:
+            with open(os.path.join(self.directory, entry["blob"]), "rb") as blob:
+                # Copy-on-write mapping: pages are shared with the OS file cache until written to
+                pixels = mmap.mmap(blob.fileno(), 0, access=mmap.ACCESS_COPY)
+            surface = pygame.image.frombuffer(pixels, tuple(entry["size"]), BYTE_FORMAT)
+        except (OSError, ValueError, pygame.error) as e:
+            print(f"Baked image {entry['blob']} is unusable ({e}), decoding {entry['source']} instead")
+            self.stats["stale"] += 1
+            return None
+        if opaque:
+            surface.set_alpha(None) # Ignore the (always 255) alpha bytes, like convert() does
+        self._maps[entry_id] = pixels
+
+        self.load_ms[entry_id] = (time.perf_counter() - started) * 1000.0
+        self.stats["loaded"] += 1
+        return surface
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats["load_ms"] = dict(self.load_ms)
+        return stats
+
+# Shared instance used by the asset cache and the preloader
+baked_assets = BakedAssets()
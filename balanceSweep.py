@@ -0,0 +1,197 @@
+# balanceSweep.py
+"""
+Runs seeded AI-vs-AI matches for every point of a parameter grid, across all CPU cores.
+
+Matches use the game's own fight logic (fightingLogic.fightSimulation, the simulation behind
+Player), so no display or asset files are needed. Each grid point's win rate and average match
+length are appended to a JSON lines (.jsonl) or CSV (.csv) file as soon as it finishes; running
+the same command again skips grid points that are already in the file. A file is only resumed with
+the --matches, --seed and --max-steps it was started with, so its rows stay comparable.
+
+Example:
+    python balanceSweep.py --damage 4,5,6 --cooldown 20,30,40 --matches 500 --out sweep.jsonl
+"""
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from fightingLogic import fightSimulation
+
+# Command line option -> (FighterStats attribute, type, default values)
+GRID_OPTIONS = {
+    "damage": ("BASIC_ATTACK_DAMAGE", float, [5]),
+    "mid_threshold": ("MID_ATTACK_THRESHOLD", int, [5]),
+    "super_threshold": ("SUPER_ATTACK_THRESHOLD", int, [10]),
+    "cooldown": ("attack_cooldown", int, [30]),
+    "ai_attack_chance": ("ai_attack_chance", float, [0.03]),
+    "jump_chance": ("ai_jump_chance", float, [0.005]),
+    "health": ("starting_health", float, [45]),
+}
+
+RESULT_FIELDS = list(GRID_OPTIONS) + ["matches", "seed", "max_steps", "left_win_rate", "right_win_rate",
+                                      "timeout_rate", "avg_match_steps", "avg_hits_landed", "elapsed_s"]
+
+def _parse_list(value_type):
+    def parse(text):
+        return [value_type(part) for part in text.split(",") if part.strip()]
+    return parse
+
+def build_grid(args):
+    """Returns every combination of the grid options as a list of dicts."""
+    names = list(GRID_OPTIONS)
+    values = [getattr(args, name) for name in names]
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+def grid_key(point):
+    """Identifies a grid point in the results file (used to resume)."""
+    return tuple((name, float(point[name])) for name in GRID_OPTIONS)
+
+def run_settings(row):
+    """The match settings a result row was played with; rows from older files lack max_steps."""
+    return tuple(int(row[name]) if row.get(name) not in (None, "") else None
+                 for name in ("matches", "seed", "max_steps"))
+
+def run_grid_point(task):
+    """Worker: plays every match for one grid point and returns its summary row."""
+    point, matches, seed, max_steps = task
+    started = time.perf_counter()
+    stats = fightSimulation.FighterStats(**{GRID_OPTIONS[name][0]: value for name, value in point.items()})
+
+    wins = [0, 0]
+    timeouts = 0
+    total_steps = 0
+    total_hits = 0
+    for match_index in range(matches):
+        # Both fighters use the same numbers, so only the starting side differs
+        result = fightSimulation.run_match(seed=seed + match_index, stats=(stats, stats), max_steps=max_steps)
+        if result["winner"] is None:
+            timeouts += 1
+        else:
+            wins[result["winner"]] += 1
+        total_steps += result["steps"]
+        total_hits += sum(result["hits_landed"])
+
+    row = dict(point)
+    row.update({
+        "matches": matches,
+        "seed": seed,
+        "max_steps": max_steps,
+        "left_win_rate": wins[0] / matches,
+        "right_win_rate": wins[1] / matches,
+        "timeout_rate": timeouts / matches,
+        "avg_match_steps": total_steps / matches,
+        "avg_hits_landed": total_hits / matches,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    })
+    return row
+
+def load_finished_keys(path):
+    """
+    Reads an existing results file and returns the grid points it already covers and the set of
+    run_settings() its rows were played with.
+    """
+    if not os.path.exists(path):
+        return set(), set()
+
+    finished = set()
+    settings = set()
+    with open(path, newline="") as results_file:
+        if path.endswith(".csv"):
+            lines = csv.DictReader(results_file)
+        else:
+            lines = (line for line in results_file if line.strip())
+        for line in lines:
+            try:
+                row = line if isinstance(line, dict) else json.loads(line)
+                key = grid_key(row)
+                row_settings = run_settings(row)
+            except (KeyError, ValueError, TypeError):
+                continue # Partially written line from an interrupted run
+            finished.add(key)
+            settings.add(row_settings)
+    return finished, settings
+
+def drop_partial_line(path):
+    """Cuts an unfinished last line (from an interrupted run) off the results file before appending."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as results_file:
+        data = results_file.read()
+        if data and not data.endswith(b"\n"):
+            results_file.truncate(data.rfind(b"\n") + 1)
+
+class ResultWriter:
+    """Appends result rows to a .jsonl or .csv file, flushing after every row."""
+    def __init__(self, path):
+        self.is_csv = path.endswith(".csv")
+        drop_partial_line(path)
+        write_header = self.is_csv and (not os.path.exists(path) or os.path.getsize(path) == 0)
+        self.file = open(path, "a", newline="")
+        if self.is_csv:
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=RESULT_FIELDS)
+            if write_header:
+                self.csv_writer.writeheader()
+
+    def write(self, row):
+        if self.is_csv:
+            self.csv_writer.writerow(row)
+        else:
+            self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep fight balance parameters with AI-vs-AI matches.")
+    for name, (attribute, value_type, default) in GRID_OPTIONS.items():
+        parser.add_argument("--" + name.replace("_", "-"), dest=name, type=_parse_list(value_type),
+                            default=default, help=f"Comma separated values for {attribute} (default: {default})")
+    parser.add_argument("--matches", type=int, default=200, help="Matches per grid point")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed; match i of every grid point uses seed + i")
+    parser.add_argument("--max-steps", type=int, default=60 * 60 * 5, help="Steps before a match counts as a timeout")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="Worker processes (default: all cores)")
+    parser.add_argument("--out", default="balance_sweep.jsonl", help="Results file (.jsonl or .csv)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    grid = build_grid(args)
+    finished, settings = load_finished_keys(args.out)
+    wanted = (args.matches, args.seed, args.max_steps)
+    if settings - {wanted}:
+        found = ", ".join(f"matches={m} seed={sd} max_steps={ms}" for m, sd, ms in sorted(settings, key=str))
+        print(f"{args.out} holds results for {found}, not matches={args.matches} seed={args.seed} "
+              f"max_steps={args.max_steps}; use the same settings or another --out file")
+        return 2
+    pending = [point for point in grid if grid_key(point) not in finished]
+    print(f"{len(grid)} grid points, {len(grid) - len(pending)} already in {args.out}, {len(pending)} to run")
+    if not pending:
+        return 0
+
+    tasks = [(point, args.matches, args.seed, args.max_steps) for point in pending]
+    writer = ResultWriter(args.out)
+    started = time.perf_counter()
+    try:
+        with multiprocessing.Pool(args.processes) as pool:
+            for done, row in enumerate(pool.imap_unordered(run_grid_point, tasks), start=1):
+                writer.write(row)
+                print(f"[{done}/{len(tasks)}] left win {row['left_win_rate']:.1%}, "
+                      f"avg {row['avg_match_steps']:.0f} steps: "
+                      + ", ".join(f"{name}={row[name]}" for name in GRID_OPTIONS))
+    except KeyboardInterrupt:
+        print("Interrupted; finished grid points are saved, run the same command again to resume.")
+        return 1
+    finally:
+        writer.close()
+
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
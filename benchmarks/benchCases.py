@@ -0,0 +1,328 @@
+# benchmarks/benchCases.py
+"""
+The individual benchmarks. Each one returns a list of samples in milliseconds (lower is better).
+
+pygame must already be set up with the SDL dummy drivers (runBenchmarks does that) and the working
+directory must be the repository root, since asset paths are relative to it.
+"""
+import os
+import subprocess
+import sys
+import time
+
+import pygame
+import config
+import assetCache
+import textCache
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs main.py in a fresh interpreter and exits as soon as the first frame is presented
+_COLD_START_SCRIPT = """
+import os, runpy, sys
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+sys.path.insert(0, os.getcwd())
+import pygame
+def first_frame(*args):
+    raise SystemExit(0)
+pygame.display.flip = first_frame
+pygame.display.update = first_frame
+runpy.run_path("main.py", run_name="__main__")
+"""
+
+def _timed(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return samples
+
+def clear_caches():
+    """Forgets every cached image, text surface and sprite frame so the next load is cold."""
+    from fightingLogic import fightingLogic
+    assetCache.asset_cache.clear()
+    textCache.clear()
+    fightingLogic._frame_banks.clear()
+
+# --- STARTUP AND ASSETS ---
+
+def bench_cold_start(screen, repeats):
+    """main.py from interpreter start to the first main menu frame."""
+    def start():
+        subprocess.run([sys.executable, "-c", _COLD_START_SCRIPT], cwd=REPO_ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return _timed(start, repeats)
+
+def bench_load_game_assets(screen, repeats):
+    import screens
+    def load():
+        clear_caches()
+        screens.load_game_assets()
+    return _timed(load, repeats)
+
+# --- LEVEL SELECT ---
+
+def bench_level_select_init(screen, repeats):
+    import levelSelectMap
+    def build():
+        clear_caches()
+        levelSelectMap.LevelSelectMap()
+    return _timed(build, repeats)
+
+def bench_level_select_draw(screen, repeats):
+    """Steady state draw (the static layer is built once, before timing)."""
+    import levelSelectMap
+    level_map = levelSelectMap.LevelSelectMap()
+    level_map.update((0, 0))
+    level_map.draw(screen)
+    return _timed(lambda: level_map.draw(screen), repeats)
+
+# --- STAGES ---
+
+def _stage_classes():
+    import stages.stage1, stages.stage2, stages.stage3, stages.BoatRideTutorial
+    return {
+        "stage1": stages.stage1.Stage1,
+        "stage2": stages.stage2.Stage2,
+        "stage3": stages.stage3.Stage3,
+        "boat_ride_tutorial": stages.BoatRideTutorial.BoatRideTutorial,
+    }
+
+def make_stage_init_bench(stage_key):
+    def bench(screen, repeats):
+        stage_class = _stage_classes()[stage_key]
+        def build():
+            clear_caches()
+            stage_class(screen, "The Boat Man", "The Log Lady")
+        return _timed(build, repeats)
+    bench.__doc__ = f"Constructing {stage_key} with cold caches."
+    return bench
+
+class ScriptedFight:
+    """
+    Patches pygame's clock, ticks and event queue so FightStage.run plays a fixed script.
+
+    Time advances exactly one simulation step per frame, the countdown is skipped after
+    countdown_frames frames, and the fight ends with a QUIT event after total_frames frames.
+    Records when every frame started (run() fetches events once per frame). Replay recording is
+    off unless record_replay is set.
+    """
+    def __init__(self, countdown_frames, total_frames, record_replay=False):
+        self.countdown_frames = countdown_frames
+        self.total_frames = total_frames
+        self.record_replay = record_replay
+        self.frame = 0
+        self.frame_starts = []
+        self._saved = None
+
+    def _ticks(self):
+        ms = self.frame * 1000.0 / config.SIMULATION_HZ
+        if self.frame > self.countdown_frames:
+            ms += 60 * 1000 # Well past any countdown
+        return int(ms)
+
+    def _events(self, *args, **kwargs):
+        self.frame_starts.append(time.perf_counter())
+        self.frame += 1
+        events = self._saved[0](*args, **kwargs)
+        frame = self.frame - self.countdown_frames
+        # Walk towards the opponent and back every 300 frames, so both fighters stay on screen
+        key = {5: (pygame.KEYDOWN, pygame.K_s), 60: (pygame.KEYUP, pygame.K_s),
+               150: (pygame.KEYDOWN, pygame.K_a), 205: (pygame.KEYUP, pygame.K_a)}.get(frame % 300)
+        if frame > 0 and key:
+            events.append(pygame.event.Event(key[0], key=key[1], mod=0, unicode=""))
+        if frame > 0 and frame % 20 == 0:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_j, mod=0, unicode="j"))
+        if frame > 0 and frame % 90 == 0:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, mod=0, unicode=" "))
+        if self.frame >= self.total_frames:
+            events.append(pygame.event.Event(pygame.QUIT))
+        return events
+
+    def __enter__(self):
+        self._saved = (pygame.event.get, pygame.event.wait, pygame.time.get_ticks, pygame.time.Clock, config.REPLAY_RECORDING)
+        pygame.event.get = self._events
+        pygame.event.wait = _no_wait
+        pygame.time.get_ticks = self._ticks
+        pygame.time.Clock = _NoWaitClock
+        config.REPLAY_RECORDING = self.record_replay
+        return self
+
+    def __exit__(self, *exc):
+        pygame.event.get, pygame.event.wait, pygame.time.get_ticks, pygame.time.Clock, config.REPLAY_RECORDING = self._saved
+
+def _no_wait(timeout=0):
+    return pygame.event.Event(pygame.NOEVENT) # The frame cap's wait for events (see SceneManager)
+
+class _NoWaitClock:
+    def tick(self, framerate=0):
+        return 0
+
+    def get_fps(self):
+        return 0.0
+
+def _fight_frame_times(screen, repeats, countdown_frames=30):
+    """Returns (countdown frame times, fight frame times) of a scripted Stage1 fight."""
+    from stages.stage1 import Stage1
+    stage = Stage1(screen, "The Boat Man", "The Log Lady")
+    stage.reseed(0)
+    for fighter in stage.match.fighters:
+        # Hits still land (and get resolved) but nobody can win, so every frame is a fight frame
+        fighter.stats = fighter.stats.copy()
+        fighter.stats.BASIC_ATTACK_DAMAGE = fighter.stats.MID_ATTACK_DAMAGE = fighter.stats.SUPER_ATTACK_DAMAGE = 0
+    with ScriptedFight(countdown_frames, countdown_frames + repeats) as script:
+        stage.run()
+    starts = script.frame_starts
+    frame_times = [(later - earlier) * 1000.0 for earlier, later in zip(starts, starts[1:])]
+    return frame_times[:countdown_frames], frame_times[countdown_frames:]
+
+def bench_fight_frame(screen, repeats):
+    """One frame of a scripted Stage1 fight (events, simulation, drawing, present)."""
+    return _fight_frame_times(screen, repeats)[1]
+
+def bench_fight_frame_scaled(screen, repeats, scale=0.75):
+    """bench_fight_frame with the fight drawn at 75% resolution and scaled to the window."""
+    from renderTarget import render_target
+    saved = render_target.scale
+    render_target.set_scale(scale)
+    try:
+        return _fight_frame_times(screen, repeats)[1]
+    finally:
+        render_target.set_scale(saved)
+
+def bench_fight_countdown_frame(screen, repeats):
+    """One frame of the Stage1 countdown (full redraw plus overlays)."""
+    return _fight_frame_times(screen, 30, countdown_frames=repeats)[0]
+
+# --- FIGHT LOGIC ---
+
+def bench_player_update_ai(screen, repeats, steps=1000):
+    """steps rounds of Player.update + handle_ai for both fighters, without drawing."""
+    import random
+    from fightingLogic.fightingLogic import Player
+    player = Player("The Boat Man", config.SCREEN_WIDTH * 0.2, config.SCREEN_HEIGHT - config.GROUND_HEIGHT)
+    opponent = Player("The Log Lady", config.SCREEN_WIDTH * 0.8, config.SCREEN_HEIGHT - config.GROUND_HEIGHT,
+                      is_player_controlled=False)
+    rng = random.Random(0)
+    def run_steps():
+        for _ in range(steps):
+            player.update()
+            opponent.update()
+            opponent.handle_ai(player.body_rect, player.is_attacking, rng)
+            player.handle_ai(opponent.body_rect, opponent.is_attacking, rng)
+    return _timed(run_steps, repeats)
+
+def _hit_test_bench(connects_factory, tests=1000):
+    """tests attack_connects style checks with the defender swept across the screen (mostly near misses and hits)."""
+    from fightingLogic import fightSimulation
+    from fightingLogic.fightingLogic import get_frame_bank
+    ground_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
+    attacker = fightSimulation.FighterState(config.SCREEN_WIDTH * 0.4, ground_y)
+    defender = fightSimulation.FighterState(config.SCREEN_WIDTH * 0.6, ground_y)
+    fightSimulation.attack(attacker)
+    banks = [get_frame_bank("The Boat Man"), get_frame_bank("The Log Lady")]
+    for bank in banks:
+        bank.build_masks() # Built once per frame; only the checks are timed
+    connects = connects_factory(list(zip((attacker, defender), banks)))
+    positions = [attacker.x - 300 + (i * 7) % 600 for i in range(tests)]
+    def run_tests():
+        for i, x in enumerate(positions):
+            defender.x = x
+            attacker.current_frame = i & 3
+            defender.facing_right = x > attacker.x
+            connects(attacker, defender)
+    return run_tests
+
+def bench_hit_test_rect(screen, repeats):
+    """1000 hit checks with the widened body rects (fightSimulation.attack_connects)."""
+    from fightingLogic import fightSimulation
+    return _timed(_hit_test_bench(lambda fighters_and_banks: fightSimulation.attack_connects), repeats)
+
+def bench_hit_test_mask(screen, repeats):
+    """1000 pixel accurate hit checks (bounds reject, then mask overlap)."""
+    from fightingLogic.fightingLogic import MaskHitTest
+    return _timed(_hit_test_bench(MaskHitTest), repeats)
+
+# --- BONUS STAGE (HORDE) ---
+
+def _full_horde(horde, count=200):
+    """Keeps count enemies alive: fills the pool now and respawns kills right away."""
+    horde.max_active = count
+    horde.spawn_rate_growth = 0.0
+    horde.spawn_rate = config.SIMULATION_HZ * count # A whole horde's worth of spawn credit every step
+    horde.peck_damage = 0 # Nobody can lose, so every frame is a horde frame
+    horde.spawn(count)
+
+def bench_horde_step(screen, repeats):
+    """One hordeSimulation step with 200 enemies chasing an idle fighter (no drawing)."""
+    from fightingLogic import fightSimulation, hordeSimulation
+    ground_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
+    fighter = fightSimulation.FighterState(config.SCREEN_WIDTH * 0.5, ground_y)
+    horde = hordeSimulation.Horde(seed=0)
+    _full_horde(horde)
+    def step():
+        if horde.frame % 20 == 0:
+            fightSimulation.attack(fighter)
+        fightSimulation.update_fighter(fighter)
+        horde.step(fighter)
+    return _timed(step, repeats)
+
+def bench_horde_frame(screen, repeats, countdown_frames=30):
+    """One frame of the bonus stage with 200 live enemies (events, simulation, drawing, present)."""
+    from stages.bounusStage import BonusStage
+    stage = BonusStage(screen, "The Boat Man")
+    stage.reseed(0)
+    _full_horde(stage.horde)
+    with ScriptedFight(countdown_frames, countdown_frames + repeats) as script:
+        stage.run()
+    starts = script.frame_starts
+    return [(later - earlier) * 1000.0 for earlier, later in zip(starts, starts[1:])][countdown_frames:]
+
+def bench_rollback(screen, repeats, depth=8):
+    """One netplay rollback: restore a match snapshot and re-simulate depth steps of a close fight."""
+    from fightingLogic import fightSimulation
+    match = fightSimulation.Match(controllers=(None, None))
+    for _ in range(200): # Walk both fighters into each other, so steps resolve hits
+        fightSimulation.apply_input(match.fighters[0], fightSimulation.INPUT_RIGHT_DOWN)
+        fightSimulation.apply_input(match.fighters[1], fightSimulation.INPUT_LEFT_DOWN)
+        match.step()
+    snapshot = match.snapshot()
+    def rollback():
+        match.restore(snapshot)
+        for step in range(depth):
+            fightSimulation.apply_input(match.fighters[step % 2], fightSimulation.INPUT_PUNCH)
+            match.step()
+            match.snapshot() # The session snapshots every re-simulated step again
+    return _timed(rollback, repeats)
+
+def bench_search_ai_decision(screen, repeats):
+    """One lookahead AI decision (full beam search, no time budget) with the fighters in striking range."""
+    from fightingLogic import fightSimulation, searchAI
+    match = fightSimulation.Match(controllers=(None, None))
+    match.fighters[0].x = match.fighters[1].x - 150
+    ai = searchAI.LookaheadAI(budget_ms=None)
+    return _timed(lambda: ai.search(match, 1), repeats)
+
+# name -> (function, default repeats)
+BENCHMARKS = {
+    "cold_start_to_menu": (bench_cold_start, 3),
+    "load_game_assets": (bench_load_game_assets, 10),
+    "level_select_init": (bench_level_select_init, 10),
+    "level_select_draw": (bench_level_select_draw, 200),
+    "stage1_init": (make_stage_init_bench("stage1"), 10),
+    "stage2_init": (make_stage_init_bench("stage2"), 10),
+    "stage3_init": (make_stage_init_bench("stage3"), 10),
+    "boat_ride_tutorial_init": (make_stage_init_bench("boat_ride_tutorial"), 10),
+    "fight_countdown_frame": (bench_fight_countdown_frame, 60),
+    "fight_frame": (bench_fight_frame, 600),
+    "fight_frame_scale_75": (bench_fight_frame_scaled, 600),
+    "player_update_ai_1000": (bench_player_update_ai, 20),
+    "hit_test_rect_1000": (bench_hit_test_rect, 50),
+    "hit_test_mask_1000": (bench_hit_test_mask, 50),
+    "horde_step_200": (bench_horde_step, 600),
+    "horde_frame_200": (bench_horde_frame, 600),
+    "rollback_8_steps": (bench_rollback, 1000),
+    "search_ai_decision": (bench_search_ai_decision, 300),
+}
@@ -0,0 +1,130 @@
+# benchmarks/runBenchmarks.py
+"""
+Runs the headless benchmark suite and compares it against a stored baseline.
+
+Everything runs under SDL's dummy video/audio drivers, so no window (or display) is needed.
+Results are written as JSON together with information about the machine; with --baseline the
+median of every benchmark is compared to the baseline's and the exit code is 1 if any got slower
+by more than --threshold.
+
+Examples (from the repository root):
+    python -m benchmarks.runBenchmarks --save-baseline benchmarks/baseline.json
+    python -m benchmarks.runBenchmarks --baseline benchmarks/baseline.json --threshold 0.15
+    python -m benchmarks.runBenchmarks --only fight_frame,level_select_draw
+"""
+import os
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(REPO_ROOT) # Asset paths are relative to the repository root
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import pygame
+pygame.init()
+import config
+from benchmarks import benchCases
+from frameProfiler import percentile
+
+def summarize(samples):
+    """Median/mean/min/p95 of a list of millisecond samples."""
+    ordered = sorted(samples)
+    count = len(ordered)
+    middle = count // 2
+    median = ordered[middle] if count % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+    return {
+        "median_ms": median,
+        "mean_ms": sum(ordered) / count,
+        "min_ms": ordered[0],
+        "p95_ms": percentile(ordered, 0.95),
+        "samples": count,
+    }
+
+def machine_info():
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(str(part) for part in pygame.get_sdl_version()),
+    }
+
+def run_benchmarks(names, repeat_scale=1.0):
+    screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    results = {}
+    for name in names:
+        bench, repeats = benchCases.BENCHMARKS[name]
+        samples = bench(screen, max(1, round(repeats * repeat_scale)))
+        results[name] = summarize(samples)
+        print(f"{name:<26} median {results[name]['median_ms']:9.3f} ms   p95 {results[name]['p95_ms']:9.3f} ms")
+    return results
+
+def compare(results, baseline, threshold):
+    """Prints the change against the baseline. Returns the names of benchmarks that regressed."""
+    if baseline["machine"] != machine_info():
+        print("Note: the baseline was recorded on a different machine, comparisons are only rough.")
+    regressions = []
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if not before:
+            print(f"{name:<26} (not in baseline)")
+            continue
+        change = result["median_ms"] / before["median_ms"] - 1.0 if before["median_ms"] else 0.0
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<26} {before['median_ms']:9.3f} -> {result['median_ms']:9.3f} ms ({change:+.1%})"
+              + ("  REGRESSION" if regressed else ""))
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless startup, loading, menu and fight benchmarks.")
+    parser.add_argument("--only", help="Comma separated benchmark names (default: all). "
+                                       "Available: " + ", ".join(benchCases.BENCHMARKS))
+    parser.add_argument("--out", default="benchmarks/benchmark_results.json", help="Where to write this run's results")
+    parser.add_argument("--baseline", help="Baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed slowdown of a median before it counts as a regression (0.10 = 10%%)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Also store this run as the baseline at PATH")
+    parser.add_argument("--repeat-scale", type=float, default=1.0, help="Multiply every benchmark's repeat count")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = args.only.split(",") if args.only else list(benchCases.BENCHMARKS)
+    unknown = [name for name in names if name not in benchCases.BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)}")
+        return 2
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": machine_info(),
+        # Loads are far cheaper with assetBake.py output present, so record which kind of run this was
+        "baked_assets": os.path.exists(os.path.join(config.BAKED_ASSET_DIR, "manifest.json")),
+        "results": run_benchmarks(names, args.repeat_scale),
+    }
+    for path in filter(None, [args.out, args.save_baseline]):
+        with open(path, "w") as results_file:
+            json.dump(report, results_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(report["results"], baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
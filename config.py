@@ -46,4 +46,93 @@ NAME_Y_OFFSET = 20        # Adjust this value for the name relative to the bar
 
 # UI Text Properties
 PLAYER_NAME_FONT_SIZE = 36 # Larger size
-WHITE = (255, 255, 255)   # Define white color if not already present
\ No newline at end of file
+WHITE = (255, 255, 255)   # Define white color if not already present
+
+# Asset Cache
+ASSET_CACHE_BUDGET_BYTES = 96 * 1024 * 1024  # Max pixel memory kept by assetCache (lower this on kiosks)
+
+# Text Cache
+TEXT_CACHE_MAX_ENTRIES = 256  # Rendered text surfaces kept by textCache
+
+# Surface Pool
+SURFACE_POOL_BUDGET_BYTES = 16 * 1024 * 1024  # Scratch surfaces kept for reuse by surfacePool (a full screen SRCALPHA one is 2.8 MB)
+
+# Rendering
+DIRTY_RECT_RENDERING = True  # Fight stages only repaint changed regions (F2 in a fight toggles full redraw)
+
+# Render Resolution (see renderTarget.py)
+WINDOW_SIZE = None             # Window size in pixels; None for SCREEN_WIDTH x SCREEN_HEIGHT (everything is laid out in those)
+RENDER_SCALE = 1.0             # Fights are drawn at the screen size times this, then scaled to the window
+RENDER_SCALE_MIN = 0.5
+DYNAMIC_RESOLUTION = False     # Let the render scale follow the fight frame time to hold FPS_CAP
+DYNAMIC_RESOLUTION_STEPS = (1.0, 0.85, 0.75, 0.6, 0.5)
+DYNAMIC_RESOLUTION_WINDOW_FRAMES = 60  # Frames measured before each decision
+DYNAMIC_RESOLUTION_LOWER_AT = 0.9      # Step down when the 90th percentile frame uses this much of the frame budget...
+DYNAMIC_RESOLUTION_RAISE_AT = 0.5      # ...and back up when it uses less than this
+
+# Fight Simulation Timing
+SIMULATION_HZ = 60                  # Fixed rate the fight logic is stepped at
+MAX_SIMULATION_STEPS_PER_FRAME = 5  # Catch-up limit when a frame takes too long
+FPS_CAP = 60                        # Max frames drawn per second during fights
+
+# Fight Input (see fightInput.py)
+INPUT_BUFFER_STEPS = 6        # An attack pressed while the fighter is busy still starts if it can within this many steps (0: dropped)
+INPUT_MOTION_STEPS = 15       # Steps of input kept per fighter for special move motions (0: W/E only)
+INPUT_LATENCY_SAMPLES = 600   # Input events the latency stats cover (F3 overlay)
+INPUT_LATENCY_LOG = False     # Print input latency stats when a fight ends
+
+# Menu Screens (drawn on demand, see redrawScheduler.py)
+MENU_FPS_CAP = 60         # Max frames drawn per second while something on a menu is changing
+MENU_MAX_SLEEP_MS = 1000  # Longest an untouched menu sleeps before checking in anyway
+
+# Scenes (see sceneManager.py)
+SCENE_TIMING_LOG = False     # Print how long every scene switch took (building, entering and leaving scenes)
+SCENE_TIMING_HISTORY = 32    # Scene switches whose timings are kept
+
+# Frame Profiler (F3 toggles it in game)
+PROFILER_ENABLED = False        # Start with profiling and its overlay on
+PROFILER_HISTORY_FRAMES = 600   # Frames kept for the rolling stats
+PROFILER_CSV_PATH = None        # e.g. "frame_profile.csv" to dump per-frame timings on exit
+
+# Startup Timeline
+STARTUP_TIMELINE_LOG = False # Print what ran before the first frame (and lazy loads after it)
+
+# Level Select Preloading
+PRELOAD_MEMORY_CAP_BYTES = 32 * 1024 * 1024 # Images preloaded on a hunch (not hovered) stop here
+PRELOAD_IDLE_MS = 750                       # Map idle time before likely next levels get preloaded
+PRELOAD_PUMP_BUDGET_MS = 2.0                # Main thread time per frame for converting preloaded images
+
+# Baked Assets (see assetBake.py)
+USE_BAKED_ASSETS = True   # Memory-map baked pixels when they are up to date with their source file
+BAKED_ASSET_DIR = "baked"
+SPRITE_ATLAS_INDEX = "baked/fighters_atlas.json" # Written by atlasPacker.py; sprite sheets are sliced if missing
+
+# Hit Detection
+PIXEL_PERFECT_HITS = True # Attacks land on overlapping sprite pixels, not widened body rects (F4 in a fight shows the masks)
+
+# Bonus Stage (horde survival, see fightingLogic/hordeSimulation.py)
+HORDE_POOL_SIZE = 256          # Enemies allocated up front, the most that can ever be alive
+HORDE_MAX_ACTIVE = 200         # Spawning pauses at this many live enemies
+HORDE_SPAWN_RATE = 3.0         # Enemies per second at the start...
+HORDE_SPAWN_RATE_GROWTH = 0.5  # ...plus this many per second for every second survived
+HORDE_AI_GROUPS = 4            # The AI re-thinks for 1/N of the horde each step
+HORDE_GRID_CELL_SIZE = 64      # Spatial hash cell size in pixels
+
+# Replays (see replayViewer.py)
+REPLAY_RECORDING = True # Record every fight's seed and inputs
+REPLAY_DIR = "replays"
+REPLAY_MAX_FILES = 200  # Oldest replays are deleted past this many; None keeps every one
+
+# Netplay (two players over UDP, see netplayMatch.py)
+NETPLAY_PORT = 7777
+NETPLAY_MAX_ROLLBACK = 8         # Most steps simulated ahead of the other player's confirmed input
+NETPLAY_INPUT_DELAY = 2          # Steps local input is held back, hides that much latency without rollbacks
+NETPLAY_TIMEOUT_SECONDS = 5.0    # Silence before the connection counts as lost
+NETPLAY_COUNTDOWN_SECONDS = 3
+
+# Opponent AI
+OPPONENT_AI = "reactive"      # "reactive" (walks in and swings at random) or "lookahead" (harder, see fightingLogic/searchAI.py)
+SEARCH_AI_BUDGET_MS = 2.0     # Time one lookahead decision may take (at most one decision per frame)
+SEARCH_AI_HORIZON_STEPS = 24  # How far ahead it looks (24 steps = 400 ms)
+SEARCH_AI_ACTION_STEPS = 6    # Steps each candidate action is held, also the steps between decisions
+SEARCH_AI_BEAM_WIDTH = 4      # Action sequences kept at each depth of the search
@@ -0,0 +1,94 @@
+# fightInput.py
+"""
+The fights' input layer, between the SDL event queue and the simulation.
+
+The scene manager takes events off the queue as they arrive, also while it waits out the frame
+cap, and stamps each with event.received (time.perf_counter()). A fight turns its key and mouse
+events into INPUT_* bits and queues them here with the simulation step they land on: the step
+whose slice of time they arrived in. When a slow frame makes the stage catch up several steps
+at once, each step gets the input that arrived during its own slice instead of everything piling
+onto the first one, and the last step run in a frame takes whatever is left, so nothing waits
+for a later frame. What the bits do is up to fightSimulation.apply_input (attack buffering and
+special move motions).
+
+Latency is measured per event: from being received to the simulation step that applied it, and
+to the present() of the frame showing that step. pygame events carry no timestamp from the OS,
+so time spent before the game loop could see the event (in the OS and SDL) isn't counted, nor is
+the display's own delay after present().
+
+During fights only FIGHT_EVENT_TYPES are let onto the SDL queue (Scene.event_types), so mouse
+motion and window chatter aren't queued, woken up for or looped over every frame.
+"""
+import time
+from collections import deque
+
+import pygame
+import config
+from frameProfiler import percentile
+
+FIGHT_EVENT_TYPES = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN)
+
+class LatencyStats:
+    """The last config.INPUT_LATENCY_SAMPLES latencies in milliseconds (a ring buffer)."""
+    def __init__(self, capacity=config.INPUT_LATENCY_SAMPLES):
+        self.samples = deque(maxlen=capacity)
+        self.count = 0
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.count += 1
+
+    def summary(self):
+        if not self.samples:
+            return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+        ordered = sorted(self.samples)
+        return {"p50": percentile(ordered, 0.5), "p95": percentile(ordered, 0.95), "max": ordered[-1]}
+
+class InputQueue:
+    """The local player's input between the event queue and the simulation steps (see the module docstring)."""
+    def __init__(self):
+        self._pending = [] # (step it lands on, INPUT_* bits, received)
+        self._applied = [] # When the events applied since the last present were received
+        self.to_simulation = LatencyStats()
+        self.to_present = LatencyStats()
+
+    def add(self, bits, received, step):
+        """Queues bits from an event received at received (perf_counter) for simulation step step."""
+        if bits:
+            self._pending.append((step, bits, received))
+
+    def take(self, step, last=False):
+        """INPUT_* bits for simulation step step; last takes everything queued (the frame's last step)."""
+        if not self._pending:
+            return 0
+        bits = 0
+        now = time.perf_counter()
+        keep = []
+        for entry in self._pending:
+            if entry[0] > step and not last:
+                keep.append(entry)
+                continue
+            bits |= entry[1]
+            self.to_simulation.add((now - entry[2]) * 1000.0)
+            self._applied.append(entry[2])
+        self._pending = keep
+        return bits
+
+    def presented(self):
+        """Call right after the frame is presented."""
+        if not self._applied:
+            return
+        now = time.perf_counter()
+        for received in self._applied:
+            self.to_present.add((now - received) * 1000.0)
+        self._applied = []
+
+    def clear(self):
+        """Drops queued input (e.g. what was pressed before the fight started)."""
+        self._pending = []
+        self._applied = []
+
+    def summary_line(self):
+        """Latency as one line, for the profiler overlay and the log."""
+        sim, shown = self.to_simulation.summary(), self.to_present.summary()
+        return f"input lag   sim {sim['p50']:.1f}/{sim['p95']:.1f}, shown {shown['p50']:.1f}/{shown['p95']:.1f} ms (p50/p95)"
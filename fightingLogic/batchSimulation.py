@@ -0,0 +1,401 @@
+# fightingLogic/batchSimulation.py
+"""
+NumPy simulator that steps thousands of AI-vs-AI matches at once, for balance tuning.
+
+Every match is stored as struct-of-arrays (one row per fighter, one column per match) and
+advanced with the same rules as fightSimulation.Match using reactive_ai for both fighters:
+movement, jumps, the ai_decide distance/random rules, and the body rect widened by
+ATTACK_REACH hit test. Random numbers come from NumPy, so individual matches won't replay
+the same as fightSimulation with the same seed, but the statistics agree.
+
+Almost nothing about a fighter changes from one step to the next, so a step only looks for
+the few fighters where something does (walking starts or stops, the opponent comes into
+range, an AI roll succeeds, an attack might land) with a handful of whole-array compares,
+mostly on int16 and bool arrays, and handles those by index:
+- The AI's random rolls are scheduled: each fighter keeps the step its next attack and jump
+  roll succeed on, drawn from the geometric distribution of trials until a success.
+- Jumps follow the arc update_fighter gives each jump_strength, worked out once up front,
+  so y is only looked up for the fighters whose attack might land.
+At most CHUNK_MATCHES matches run at once. Once a quarter of them are done, the finished ones
+are dropped from the arrays and matches that haven't started take their place, so steps only
+spend time on matches that are running.
+"""
+try:
+    import numpy as np
+except ImportError as e: # Only the balance tools need numpy, the game itself doesn't
+    raise ImportError("batchSimulation needs numpy: pip install numpy") from e
+
+import config
+from fightingLogic import fightSimulation
+
+_DEFAULT_STATS = fightSimulation.FighterStats()
+
+# Tunable parameters: name -> default. Each can be a scalar, one value per match (shape (N,))
+# or one value per fighter and match (shape (2, N)).
+DEFAULT_PARAMS = {
+    "basic_damage": _DEFAULT_STATS.BASIC_ATTACK_DAMAGE,
+    "attack_cooldown": _DEFAULT_STATS.attack_cooldown,
+    "starting_health": _DEFAULT_STATS.starting_health,
+    "jump_strength": _DEFAULT_STATS.jump_strength,
+    "ai_attack_range": _DEFAULT_STATS.ai_attack_range,
+    "ai_stop_threshold": _DEFAULT_STATS.ai_stop_threshold,
+    "ai_attack_chance": _DEFAULT_STATS.ai_attack_chance,
+    "ai_jump_chance": _DEFAULT_STATS.ai_jump_chance,
+}
+
+# Per fighter constants each running column takes from the (2, N) parameters
+_PARAM_ARRAYS = (
+    "basic_damage", "attack_cooldown", "ai_attack_range", "walk_threshold", "attack_scale",
+    "jump_scale", "jump_arc", "airtime")
+
+COMPACT_AT = 0.75     # Replace finished matches once at most this share of the columns is still running
+CHUNK_MATCHES = 65536 # Matches running at once (more spread each step's fixed cost, fewer bound the memory)
+
+NEVER = np.iinfo(np.int32).max # Step of a roll that can't succeed (the fighter isn't rolling)
+_MAX_TRIALS = 1 << 30          # Cap for a chance of 0, so step numbers stay inside int32
+
+def _trial_scale(chance):
+    """
+    1 / -log(1 - chance): the number of Bernoulli trials until the first success is
+    ceil(E * scale) for E ~ Exp(1), which is cheaper to draw than a geometric per chance.
+    """
+    with np.errstate(divide="ignore"):
+        return (-1.0 / np.log1p(-np.asarray(chance, dtype=np.float64))).astype(np.float32)
+
+def _jump_arcs(jump_strength):
+    """
+    Runs update_fighter on a jump for every distinct jump_strength.
+
+    Returns (arc index per fighter, offsets, airtime per arc): offsets[arc, k] is how far above
+    the floor a fighter is k steps after jumping (0 from airtime[arc] on, when it has landed).
+    """
+    strengths, arc = np.unique(jump_strength, return_inverse=True)
+    ground_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
+    heights = []
+    for strength in strengths:
+        f = fightSimulation.FighterState(0, ground_y, fightSimulation.FighterStats(jump_strength=float(strength)))
+        floor_top = f.y
+        fightSimulation.jump(f)
+        height = [0]
+        while True:
+            fightSimulation.update_fighter(f)
+            if f.on_ground:
+                break
+            height.append(f.y - floor_top)
+        heights.append(height)
+    airtime = np.array([len(height) for height in heights], dtype=np.int32)
+    offsets = np.zeros((len(heights), airtime.max() + 1), dtype=np.int32)
+    for row, height in enumerate(heights):
+        offsets[row, :len(height)] = height
+    return arc.reshape(jump_strength.shape).astype(np.int32), offsets, airtime
+
+class BatchMatchSimulator:
+    """
+    N simultaneous AI-vs-AI matches.
+
+    State arrays have shape (2, columns): row 0 is the fighter that starts on the left,
+    match_ids holds the match each column belongs to and start_step the step it started on.
+    """
+    def __init__(self, n_matches, seed=None, **params):
+        unknown = set(params) - set(DEFAULT_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown batch simulation parameters: {sorted(unknown)}")
+
+        self.n = n_matches
+        self.rng = np.random.default_rng(seed)
+        shape = (2, n_matches)
+
+        # Parameters, broadcast to (2, N) once; the running columns take their own slice of them
+        values = {}
+        for name, default in DEFAULT_PARAMS.items():
+            value = np.broadcast_to(np.asarray(params.get(name, default), dtype=np.float32), shape)
+            values[name] = np.ascontiguousarray(value)
+        # Distances are whole pixels, so the AI's thresholds can be too. ai_decide walks when out
+        # of attack range and past the stop threshold.
+        attack_range = np.clip(np.floor(values["ai_attack_range"]), -1, np.iinfo(np.int16).max)
+        stop_threshold = np.clip(np.floor(values["ai_stop_threshold"]), -1, np.iinfo(np.int16).max)
+        jump_arc, self.jump_heights, airtime = _jump_arcs(values["jump_strength"])
+        self._params = {
+            "basic_damage": values["basic_damage"],
+            "starting_health": values["starting_health"],
+            "attack_cooldown": values["attack_cooldown"].astype(np.int32),
+            "ai_attack_range": attack_range.astype(np.int16),
+            "walk_threshold": np.maximum(attack_range, stop_threshold).astype(np.int16),
+            "attack_scale": _trial_scale(values["ai_attack_chance"]),
+            "jump_scale": _trial_scale(values["ai_jump_chance"]),
+            "jump_arc": jump_arc,
+            "airtime": airtime[jump_arc],
+        }
+        # Bodies always overlap vertically unless a jump gets a whole body height off the floor
+        self.jumps_clear_body = bool(-self.jump_heights.min() >= fightSimulation.FIGHTER_HEIGHT)
+        self.width = fightSimulation.FIGHTER_WIDTH
+        self.height = fightSimulation.FIGHTER_HEIGHT
+
+        # Per match results, indexed by match id
+        self.winner = np.full(n_matches, -1, dtype=np.int8) # -1 until someone wins
+        self.duration = np.zeros(n_matches, dtype=np.int32)
+        self.final_health = values["starting_health"].copy()
+        self.final_hits = np.zeros(shape, dtype=np.int32)
+
+        self.frame = 0
+        self.match_steps = 0 # Steps summed over running matches, for throughput numbers
+        self.next_match = 0 # Matches before this one have been started
+
+        # The running matches, one column each. _compact() fills them with the first
+        # CHUNK_MATCHES matches and tops them back up as matches finish.
+        for name, array in self._new_columns(self.next_match).items():
+            setattr(self, name, array)
+        self.match_ids = np.zeros(0, dtype=np.intp)
+        self.start_step = np.zeros(0, dtype=np.int32)
+        self.active = np.zeros(0, dtype=bool)
+        self._compact()
+
+    def _new_columns(self, first_id):
+        """State arrays for matches first_id up to next_match, starting on this step."""
+        ids = slice(first_id, self.next_match)
+        columns = {name: self._params[name][:, ids] for name in _PARAM_ARRAYS}
+        shape = columns["jump_arc"].shape
+
+        # Fighter state (struct-of-arrays)
+        x = np.empty(shape, dtype=np.int16)
+        x[0] = round(config.SCREEN_WIDTH * 0.2) - self.width // 2
+        x[1] = round(config.SCREEN_WIDTH * 0.8) - self.width // 2
+        columns["x"] = x
+        columns["vel_x"] = np.zeros(shape, dtype=np.int16) # Always -PLAYER_SPEED, 0 or PLAYER_SPEED
+        columns["health"] = self._params["starting_health"][:, ids].copy()
+        columns["facing_right"] = np.ones(shape, dtype=bool)
+        # What the AI saw on the last step, so a step can tell where it changed
+        columns["in_range"] = np.zeros(shape, dtype=bool)
+        columns["walking"] = np.zeros(shape, dtype=bool)
+        columns["target_right"] = np.zeros(shape, dtype=bool)
+        # An attack started on step t with cooldown c lasts while the step is before t + c (the
+        # step FighterState.attack_cooldown reaches 0); FighterState's 3 step start-up can't matter
+        columns["is_attacking"] = np.zeros(shape, dtype=bool)
+        columns["attack_end"] = np.zeros(shape, dtype=np.int32)
+        columns["has_hit"] = np.zeros(shape, dtype=bool) # has_dealt_hit_this_attack
+
+        # The AI's per-step random rolls are Bernoulli trials, so instead of drawing a number every
+        # step we draw the number of trials until the next success and keep the step it lands on.
+        # Attack rolls happen while in range: attack_roll is that step while in range (NEVER
+        # otherwise) and attack_trials_left holds what's left of the draw while out of range.
+        # Jump rolls happen on the ground, from land_step on, so jump_roll is always a step.
+        columns["attack_roll"] = np.full(shape, NEVER, dtype=np.int32)
+        columns["attack_trials_left"] = self._draw_failures(columns["attack_scale"]) + 1
+        columns["jump_roll"] = self._draw_failures(columns["jump_scale"]) + self.frame
+        columns["jump_start"] = np.full(shape, -_MAX_TRIALS, dtype=np.int32)
+        columns["land_step"] = np.zeros(shape, dtype=np.int32) # On the ground from this step on
+        columns["hits_landed"] = np.zeros(shape, dtype=np.int32)
+        return columns
+
+    def _allocate_buffers(self):
+        """Scratch arrays every step writes into, sized to the current columns."""
+        shape = self.x.shape
+        self._distance = np.empty(shape, dtype=np.int16)
+        self._abs_distance = np.empty(shape, dtype=np.int16)
+        self._in_range = np.empty(shape, dtype=bool)
+        self._walking = np.empty(shape, dtype=bool)
+        self._target_right = np.empty(shape, dtype=bool)
+        self._is_attacking = np.empty(shape, dtype=bool)
+        self._mask = np.empty(shape, dtype=bool)
+        self._changed = np.empty(shape, dtype=bool)
+
+    def _draw_failures(self, scale, index=None):
+        """
+        Failed trials before the next success for every fighter, or for the flat indices in
+        index: floor(E * scale) is geometric too, one less than the trials ceil(E * scale) counts.
+        """
+        if index is None:
+            draws = self.rng.standard_exponential(scale.shape, dtype=np.float32)
+        else:
+            draws = self.rng.standard_exponential(index.size, dtype=np.float32)
+            scale = scale.take(index)
+        draws *= scale
+        np.fmin(draws, np.float32(_MAX_TRIALS), out=draws) # Also turns the 0 * inf of a chance of 0 into the cap
+        return draws.astype(np.int32)
+
+    def heights(self, index):
+        """How far above the floor the fighters at the flat indices are (update_fighter's y, from the floor)."""
+        since_jump = np.minimum(self.frame - self.jump_start.take(index), self.jump_heights.shape[1] - 1)
+        return self.jump_heights[self.jump_arc.take(index), since_jump]
+
+    def _compact(self):
+        """
+        Saves the results of finished columns, drops them from the state arrays and starts
+        matches that haven't run yet in their place (up to CHUNK_MATCHES columns).
+        """
+        done = np.flatnonzero(~self.active)
+        ids = self.match_ids[done]
+        self.final_health[:, ids] = self.health.take(done, axis=1)
+        self.final_hits[:, ids] = self.hits_landed.take(done, axis=1)
+
+        keep = np.flatnonzero(self.active)
+        first_id = self.next_match
+        self.next_match = min(self.n, first_id + max(0, CHUNK_MATCHES - keep.size))
+        for name, array in self._new_columns(first_id).items():
+            setattr(self, name, np.concatenate((getattr(self, name).take(keep, axis=1), array), axis=1))
+        started = self.next_match - first_id
+        self.match_ids = np.concatenate((self.match_ids.take(keep), np.arange(first_id, self.next_match)))
+        self.start_step = np.concatenate((self.start_step.take(keep), np.full(started, self.frame, dtype=np.int32)))
+        self.active = np.ones(self.match_ids.size, dtype=bool)
+        self.live = self.active.size
+        self.oldest_start = int(self.start_step.min()) if self.live else self.frame
+        self._allocate_buffers()
+
+    def _time_out(self, max_steps):
+        """Ends the running matches that have lasted max_steps without a winner."""
+        over = self.frame - self.start_step >= max_steps
+        over &= self.active
+        self.duration[self.match_ids[over]] = max_steps
+        self.active[over] = False
+        self._compact()
+
+    def _range_changed(self, changed, frame):
+        """Starts or pauses the attack roll schedule of fighters that came into or left attack range."""
+        entered = self._in_range.take(changed)
+        came, left = changed[entered], changed[~entered]
+        # This step's roll is the first of the trials left
+        self.attack_roll.put(came, self.attack_trials_left.take(came) + (frame - 1))
+        self.attack_trials_left.put(left, self.attack_roll.take(left) - (frame - 1))
+        self.attack_roll.put(left, NEVER)
+
+    def _steer(self, changed):
+        """ai_decide's move()/stop_move() for fighters whose velocity may have changed."""
+        speed = np.where(self._target_right.take(changed), config.PLAYER_SPEED, -config.PLAYER_SPEED)
+        # move() keeps vel_x while attacking, stop_move() always zeroes it
+        speed = np.where(self._is_attacking.take(changed), self.vel_x.take(changed), speed)
+        speed *= self._walking.take(changed)
+        self.vel_x.put(changed, speed)
+        # update_fighter turns a fighter the way it moves (at the start of the next step)
+        moving = speed != 0
+        self.facing_right.put(changed[moving], speed[moving] > 0)
+
+    def _retire(self, fighters):
+        """
+        Stops the fighters of finished matches so they make no more work until _compact()
+        drops them: no walking, no attack in progress and no rolls that can succeed.
+        """
+        self.vel_x.put(fighters, 0)
+        self.walk_threshold.put(fighters, np.iinfo(np.int16).max)
+        self.attack_end.put(fighters, 0)
+        self.attack_roll.put(fighters, NEVER)
+        self.jump_roll.put(fighters, NEVER)
+
+    def step(self):
+        """Advances every running match by one simulation step."""
+        x, distance, abs_distance = self.x, self._distance, self._abs_distance
+        in_range, walking, target_right = self._in_range, self._walking, self._target_right
+        is_attacking, has_hit = self._is_attacking, self.has_hit
+        mask, changed = self._mask, self._changed
+        frame = self.frame
+        self.match_steps += self.live
+
+        # --- update_fighter: movement and attack timer (jumps follow their arc, see heights()) ---
+        x += self.vel_x
+        np.greater(self.attack_end, frame, out=is_attacking)
+
+        # --- ai_decide for both fighters (each targets the other row) ---
+        np.subtract(x[::-1], x, out=distance) # Both bodies are the same width, so this is the center distance
+        np.abs(distance, out=abs_distance)
+        np.less_equal(abs_distance, self.ai_attack_range, out=in_range)
+        np.not_equal(in_range, self.in_range, out=changed)
+        if changed.any():
+            self._range_changed(np.flatnonzero(changed), frame)
+
+        # vel_x only changes where walking starts or stops, or where a walker turns around or
+        # finishes an attack
+        np.greater(abs_distance, self.walk_threshold, out=walking)
+        np.greater(distance, 0, out=target_right)
+        np.not_equal(target_right, self.target_right, out=changed)
+        np.greater(self.is_attacking, is_attacking, out=mask)
+        changed |= mask
+        changed &= walking
+        np.not_equal(walking, self.walking, out=mask)
+        changed |= mask
+        if changed.any():
+            self._steer(np.flatnonzero(changed))
+
+        # Attack rolls (one trial per step in range), then jump rolls (on the ground and no attack)
+        np.equal(self.attack_roll, frame, out=mask)
+        wants_attack = np.flatnonzero(mask)
+        if wants_attack.size:
+            self.attack_roll.put(wants_attack, self._draw_failures(self.attack_scale, wants_attack) + (frame + 1))
+            # Returning "basic_attack" skips this step's jump roll (if it's on the ground to roll)
+            skipped = self.land_step.take(wants_attack) <= frame
+            self.jump_roll.put(wants_attack, self.jump_roll.take(wants_attack) + skipped)
+        np.equal(self.jump_roll, frame, out=mask)
+        jumps = np.flatnonzero(mask)
+        if jumps.size:
+            land = self.airtime.take(jumps) + frame
+            self.jump_start.put(jumps, frame)
+            self.land_step.put(jumps, land)
+            # Rolling again starts on the landing step
+            land += self._draw_failures(self.jump_scale, jumps)
+            self.jump_roll.put(jumps, land)
+
+        if wants_attack.size:
+            starts = wants_attack[~is_attacking.take(wants_attack)]
+            is_attacking.put(starts, True)
+            self.attack_end.put(starts, self.attack_cooldown.take(starts) + frame)
+            has_hit.put(starts, False)
+
+        # This step's view becomes the last step's for the next one
+        self.in_range, self._in_range = in_range, self.in_range
+        self.walking, self._walking = walking, self.walking
+        self.target_right, self._target_right = target_right, self.target_right
+        self.is_attacking, self._is_attacking = is_attacking, self.is_attacking
+
+        # --- resolve_hits: an attack that hasn't landed yet against a defender that isn't attacking ---
+        np.greater(is_attacking, has_hit, out=mask)
+        np.greater(mask, is_attacking[::-1], out=mask)
+        swings = np.flatnonzero(mask)
+        if not swings.size:
+            self.frame += 1
+            return
+        columns = self.active.size
+        defender = swings + columns
+        defender %= 2 * columns
+        # Body rect widened by ATTACK_REACH against the other body rect
+        lands = abs_distance.take(swings) < self.width + fightSimulation.ATTACK_REACH // 2
+        if self.jumps_clear_body:
+            lands &= np.abs(self.heights(defender) - self.heights(swings)) < self.height
+        self.frame += 1
+        if not lands.any():
+            return
+        swings, defender = swings[lands], defender[lands]
+        has_hit.put(swings, True)
+        self.hits_landed.put(swings, self.hits_landed.take(swings) + 1)
+        health = self.health.take(defender) - self.basic_damage.take(swings)
+        self.health.put(defender, health)
+
+        # --- Win/Loss Check (only a defender that was just hit can be out of health) ---
+        knocked_out = health <= 0
+        if knocked_out.any():
+            winners = swings[knocked_out]
+            finished = winners % columns
+            ids = self.match_ids[finished]
+            self.winner[ids] = (winners >= columns).astype(np.int8) # The attacker's row
+            self.duration[ids] = self.frame - self.start_step[finished]
+            self.active[finished] = False
+            self.live -= finished.size
+            self._retire(np.concatenate((finished, finished + columns)))
+            if self.live <= self.active.size * COMPACT_AT:
+                self._compact()
+
+    def run(self, max_steps=60 * 60 * 5):
+        """
+        Steps until every match is over or has lasted max_steps, CHUNK_MATCHES matches at a time.
+
+        Returns a dict of per-match arrays: winner (0, 1 or -1 for a timeout), duration in steps,
+        hits_landed (shape (2, N)) and final health (shape (2, N)).
+        """
+        while self.live:
+            if self.frame - self.oldest_start >= max_steps:
+                self._time_out(max_steps)
+            else:
+                self.step()
+        return {
+            "winner": self.winner,
+            "duration": self.duration,
+            "hits_landed": self.final_hits,
+            "health": self.final_health,
+        }
@@ -0,0 +1,160 @@
+# fightingLogic/fightReplay.py
+"""
+Compact fight recordings: the RNG seed plus every simulation step's input bits.
+
+The simulation is deterministic for a given seed and input sequence, so that is all a replay
+needs to reproduce a fight exactly (see replayViewer.py). Files are written while the fight is
+played and flushed regularly, so a fight cut short by a crash can still be replayed up to the
+last flush.
+
+File layout (little endian):
+    b"ZJRP", version (u8), header length (u16), header (JSON: stage, characters, seed, ...)
+    records, each starting with an unsigned LEB128 varint n:
+        n > 0: n steps in a row with the same input, followed by one u16 of INPUT_* bits per player
+        n = 0: end of the fight, followed by footer length (u16) and footer (JSON: steps, health, ...)
+"""
+import json
+import os
+import struct
+from array import array
+
+MAGIC = b"ZJRP"
+VERSION = 1
+FILE_EXTENSION = ".zjr"
+FLUSH_EVERY_STEPS = 60 # At most this many steps are lost if the game dies mid fight
+
+def _write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+def _read_varint(data, position):
+    value = shift = 0
+    while True:
+        if position >= len(data):
+            raise EOFError("Replay ends in the middle of a record")
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+class ReplayWriter:
+    """
+    Records one fight. Call record() once per simulation step with every player's input bits,
+    then close() with the final result. Runs of identical input take a few bytes in total.
+    """
+    def __init__(self, path, header):
+        self.path = path
+        self.players = header.get("players", 1)
+        self.steps = 0
+        self._file = open(path, "wb")
+        header_bytes = json.dumps(header).encode()
+        self._file.write(MAGIC + struct.pack("<BH", VERSION, len(header_bytes)) + header_bytes)
+        self._run_input = None # Input of the current run...
+        self._run_length = 0   # ...and how many steps it has lasted
+        self._unflushed = 0
+
+    def record(self, *inputs):
+        """Adds one step. inputs holds one int of INPUT_* bits per player."""
+        if inputs != self._run_input:
+            self._write_run()
+            self._run_input = inputs
+        self._run_length += 1
+        self.steps += 1
+        self._unflushed += 1
+        if self._unflushed >= FLUSH_EVERY_STEPS:
+            self.flush()
+
+    def _write_run(self):
+        if not self._run_length:
+            return
+        record = bytearray()
+        _write_varint(record, self._run_length)
+        record += struct.pack(f"<{self.players}H", *self._run_input)
+        self._file.write(record)
+        self._run_length = 0
+
+    def flush(self):
+        """Writes the current run and pushes everything to disk (the run continues afterwards)."""
+        run_input = self._run_input
+        self._write_run()
+        self._run_input = run_input
+        self._file.flush()
+        self._unflushed = 0
+
+    def close(self, footer=None):
+        """Ends the recording. footer (JSON-able dict, e.g. final health) is what verify checks against."""
+        if self._file.closed:
+            return
+        self._write_run()
+        footer = dict(footer or {}, steps=self.steps)
+        footer_bytes = json.dumps(footer).encode()
+        self._file.write(b"\x00" + struct.pack("<H", len(footer_bytes)) + footer_bytes)
+        self._file.close()
+
+class Replay:
+    """A loaded recording: header, per-player input for every step, and the footer (None if cut short)."""
+    def __init__(self, header, inputs, footer):
+        self.header = header
+        self.inputs = inputs # One array('H') per player, indexed by step
+        self.footer = footer
+
+    @property
+    def steps(self):
+        return len(self.inputs[0]) if self.inputs else 0
+
+    def input_at(self, step):
+        """Tuple of every player's input bits for a step."""
+        return tuple(player_inputs[step] for player_inputs in self.inputs)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as replay_file:
+            data = replay_file.read()
+        if data[:4] != MAGIC:
+            raise ValueError(f"{path} is not a replay file")
+        version, header_length = struct.unpack_from("<BH", data, 4)
+        if version != VERSION:
+            raise ValueError(f"{path} is replay version {version}, this build reads version {VERSION}")
+        position = 7 + header_length
+        header = json.loads(data[7:position])
+        players = header.get("players", 1)
+        inputs = [array("H") for _ in range(players)]
+        footer = None
+        while position < len(data):
+            try:
+                run_length, position = _read_varint(data, position)
+                if run_length == 0:
+                    (footer_length,) = struct.unpack_from("<H", data, position)
+                    footer = json.loads(data[position + 2:position + 2 + footer_length])
+                    break
+                run_input = struct.unpack_from(f"<{players}H", data, position)
+            except (EOFError, struct.error):
+                break # Cut short (the game didn't get to close it): keep everything before this record
+            position += 2 * players
+            for player_inputs, bits in zip(inputs, run_input):
+                player_inputs.extend([bits] * run_length)
+        return cls(header, inputs, footer)
+
+def prune_replays(directory, keep):
+    """Deletes the oldest replays in directory until at most keep are left. Returns how many went."""
+    try:
+        paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(FILE_EXTENSION)]
+    except OSError:
+        return 0
+    paths.sort(key=lambda path: (os.path.getmtime(path), path))
+    removed = 0
+    for path in paths[:max(0, len(paths) - keep)]:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError as e:
+            print(f"Couldn't remove old replay {path}: {e}")
+    return removed
@@ -0,0 +1,512 @@
+# fightingLogic/fightSimulation.py
+"""
+Pure Python fight simulation (no pygame, no display, no image files).
+
+This is the game logic behind Player and FightStage: fighter physics, attacks, hit
+resolution and the reactive AI. The pygame classes are views over these objects, so a
+match stepped here behaves exactly like one played on screen. Use Match (or run_match)
+to simulate fights headlessly, e.g. for balance checks on build servers.
+"""
+import random
+import config
+
+# Size of a fighter's body rect (the sprite frame size)
+FIGHTER_WIDTH = 200
+FIGHTER_HEIGHT = 400
+
+# How much the body rect is widened sideways when checking if an attack connects
+ATTACK_REACH = 60
+
+# Collision rules (shared with stages.stageEngine)
+RULES_VERSUS = "versus"     # Both fighters can land hits, damage depends on the attack type
+RULES_TUTORIAL = "tutorial" # Only the first fighter can land hits, always for basic damage
+
+# One simulation step's player input, as press/release edges (what the key events did), so a
+# recorded fight (fightReplay) re-runs exactly like it was played
+INPUT_LEFT_DOWN = 1 << 0   # A pressed
+INPUT_RIGHT_DOWN = 1 << 1  # S pressed
+INPUT_LEFT_UP = 1 << 2     # A released
+INPUT_RIGHT_UP = 1 << 3    # S released
+INPUT_JUMP = 1 << 4        # Space
+INPUT_PUNCH = 1 << 5       # J
+INPUT_MID = 1 << 6         # W
+INPUT_SUPER = 1 << 7       # E
+INPUT_CLICK = 1 << 8       # Left mouse button
+
+# Special moves entered as motions, the W/E keys still work too (see apply_input). A motion is
+# presses in order within the fighter's last config.INPUT_MOTION_STEPS steps, the punch on the
+# step it completes. Facing follows movement here, so forward is whichever way the motion's
+# last direction press went and back is the other way.
+MOTION_FORWARD = "forward"
+MOTION_BACK = "back"
+MOTIONS = (
+    ("super", (MOTION_FORWARD, MOTION_BACK, MOTION_FORWARD, INPUT_PUNCH | INPUT_CLICK)),
+    ("mid", (MOTION_FORWARD, MOTION_FORWARD, INPUT_PUNCH | INPUT_CLICK)),
+)
+
+# Frames per animation state on the character sprite sheets (see fightingLogic.FrameBank)
+DEFAULT_FRAME_COUNTS = {"idle": 1, "basic_attack": 4, "walking": 1, "jumping": 1, "mid": 4, "super": 4}
+ANIMATION_SPEED = 8 # Simulation steps per animation frame
+
+def _round(value):
+    """Rounds half away from zero, the same way pygame.Rect stores float coordinates."""
+    if value >= 0:
+        return int(value + 0.5)
+    return -int(-value + 0.5)
+
+class FighterStats:
+    """Tunable numbers for one fighter. Defaults match the shipped game."""
+    __slots__ = ("BASIC_ATTACK_DAMAGE", "MID_ATTACK_DAMAGE", "SUPER_ATTACK_DAMAGE",
+                 "MID_ATTACK_THRESHOLD", "SUPER_ATTACK_THRESHOLD", "attack_cooldown",
+                 "starting_health", "jump_strength", "ai_attack_range", "ai_stop_threshold",
+                 "ai_attack_chance", "ai_jump_chance")
+
+    def __init__(self, **overrides):
+        self.BASIC_ATTACK_DAMAGE = 5
+        self.MID_ATTACK_DAMAGE = 10
+        self.SUPER_ATTACK_DAMAGE = 15
+        self.MID_ATTACK_THRESHOLD = 5
+        self.SUPER_ATTACK_THRESHOLD = 10
+        self.attack_cooldown = 30      # Steps an attack lasts
+        self.starting_health = 45
+        self.jump_strength = 15
+        self.ai_attack_range = 65      # Distance at which AI starts swinging
+        self.ai_stop_threshold = 55    # AI will keep walking until it reaches this "sweet spot"
+        self.ai_attack_chance = 0.03   # Per step chance to swing while in range
+        self.ai_jump_chance = 0.005    # Per step chance to jump while on the ground
+        for name, value in overrides.items():
+            setattr(self, name, value)
+
+    def copy(self):
+        return FighterStats(**{name: getattr(self, name) for name in self.__slots__})
+
+    def damage_for_state(self, state):
+        if state == "mid":
+            return self.MID_ATTACK_DAMAGE
+        if state == "super":
+            return self.SUPER_ATTACK_DAMAGE
+        return self.BASIC_ATTACK_DAMAGE
+
+class FighterState:
+    """
+    Everything about one fighter that changes during a match.
+
+    x/y is the top-left of the body rect, in screen pixels. Uses __slots__ so states are
+    small and cheap to copy (see copy() and snapshot()).
+    """
+    __slots__ = ("x", "y", "width", "height", "vel_x", "vel_y", "on_ground", "facing_right",
+                 "state", "is_attacking", "attack_cooldown", "attack_hit_count",
+                 "has_dealt_hit_this_attack", "health", "last_hit_by_basic_attack",
+                 "current_frame", "animation_timer", "input_history", "buffered_attack",
+                 "buffered_steps", "stats", "frame_counts")
+
+    # Fields that change during a match (stats and frame_counts are shared and never change)
+    DYNAMIC_FIELDS = ("x", "y", "vel_x", "vel_y", "on_ground", "facing_right", "state",
+                      "is_attacking", "attack_cooldown", "attack_hit_count",
+                      "has_dealt_hit_this_attack", "health", "last_hit_by_basic_attack",
+                      "current_frame", "animation_timer", "input_history", "buffered_attack",
+                      "buffered_steps")
+
+    def __init__(self, center_x, bottom, stats=None, frame_counts=None,
+                 width=FIGHTER_WIDTH, height=FIGHTER_HEIGHT):
+        """
+        Args:
+            center_x (float): Horizontal center of the fighter.
+            bottom (float): Y of the fighter's feet.
+            stats (FighterStats): Tunable numbers (defaults to the game's values).
+            frame_counts (dict): Frames per animation state, used to wrap current_frame.
+        """
+        self.stats = stats or FighterStats()
+        self.frame_counts = frame_counts or DEFAULT_FRAME_COUNTS
+        self.width = width
+        self.height = height
+        self.x = _round(center_x) - width // 2
+        self.y = _round(bottom) - height
+
+        self.health = self.stats.starting_health
+        self.vel_x = 0
+        self.vel_y = 0
+        self.on_ground = True
+        self.facing_right = True
+        self.state = "idle"
+        self.is_attacking = False
+        self.attack_cooldown = 3
+        self.attack_hit_count = 0
+        self.has_dealt_hit_this_attack = False
+        self.last_hit_by_basic_attack = 0
+        self.current_frame = 0
+        self.animation_timer = 0
+        self.input_history = () # Last config.INPUT_MOTION_STEPS steps' INPUT_* bits, oldest first
+        self.buffered_attack = None # Attack pressed while busy, started once the fighter can (see apply_input)
+        self.buffered_steps = 0
+
+    @property
+    def centerx(self):
+        return self.x + self.width // 2
+
+    @property
+    def bottom(self):
+        return self.y + self.height
+
+    def snapshot(self):
+        """Returns the dynamic fields as a tuple (see restore())."""
+        return (self.x, self.y, self.vel_x, self.vel_y, self.on_ground, self.facing_right,
+                self.state, self.is_attacking, self.attack_cooldown, self.attack_hit_count,
+                self.has_dealt_hit_this_attack, self.health, self.last_hit_by_basic_attack,
+                self.current_frame, self.animation_timer, self.input_history, self.buffered_attack,
+                self.buffered_steps)
+
+    def restore(self, snapshot):
+        """Puts the fighter back to a state taken with snapshot()."""
+        (self.x, self.y, self.vel_x, self.vel_y, self.on_ground, self.facing_right,
+         self.state, self.is_attacking, self.attack_cooldown, self.attack_hit_count,
+         self.has_dealt_hit_this_attack, self.health, self.last_hit_by_basic_attack,
+         self.current_frame, self.animation_timer, self.input_history, self.buffered_attack,
+         self.buffered_steps) = snapshot
+
+    def copy(self):
+        """Returns an independent copy that shares stats and frame_counts."""
+        clone = FighterState.__new__(FighterState)
+        clone.stats = self.stats
+        clone.frame_counts = self.frame_counts
+        clone.width = self.width
+        clone.height = self.height
+        clone.restore(self.snapshot())
+        return clone
+
+# --- FIGHTER ACTIONS (what Player.update/move/jump/attack used to do) ---
+
+def update_fighter(f):
+    """Advances one fighter by one simulation step: physics, floor, attack timer and animation."""
+    # Direction
+    if f.vel_x > 0: f.facing_right = True
+    elif f.vel_x < 0: f.facing_right = False
+
+    # Physics
+    if not f.on_ground:
+        f.vel_y += config.GRAVITY
+
+    f.x = _round(f.x + f.vel_x)
+    f.y = _round(f.y + f.vel_y)
+
+    # Floor
+    floor_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
+    if f.y + f.height >= floor_y:
+        f.y = floor_y - f.height
+        f.vel_y = 0
+        f.on_ground = True
+
+    # Handle Attack State
+    if f.attack_cooldown > 0:
+        f.attack_cooldown -= 1
+        if f.attack_cooldown == 0:
+            f.is_attacking = False
+            f.state = "idle"
+
+    if f.last_hit_by_basic_attack > 0:
+        f.last_hit_by_basic_attack -= 1
+
+    # Animation
+    f.animation_timer += 1
+    if f.animation_timer >= ANIMATION_SPEED:
+        f.animation_timer = 0
+        counts = f.frame_counts
+        f.current_frame = (f.current_frame + 1) % counts.get(f.state, counts["idle"])
+
+def move(f, direction):
+    if not f.is_attacking:
+        f.vel_x = direction * config.PLAYER_SPEED
+        if f.on_ground: f.state = "walking"
+
+def stop_move(f):
+    f.vel_x = 0
+    if f.on_ground and not f.is_attacking: f.state = "idle"
+
+def jump(f):
+    if f.on_ground:
+        f.vel_y = -f.stats.jump_strength
+        f.on_ground = False
+        f.state = "jumping"
+
+def attack(f, attack_type="basic"):
+    """Starts an attack. Returns False if the fighter is already attacking."""
+    if f.is_attacking: return False
+
+    f.is_attacking = True
+    f.state = "basic_attack" # Map mid/super to this animation for now
+    f.current_frame = 0
+    f.attack_cooldown = f.stats.attack_cooldown
+    f.has_dealt_hit_this_attack = False
+    return True
+
+def take_damage(f, amount):
+    # Only take damage if not currently attacking (defense bonus)
+    if not f.is_attacking:
+        f.health -= amount
+        return True
+    return False
+
+def apply_input(f, bits):
+    """
+    Applies one step's player input (INPUT_* bits) the way the keyboard handler always has, plus
+    special move motions (MOTIONS) and attack buffering: an attack pressed while the fighter is
+    still busy starts as soon as it can, if that is within config.INPUT_BUFFER_STEPS steps. Call
+    it every step, with 0 for steps without input, so the input history keeps time.
+    """
+    if config.INPUT_MOTION_STEPS:
+        f.input_history = (f.input_history + (bits,))[-config.INPUT_MOTION_STEPS:]
+    if not bits:
+        if f.buffered_attack is not None:
+            _buffered_attack(f, None)
+        return
+    left_tapped = bits & INPUT_LEFT_DOWN and bits & INPUT_LEFT_UP
+    right_tapped = bits & INPUT_RIGHT_DOWN and bits & INPUT_RIGHT_UP
+    # Releases come before presses ("let go of A, press S" keeps walking right), except for keys
+    # pressed and released within the same step, which stop after moving
+    if (bits & INPUT_LEFT_UP and not left_tapped) or (bits & INPUT_RIGHT_UP and not right_tapped):
+        stop_move(f)
+    if bits & INPUT_LEFT_DOWN: move(f, -1)
+    if bits & INPUT_RIGHT_DOWN: move(f, 1)
+    if bits & INPUT_JUMP: jump(f)
+    _buffered_attack(f, _requested_attack(f, bits))
+    if left_tapped or right_tapped:
+        stop_move(f)
+
+def _special_unlocked(f, attack_type):
+    if attack_type == "mid":
+        return f.attack_hit_count >= f.stats.MID_ATTACK_THRESHOLD
+    return f.attack_hit_count >= f.stats.SUPER_ATTACK_THRESHOLD
+
+def _requested_attack(f, bits):
+    """The attack this step's input asks for, if any: a completed motion first, then J/click, W and E."""
+    if f.input_history and bits & (INPUT_PUNCH | INPUT_CLICK):
+        for attack_type, motion in MOTIONS:
+            if _special_unlocked(f, attack_type) and motion_entered(f.input_history, motion):
+                return attack_type
+    if bits & (INPUT_PUNCH | INPUT_CLICK): return "basic"
+    if bits & INPUT_MID and _special_unlocked(f, "mid"): return "mid"
+    if bits & INPUT_SUPER and _special_unlocked(f, "super"): return "super"
+    return None
+
+def _buffered_attack(f, requested):
+    """Starts the requested attack, or keeps it for later while f is busy; otherwise retries the buffered one."""
+    if requested is None:
+        requested = f.buffered_attack
+        if requested is None:
+            return
+        f.buffered_steps -= 1
+    else:
+        f.buffered_steps = config.INPUT_BUFFER_STEPS
+    if attack(f, requested) or f.buffered_steps <= 0:
+        f.buffered_attack = None
+    else:
+        f.buffered_attack = requested
+
+def motion_entered(history, motion):
+    """
+    True if the presses in motion (MOTION_FORWARD/MOTION_BACK or INPUT_* bits) appear in order in
+    history (per step INPUT_* bits, oldest first), the last one on the newest step.
+    """
+    if not history[-1] & motion[-1]:
+        return False
+    forward = back = 0
+    wanted = len(motion) - 2
+    for bits in reversed(history[:-1]):
+        if wanted < 0:
+            return True
+        direction = bits & (INPUT_LEFT_DOWN | INPUT_RIGHT_DOWN)
+        if direction and not forward and direction != INPUT_LEFT_DOWN | INPUT_RIGHT_DOWN:
+            # The newest direction press decides which way is forward
+            forward = direction
+            back = direction ^ (INPUT_LEFT_DOWN | INPUT_RIGHT_DOWN)
+        press = motion[wanted]
+        press = forward if press == MOTION_FORWARD else back if press == MOTION_BACK else press
+        if press and bits & press:
+            wanted -= 1
+    return wanted < 0
+
+def ai_decide(f, target_centerx, rng=random):
+    """
+    The reactive AI: walks toward the target and swings when close.
+
+    Moves/jumps f directly and returns "basic_attack" when it wants to attack, otherwise None.
+    """
+    stats = f.stats
+    # Calculate center-to-center distance
+    dist_x = target_centerx - (f.x + f.width // 2)
+    abs_dist = abs(dist_x)
+
+    # 1. Decision: Attack if in range
+    if abs_dist <= stats.ai_attack_range:
+        stop_move(f) # Stop walking to perform the attack
+        # Use a random check so it doesn't spam perfectly every frame
+        if rng.random() < stats.ai_attack_chance:
+            return "basic_attack"
+
+    # 2. Decision: Move if too far
+    elif abs_dist > stats.ai_stop_threshold:
+        # Move toward target
+        move(f, 1 if dist_x > 0 else -1)
+
+    # 3. Decision: Standing still (already at the sweet spot)
+    else:
+        stop_move(f)
+
+    # 4. Optional: Random Jump logic
+    if f.on_ground and rng.random() < stats.ai_jump_chance:
+        jump(f)
+    return None
+
+# --- HIT RESOLUTION ---
+
+def attack_connects(attacker, defender):
+    """True if the attacker's reach (body rect widened by ATTACK_REACH) overlaps the defender's body."""
+    half_reach = ATTACK_REACH // 2
+    return (attacker.x - half_reach < defender.x + defender.width
+            and defender.x < attacker.x + attacker.width + ATTACK_REACH - half_reach
+            and attacker.y < defender.y + defender.height
+            and defender.y < attacker.y + attacker.height)
+
+def resolve_attack(attacker, defender, rules=RULES_VERSUS, connects=attack_connects):
+    """Applies the attacker's current attack to the defender. Returns True if it landed."""
+    if not attacker.is_attacking or attacker.has_dealt_hit_this_attack:
+        return False
+    if not connects(attacker, defender):
+        return False
+
+    if rules == RULES_TUTORIAL:
+        damage = attacker.stats.BASIC_ATTACK_DAMAGE
+    else:
+        if defender.is_attacking:
+            return False
+        # Damage based on state (BASIC, MID, SUPER)
+        damage = attacker.stats.damage_for_state(attacker.state)
+
+    if take_damage(defender, damage):
+        attacker.attack_hit_count += 1
+        attacker.has_dealt_hit_this_attack = True
+        return True
+    return False
+
+def resolve_hits(first, second, rules=RULES_VERSUS, connects=attack_connects):
+    """Resolves both fighters' attacks for one step. Returns (first landed, second landed)."""
+    first_hit = resolve_attack(first, second, rules, connects)
+    if rules == RULES_TUTORIAL:
+        # Tutorial: only the player's punches count
+        return first_hit, False
+    return first_hit, resolve_attack(second, first, rules, connects)
+
+# --- MATCHES ---
+
+def reactive_ai(match, index):
+    """Controller hook using the game's built-in AI (ai_decide)."""
+    target = match.fighters[1 - index]
+    return ai_decide(match.fighters[index], target.x + target.width // 2, match.rng)
+
+class Match:
+    """
+    Two fighters stepped with the same rules as a fight stage.
+
+    controllers holds one callable per fighter, called as controller(match, index) once per step
+    after physics; it can move the fighter and returns an attack name (e.g. "basic_attack") or None.
+    None means the fighter is driven from outside (e.g. the keyboard). connects decides whether an
+    attack reaches the defender (attack_connects; fight stages swap in fightingLogic.MaskHitTest).
+    """
+    def __init__(self, first=None, second=None, rules=RULES_VERSUS, seed=None,
+                 controllers=(None, reactive_ai), max_steps=None):
+        ground_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
+        self.fighters = [
+            first or FighterState(config.SCREEN_WIDTH * 0.2, ground_y),
+            second or FighterState(config.SCREEN_WIDTH * 0.8, ground_y),
+        ]
+        self.rules = rules
+        self.rng = random.Random(seed)
+        self.controllers = list(controllers)
+        self.max_steps = max_steps
+        self.connects = attack_connects
+        self.frame = 0
+        self.hits_landed = [0, 0]
+        self.winner = None # Index of the winning fighter once the match is over
+
+    def step(self, mark=None):
+        """
+        Advances the match by one step. Returns the winner's index once someone is out of health.
+
+        mark is an optional callable (e.g. FrameProfiler.mark) called with the name of each phase
+        as it finishes: "update", "ai" and "collisions".
+        """
+        if self.winner is not None:
+            return self.winner
+        first, second = self.fighters
+        update_fighter(first)
+        update_fighter(second)
+        if mark: mark("update")
+
+        for index, controller in enumerate(self.controllers):
+            if controller is None:
+                continue
+            action = controller(self, index)
+            if action:
+                # Normalizing "basic_attack" to "basic"
+                attack(self.fighters[index], action.replace("_attack", ""))
+        if mark: mark("ai")
+
+        first_hit, second_hit = resolve_hits(first, second, self.rules, self.connects)
+        self.hits_landed[0] += first_hit
+        self.hits_landed[1] += second_hit
+        if mark: mark("collisions")
+        self.frame += 1
+
+        # Win/Loss Check
+        if first.health <= 0 or second.health <= 0:
+            self.winner = 0 if second.health <= 0 else 1
+        return self.winner
+
+    def snapshot(self):
+        """
+        Returns everything step() changes as a tuple (see restore()), for rolling the match back.
+        The RNG state is only included when an AI controller can draw from it, since copying it
+        costs far more than the fighters themselves.
+        """
+        first, second = self.fighters
+        rng_state = self.rng.getstate() if any(self.controllers) else None
+        return (first.snapshot(), second.snapshot(), self.frame, self.hits_landed[0],
+                self.hits_landed[1], self.winner, rng_state)
+
+    def restore(self, snapshot):
+        """Puts the match back to a state taken with snapshot()."""
+        first, second, self.frame, first_hits, second_hits, self.winner, rng_state = snapshot
+        self.fighters[0].restore(first)
+        self.fighters[1].restore(second)
+        self.hits_landed[0] = first_hits
+        self.hits_landed[1] = second_hits
+        if rng_state is not None:
+            self.rng.setstate(rng_state)
+
+    def run(self):
+        """Steps until someone wins (or max_steps runs out). Returns the winner's index or None."""
+        while self.winner is None:
+            if self.max_steps is not None and self.frame >= self.max_steps:
+                break
+            self.step()
+        return self.winner
+
+def run_match(seed=None, stats=(None, None), rules=RULES_VERSUS, max_steps=60 * 60 * 5):
+    """
+    Plays one AI-vs-AI match headlessly.
+
+    Returns a dict with the winner index (None on timeout), steps taken, hits landed and final health.
+    """
+    ground_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
+    match = Match(
+        FighterState(config.SCREEN_WIDTH * 0.2, ground_y, stats[0]),
+        FighterState(config.SCREEN_WIDTH * 0.8, ground_y, stats[1]),
+        rules=rules, seed=seed, controllers=(reactive_ai, reactive_ai), max_steps=max_steps,
+    )
+    winner = match.run()
+    return {
+        "winner": winner,
+        "steps": match.frame,
+        "hits_landed": tuple(match.hits_landed),
+        "health": (match.fighters[0].health, match.fighters[1].health),
+    }
@@ -1,15 +1,24 @@
 # fightingLogic/fightingLogic.py
 import pygame
 import config
+import textCache
+from fightingLogic import fightSimulation
+from fightingLogic import spriteAtlas
+import assetCache
+from surfacePool import surface_pool
 import random
 
-def draw_controls_overlay(screen):
-    """Draws the control instructions on the screen."""
-    font = pygame.font.SysFont("Arial", 28, bold=True)
-    
-    overlay = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 190))  
-    screen.blit(overlay, (0, 0))
+def draw_controls_overlay(surface):
+    """
+    Composes the controls overlay (a dim layer and the controls) over surface, which holds
+    premultiplied alpha: an overlay being put together for a pygame.BLEND_PREMULTIPLIED blit
+    (see stages.stageEngine.CountdownScene), or an opaque screen.
+    """
+    font = textCache.get_font("Arial", 28, bold=True)
+
+    with surface_pool.scratch(surface.get_size(), pygame.SRCALPHA) as overlay:
+        overlay.fill((0, 0, 0, 190)) # Black is the same premultiplied
+        surface.blit(overlay, (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
 
     # Show game controls on screen
     controls = [
@@ -18,41 +27,321 @@ def draw_controls_overlay(screen):
         ("BASIC ATTACK", "Left Click / J"),
         ("MID / SUPER", "W / E Keys")
     ]
+    if config.INPUT_MOTION_STEPS: # See fightSimulation.MOTIONS
+        controls.append(("", "or double tap a direction + J / zig-zag + J"))
 
     for i, (action, key) in enumerate(controls):
         color = (255, 255, 255) if action != "" else (255, 215, 0)
-        text_surf = font.render(f"{action}   {key}", True, color)
+        text_surf = textCache.render_text(font, f"{action}   {key}", color, premultiplied=True)
         text_rect = text_surf.get_rect(center=(config.SCREEN_WIDTH // 2, 200 + (i * 45)))
-        screen.blit(text_surf, text_rect)
+        surface.blit(text_surf, text_rect, special_flags=pygame.BLEND_PREMULTIPLIED)
 
 class Spritesheet:
     def __init__(self, filename):
         try:
-            self.sprite_sheet = pygame.image.load(filename).convert_alpha()
+            # Shared through the asset cache so every Player reuses the same decoded sheet
+            self.sprite_sheet = assetCache.load_image(filename, pixel_format=assetCache.FORMAT_ALPHA)
         except:
             self.sprite_sheet = None
 
     def get_sprite(self, x, y, w, h):
         if not self.sprite_sheet: return None
+        rect = pygame.Rect(x, y, w, h)
+        if self.sprite_sheet.get_rect().contains(rect):
+            return self.sprite_sheet.subsurface(rect) # Shares the sheet's pixels, no copy
+        # Partly off the sheet: copy onto a transparent frame so it keeps its full size
         sprite = pygame.Surface((w, h), pygame.SRCALPHA)
         sprite.blit(self.sprite_sheet, (0, 0), (x, y, w, h))
         return sprite
 
+# --- SHARED ANIMATION FRAME BANKS ---
+SPRITE_FRAME_SIZE = (200, 400)
+CHARACTER_SPRITE_SHEETS = {
+    "The Boat Man": "assests/sprites/male_punch.png",
+    "The Log Lady": "assests/sprites/female_punch.bmp",
+}
+
+# Top-left corner of every SPRITE_FRAME_SIZE cell on a character sheet, per animation
+CHARACTER_FRAME_LAYOUT = {
+    "idle": [(5, 10)],
+    "basic_attack": [(5 + i * SPRITE_FRAME_SIZE[0], 10) for i in range(4)],
+}
+# States that have no frames of their own yet reuse another animation
+STATE_ALIASES = {
+    "walking": "idle",
+    "jumping": "idle",
+    # Add placeholders for mid/super so they don't crash
+    "mid": "basic_attack",
+    "super": "basic_attack",
+}
+
+_frame_banks = {} # character name -> FrameBank
+_fallback_frame_bank = None
+
+# Hit masks of frames without transparency: pixels within this distance of the sheet's
+# background color don't count, nor do specks smaller than HIT_MASK_MIN_PIXELS
+HIT_MASK_KEY_TOLERANCE = 40
+HIT_MASK_MIN_PIXELS = 200
+
+def background_key(sheet):
+    """Background color of an opaque sprite sheet (its top-left pixel), or None if it has transparency."""
+    color = sheet.get_at((0, 0))
+    return tuple(color) if color.a == 255 else None
+
+def _make_hit_mask(frame, mask_key):
+    """Mask of the pixels of frame that can hit or be hit."""
+    if mask_key is None:
+        return pygame.mask.from_surface(frame)
+    tolerance = HIT_MASK_KEY_TOLERANCE
+    mask = pygame.mask.from_threshold(frame, mask_key, (tolerance, tolerance, tolerance, 255))
+    mask.invert()
+    transparent = pygame.mask.from_surface(frame)
+    transparent.invert()
+    mask.erase(transparent, (0, 0)) # Parts of a cell that were off the sheet
+    cleaned = pygame.mask.Mask(frame.get_size())
+    for component in mask.connected_components(HIT_MASK_MIN_PIXELS):
+        cleaned.draw(component, (0, 0))
+    return cleaned
+
+class FrameBank:
+    """
+    Every animation frame of one character, sliced once and stored for both facings.
+
+    Players only index into these lists, so animating never allocates a surface. Frames can be
+    smaller than SPRITE_FRAME_SIZE (the atlas trims transparent borders); each one has an offset
+    saying where its top-left sits inside the full cell, which lines up with the fighter's body.
+
+    Every frame also has a hit mask (see get_mask), built the first time it is asked for (or all
+    at once by build_masks) and kept for both facings. mask_key is the background color of opaque
+    sheets; without one the frames' alpha decides.
+    """
+    def __init__(self, animations, offsets=None, flipped_animations=None, flipped_offsets=None, mask_key=None):
+        self.animations = animations # Right facing frames, as drawn on the sheet
+        self.offsets = offsets or {state: [(0, 0)] * len(frames) for state, frames in animations.items()}
+
+        if flipped_animations is None:
+            flipped_animations, flipped_offsets = self._flip_frames()
+        self.flipped_animations = flipped_animations
+        self.flipped_offsets = flipped_offsets
+
+        # Frames per state, so the simulation can wrap animation indices without the surfaces
+        self.frame_counts = {state: len(frames) for state, frames in animations.items()}
+
+        self.mask_key = mask_key
+        self._masks = {}         # id(frame) -> (mask, offset, bounds)
+        self._mask_surfaces = {} # id(mask) -> debug view surface
+
+    def _flip_frames(self):
+        # States often share the same frame objects (idle/walking/jumping), so flip each one once
+        cell_width = SPRITE_FRAME_SIZE[0]
+        flipped_by_id = {}
+        flipped_animations = {}
+        flipped_offsets = {}
+        for state, frames in self.animations.items():
+            flipped_frames = []
+            for frame in frames:
+                if id(frame) not in flipped_by_id:
+                    flipped_by_id[id(frame)] = pygame.transform.flip(frame, True, False)
+                flipped_frames.append(flipped_by_id[id(frame)])
+            flipped_animations[state] = flipped_frames
+            flipped_offsets[state] = [(cell_width - dx - frame.get_width(), dy)
+                                      for frame, (dx, dy) in zip(frames, self.offsets[state])]
+        return flipped_animations, flipped_offsets
+
+    def get_frames(self, state, facing_right=True):
+        animations = self.animations if facing_right else self.flipped_animations
+        return animations.get(state, animations["idle"])
+
+    def get_frame(self, state, facing_right, index):
+        """Returns (surface, offset within the cell) for an animation frame; index wraps around."""
+        animations, offsets = (self.animations, self.offsets) if facing_right else (self.flipped_animations, self.flipped_offsets)
+        if state not in animations:
+            state = "idle"
+        frames = animations[state]
+        index %= len(frames)
+        return frames[index], offsets[state][index]
+
+    def get_mask(self, state, facing_right, index):
+        """
+        Returns (mask, offset within the cell, bounds within the cell) for an animation frame.
+        bounds is (left, top, right, bottom) of the mask's set pixels, for cheap rejects.
+        """
+        frame, offset = self.get_frame(state, facing_right, index)
+        entry = self._masks.get(id(frame))
+        if entry is None:
+            mask = _make_hit_mask(frame, self.mask_key)
+            # Bounding rect of the set pixels (much faster than Mask.get_bounding_rects)
+            box = mask.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 0)).get_bounding_rect()
+            box.move_ip(offset)
+            entry = (mask, offset, (box.left, box.top, box.right, box.bottom))
+            self._masks[id(frame)] = entry
+        return entry
+
+    def build_masks(self):
+        """Builds every frame's hit mask now rather than on the first hit check."""
+        for facing_right in (True, False):
+            for state, frames in (self.animations if facing_right else self.flipped_animations).items():
+                for index in range(len(frames)):
+                    self.get_mask(state, facing_right, index)
+
+    def get_mask_surface(self, mask):
+        """Translucent view of a hit mask, for the debug overlay."""
+        surface = self._mask_surfaces.get(id(mask))
+        if surface is None:
+            surface = mask.to_surface(setcolor=(255, 0, 0, 110), unsetcolor=(0, 0, 0, 0))
+            self._mask_surfaces[id(mask)] = surface
+        return surface
+
+def _slice_character_frames(sheet, w, h):
+    animations = {state: [sheet.get_sprite(x, y, w, h) for x, y in cells]
+                  for state, cells in CHARACTER_FRAME_LAYOUT.items()}
+    for state, source_state in STATE_ALIASES.items():
+        animations[state] = animations[source_state]
+    return animations
+
+def _fallback_frames(w, h):
+    # Create a simple colored square if the chicken file is also missing
+    fallback = pygame.Surface((w, h), pygame.SRCALPHA)
+    fallback.fill((255, 0, 255, 180)) # Purple error color
+
+    states = ["idle", "basic_attack", "walking", "jumping", "mid", "super"]
+    return {s: [fallback] for s in states}
+
+def character_asset_keys(character_name):
+    """Asset cache keys a character's frames are built from (the atlas if it covers them, else the sheet)."""
+    path = CHARACTER_SPRITE_SHEETS.get(character_name)
+    if not path:
+        return []
+    if spriteAtlas.has_character(character_name, path, CHARACTER_FRAME_LAYOUT):
+        return [spriteAtlas.atlas_key()]
+    return [assetCache.asset_cache.make_key(path, pixel_format=assetCache.FORMAT_ALPHA)]
+
+def get_frame_bank(character_name):
+    """Returns the shared FrameBank for a character, building it on first use."""
+    global _fallback_frame_bank
+    bank = _frame_banks.get(character_name)
+    if bank is None:
+        w, h = SPRITE_FRAME_SIZE
+        path = CHARACTER_SPRITE_SHEETS.get(character_name)
+        # Packed atlas (atlasPacker.py) first: its frames are trimmed, pre-flipped subsurfaces
+        atlas_frames = spriteAtlas.load_character(character_name, path, CHARACTER_FRAME_LAYOUT) if path else None
+        sheet = Spritesheet(path) if path and not atlas_frames else None
+
+        if atlas_frames:
+            animations, offsets, flipped_animations, flipped_offsets, mask_key = atlas_frames
+            for state, source_state in STATE_ALIASES.items():
+                for frames in (animations, offsets, flipped_animations, flipped_offsets):
+                    frames[state] = frames[source_state]
+            bank = FrameBank(animations, offsets, flipped_animations, flipped_offsets, mask_key)
+        elif sheet and sheet.sprite_sheet:
+            bank = FrameBank(_slice_character_frames(sheet, w, h), mask_key=background_key(sheet.sprite_sheet))
+        else:
+            # Unknown characters and broken sheets all share one fallback bank
+            if _fallback_frame_bank is None:
+                _fallback_frame_bank = FrameBank(_fallback_frames(w, h))
+            bank = _fallback_frame_bank
+        _frame_banks[character_name] = bank
+    return bank
+
+# --- PIXEL ACCURATE HITS ---
+
+class MaskHitTest:
+    """
+    Match.connects hook: an attack lands when the attacker's current frame overlaps the
+    defender's pixel for pixel, instead of the widened body rects of fightSimulation.attack_connects.
+
+    The frames' mask bounds are compared first, so the mask test only runs for fighters that are
+    actually close. fighters_and_banks pairs each FighterState with its FrameBank.
+    """
+    def __init__(self, fighters_and_banks):
+        self._banks = {id(fighter): bank for fighter, bank in fighters_and_banks}
+        self.stats = {"tests": 0, "rect_rejects": 0, "hits": 0}
+
+    def frame_mask(self, fighter):
+        """(mask, mask position on screen, bounds on screen) of the fighter's current frame."""
+        mask, (dx, dy), (left, top, right, bottom) = self._banks[id(fighter)].get_mask(
+            fighter.state, fighter.facing_right, fighter.current_frame)
+        x, y = fighter.x, fighter.y
+        return mask, (x + dx, y + dy), (x + left, y + top, x + right, y + bottom)
+
+    def __call__(self, attacker, defender):
+        self.stats["tests"] += 1
+        attacker_mask, attacker_pos, attacker_bounds = self.frame_mask(attacker)
+        defender_mask, defender_pos, defender_bounds = self.frame_mask(defender)
+        if (attacker_bounds[0] >= defender_bounds[2] or defender_bounds[0] >= attacker_bounds[2]
+                or attacker_bounds[1] >= defender_bounds[3] or defender_bounds[1] >= attacker_bounds[3]):
+            self.stats["rect_rejects"] += 1
+            return False
+        offset = (defender_pos[0] - attacker_pos[0], defender_pos[1] - attacker_pos[1])
+        if attacker_mask.overlap(defender_mask, offset) is None:
+            return False
+        self.stats["hits"] += 1
+        return True
+
+    def draw_debug(self, screen, fighters):
+        """Draws each fighter's hit mask and mask bounds, with overlapping pixels in yellow."""
+        views = [self.frame_mask(fighter) for fighter in fighters]
+        for fighter, (mask, position, (left, top, right, bottom)) in zip(fighters, views):
+            screen.blit(self._banks[id(fighter)].get_mask_surface(mask), position)
+            pygame.draw.rect(screen, config.YELLOW, (left, top, right - left, bottom - top), 1)
+        for (mask, position, _), (other, other_position, _) in zip(views, views[1:]):
+            overlap = mask.overlap_mask(other, (other_position[0] - position[0], other_position[1] - position[1]))
+            if overlap.count():
+                screen.blit(overlap.to_surface(setcolor=(255, 255, 0, 200), unsetcolor=(0, 0, 0, 0)), position)
+
+def _fighter_attribute(name, source="fighter"):
+    """Property that reads/writes an attribute of the Player's simulation state (or its stats)."""
+    if source == "stats":
+        return property(lambda self: getattr(self.fighter.stats, name),
+                        lambda self, value: setattr(self.fighter.stats, name, value))
+    return property(lambda self: getattr(self.fighter, name),
+                    lambda self, value: setattr(self.fighter, name, value))
+
 class Player(pygame.sprite.Sprite):
-    def __init__(self, character_name, initial_x, initial_y, is_player_controlled=True):
+    """
+    The on-screen view of a fighter.
+
+    All game logic lives in fightSimulation; a Player owns a FighterState (self.fighter),
+    forwards its actions to the simulation and keeps image/rect in sync with it.
+    """
+    # Simulation state, exposed under the names the stages have always used
+    health = _fighter_attribute("health")
+    vel_x = _fighter_attribute("vel_x")
+    vel_y = _fighter_attribute("vel_y")
+    on_ground = _fighter_attribute("on_ground")
+    facing_right = _fighter_attribute("facing_right")
+    state = _fighter_attribute("state")
+    is_attacking = _fighter_attribute("is_attacking")
+    attack_cooldown = _fighter_attribute("attack_cooldown")
+    attack_hit_count = _fighter_attribute("attack_hit_count")
+    has_dealt_hit_this_attack = _fighter_attribute("has_dealt_hit_this_attack")
+    last_hit_by_basic_attack = _fighter_attribute("last_hit_by_basic_attack")
+    current_frame = _fighter_attribute("current_frame")
+    animation_timer = _fighter_attribute("animation_timer")
+
+    BASIC_ATTACK_DAMAGE = _fighter_attribute("BASIC_ATTACK_DAMAGE", "stats")
+    MID_ATTACK_DAMAGE = _fighter_attribute("MID_ATTACK_DAMAGE", "stats")
+    SUPER_ATTACK_DAMAGE = _fighter_attribute("SUPER_ATTACK_DAMAGE", "stats")
+    MID_ATTACK_THRESHOLD = _fighter_attribute("MID_ATTACK_THRESHOLD", "stats")
+    SUPER_ATTACK_THRESHOLD = _fighter_attribute("SUPER_ATTACK_THRESHOLD", "stats")
+
+    def __init__(self, character_name, initial_x, initial_y, is_player_controlled=True, stats=None):
         super().__init__()
         self.character_name = character_name
         self.is_player_controlled = is_player_controlled
         self.animations = {}
-        self.current_frame = 0
-        self.animation_speed = 8 # Slightly slower for smoother looks
-        self.animation_timer = 0
-        
+        self.animation_speed = fightSimulation.ANIMATION_SPEED # Slightly slower for smoother looks
+
         self._load_all_sprites()
-        
-        # Initial image setup
-        self.image = self.animations["idle"][0]
-        self.rect = self.image.get_rect(midbottom=(initial_x, initial_y))
+
+        # Simulation state (position, physics, attacks, health)
+        self.fighter = fightSimulation.FighterState(initial_x, initial_y, stats, self.frame_bank.frame_counts)
+
+        # Initial image setup. body_rect is the fighter itself; rect is where the current frame is
+        # drawn, which differs from body_rect when the frame was trimmed
+        self.body_rect = pygame.Rect(self.fighter.x, self.fighter.y, self.fighter.width, self.fighter.height)
+        self.image, self._frame_offset = self.frame_bank.get_frame("idle", True, 0)
+        self.rect = self.image.get_rect(topleft=(self.fighter.x + self._frame_offset[0], self.fighter.y + self._frame_offset[1]))
 
         # Hitbox (The area where the player GETS hit)
         self.hitbox = pygame.Rect(0, 0, 50, 80) 
@@ -62,167 +351,57 @@ class Player(pygame.sprite.Sprite):
         self.attack_hitbox_width = 70
         self.attack_hitbox_height = 40
 
-        # Stats
-        self.health = 45
-        self.vel_x = 0
-        self.vel_y = 0
-        self.on_ground = True
-        self.facing_right = True
-        self.state = "idle"
-        self.is_attacking = False
-        self.attack_cooldown = 3
-        self.attack_hit_count = 0
-        self.has_dealt_hit_this_attack = False
-        
-        self.BASIC_ATTACK_DAMAGE = 5
-        self.MID_ATTACK_DAMAGE = 10
-        self.SUPER_ATTACK_DAMAGE = 15
-        self.MID_ATTACK_THRESHOLD = 5
-        self.SUPER_ATTACK_THRESHOLD = 10
-        self.last_hit_by_basic_attack = 0
-
     def _load_all_sprites(self):
-        w, h = 200, 400
-        path = None
-        
-        if self.character_name == "The Boat Man":
-            path = "assests/sprites/male_punch.png"
-        elif self.character_name == "The Log Lady":
-            path = "assests/sprites/female_punch.bmp"
-
-        sheet = Spritesheet(path) if path else None
-
-        if sheet and sheet.sprite_sheet:
-            self.animations["idle"] = [sheet.get_sprite(5, 10, w, h)]
-            self.animations["basic_attack"] = [sheet.get_sprite(5 + (i*w), 10, w, h) for i in range(4)]
-            self.animations["walking"] = [self.animations["idle"][0]]
-            self.animations["jumping"] = [self.animations["idle"][0]]
-            # Add placeholders for mid/super so they don't crash
-            self.animations["mid"] = self.animations["basic_attack"]
-            self.animations["super"] = self.animations["basic_attack"]
-        else:
-            self._load_chicken_fallback(w, h)
-
-    def _load_chicken_fallback(self, w, h):
-        # Create a simple colored square if the chicken file is also missing
-        fallback = pygame.Surface((w, h), pygame.SRCALPHA)
-        fallback.fill((255, 0, 255, 180)) # Purple error color
-        
-        states = ["idle", "basic_attack", "walking", "jumping", "mid", "super"]
-        for s in states:
-            self.animations[s] = [fallback]
+        # Frames are sliced (and pre-flipped) once per character and shared by every Player
+        self.frame_bank = get_frame_bank(self.character_name)
+        self.animations = self.frame_bank.animations
 
     def update(self):
-        # Direction
-        if self.vel_x > 0: self.facing_right = True
-        elif self.vel_x < 0: self.facing_right = False
+        fightSimulation.update_fighter(self.fighter)
+        self.sync_view()
 
-        # Physics
-        if not self.on_ground:
-            self.vel_y += config.GRAVITY
-        
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
-
-        # Floor
-        if self.rect.bottom >= config.SCREEN_HEIGHT - config.GROUND_HEIGHT:
-            self.rect.bottom = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
-            self.vel_y = 0
-            self.on_ground = True
+    def sync_view(self, force_frame=False):
+        """
+        Copies the simulation state onto the sprite (rect, hitboxes and animation frame).
+        force_frame picks the frame even mid-animation, for when the state jumped (a rollback).
+        """
+        f = self.fighter
+        self.body_rect.topleft = (f.x, f.y)
 
         # Sync Hitbox to Sprite center
-        self.hitbox.center = self.rect.center
-
-        # Handle Attack State
-        if self.attack_cooldown > 0:
-            self.attack_cooldown -= 1
-            if self.attack_cooldown == 0:
-                self.is_attacking = False
-                self.attack_hitbox = None
-                self.state = "idle"
-        
-        if self.last_hit_by_basic_attack > 0:
-            self.last_hit_by_basic_attack -= 1
-
-        self._animate()
-
-    def _animate(self):
-        self.animation_timer += 1
-        if self.animation_timer >= self.animation_speed:
-            self.animation_timer = 0
-            frames = self.animations.get(self.state, self.animations["idle"])
-            self.current_frame = (self.current_frame + 1) % len(frames)
-            
-            img = frames[self.current_frame]
-            if not self.facing_right:
-                self.image = pygame.transform.flip(img, True, False)
-            else:
-                self.image = img
+        self.hitbox.center = self.body_rect.center
+        if not f.is_attacking:
+            self.attack_hitbox = None
+        elif self.attack_hitbox is None:
+            # Attack started in the simulation (input bits or AI): position the hitbox in front
+            side = self.body_rect.right if self.facing_right else self.body_rect.left - self.attack_hitbox_width
+            self.attack_hitbox = pygame.Rect(side, self.body_rect.centery, self.attack_hitbox_width, self.attack_hitbox_height)
+
+        # The animation frame only changes on the step the animation timer wraps
+        if f.animation_timer == 0 or force_frame:
+            self.image, self._frame_offset = self.frame_bank.get_frame(f.state, f.facing_right, f.current_frame)
+            self.rect.size = self.image.get_size()
+        self.rect.topleft = (f.x + self._frame_offset[0], f.y + self._frame_offset[1])
 
     def move(self, direction):
-        if not self.is_attacking:
-            self.vel_x = direction * config.PLAYER_SPEED
-            if self.on_ground: self.state = "walking"
+        fightSimulation.move(self.fighter, direction)
 
     def stop_move(self):
-        self.vel_x = 0
-        if self.on_ground and not self.is_attacking: self.state = "idle"
+        fightSimulation.stop_move(self.fighter)
 
     def jump(self):
-        if self.on_ground:
-            self.vel_y = -15 # Jump strength
-            self.on_ground = False
-            self.state = "jumping"
+        fightSimulation.jump(self.fighter)
 
     def attack(self, attack_type="basic"):
-        if self.is_attacking: return
-        
-        self.is_attacking = True
-        self.state = "basic_attack" # Map mid/super to this animation for now
-        self.current_frame = 0
-        self.attack_cooldown = 30
-        self.has_dealt_hit_this_attack = False
+        if not fightSimulation.attack(self.fighter, attack_type): return
 
         # Position the hitbox in front of the player
-        side = self.rect.right if self.facing_right else self.rect.left - self.attack_hitbox_width
-        self.attack_hitbox = pygame.Rect(side, self.rect.centery, self.attack_hitbox_width, self.attack_hitbox_height)
+        side = self.body_rect.right if self.facing_right else self.body_rect.left - self.attack_hitbox_width
+        self.attack_hitbox = pygame.Rect(side, self.body_rect.centery, self.attack_hitbox_width, self.attack_hitbox_height)
 
     def take_damage(self, amount):
-        # Only take damage if not currently attacking (defense bonus)
-        if not self.is_attacking:
-            self.health -= amount
-            return True
-        return False
+        return fightSimulation.take_damage(self.fighter, amount)
 
-    def handle_ai(self, player_rect, player_is_attacking):
+    def handle_ai(self, player_rect, player_is_attacking, rng=random):
         if self.is_player_controlled: return None
-        
-        # Calculate center-to-center distance
-        dist_x = player_rect.centerx - self.rect.centerx
-        abs_dist = abs(dist_x)
-        
-        # --- AI TUNING CONSTANTS ---
-        attack_range = 65    # Distance at which AI starts swinging
-        stop_threshold = 55  # AI will keep walking until it reaches this "sweet spot"
-        
-        # 1. Decision: Attack if in range
-        if abs_dist <= attack_range:
-            self.stop_move() # Stop walking to perform the attack
-            # Use a random check so it doesn't spam perfectly every frame
-            if random.random() < 0.03: 
-                return "basic_attack"
-        
-        # 2. Decision: Move if too far
-        elif abs_dist > stop_threshold:
-            # Move toward player
-            direction = 1 if dist_x > 0 else -1
-            self.move(direction)
-            
-        # 3. Decision: Standing still (already at the sweet spot)
-        else:
-            self.stop_move()
-
-        # 4. Optional: Random Jump logic
-        if self.on_ground and random.random() < 0.005:
-            self.jump()
-        return None
+        return fightSimulation.ai_decide(self.fighter, player_rect.centerx, rng)
@@ -0,0 +1,358 @@
+# fightingLogic/hordeSimulation.py
+"""
+Survival ("horde") mode logic for the bonus stage: one fighter against hundreds of small enemies.
+
+Like fightSimulation this is pure Python with no pygame. Enemies live in a fixed-size pool of
+parallel lists (nothing is allocated when one spawns or dies), collision candidates come from a
+uniform grid instead of checking every pair, and the AI re-thinks for one staggered group of
+enemies per step while movement runs for all of them.
+"""
+import random
+import config
+from fightingLogic import fightSimulation
+
+# Enemy box (a drawn enemy is this size; x/y are its top-left)
+ENEMY_WIDTH = 56
+ENEMY_HEIGHT = 56
+ENEMY_SPEED = 2.5          # Pixels per step when chasing
+ENEMY_HEALTH = 1
+PECK_DAMAGE = 1            # Damage an enemy deals while touching the fighter...
+PECK_COOLDOWN = 45         # ...at most once per this many steps
+KNOCKBACK = 40             # Pixels a surviving enemy is pushed back when hit
+SEPARATION = 34            # Enemies closer than this (center to center) push each other apart
+ANIMATION_SPEED = 6        # Steps per enemy animation frame
+ENEMY_FRAME_COUNT = 3
+
+# Enemies walk on a band of ground in front of and behind the fighter's feet
+LANE_TOP = config.SCREEN_HEIGHT - config.GROUND_HEIGHT - 100
+LANE_BOTTOM = config.SCREEN_HEIGHT - 10
+SPAWN_MARGIN = 80          # Enemies spawn this far outside the screen edges
+
+# The fighter's boxes against enemies (the 200 px wide sprite frame is mostly background)
+BODY_WIDTH = 90            # Where enemies can peck, centered on the fighter
+SWING_REACH = 130          # How far in front of its center the fighter's attack reaches
+
+class EnemyPool:
+    """
+    Fixed capacity storage for enemies as parallel lists (struct-of-arrays).
+
+    An enemy is just an index into the lists. active holds the indices of live enemies; spawn()
+    reuses a free slot and despawn() returns it, so the pool never allocates after construction.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.x = [0.0] * capacity
+        self.y = [0.0] * capacity
+        self.lane_y = [0.0] * capacity      # y the enemy drifts toward, so the horde spreads over the lane
+        self.vel_x = [0.0] * capacity
+        self.health = [0] * capacity
+        self.peck_cooldown = [0] * capacity
+        self.hit_by_attack = [0] * capacity # Last fighter attack that hit it (one hit per swing)
+        self.facing_right = [True] * capacity
+        self.frame = [0] * capacity
+        self.animation_timer = [0] * capacity
+
+        self.active = []                 # Indices of live enemies
+        self.despawned = []              # Indices that died during the last Horde.step
+        self._position = [-1] * capacity # index -> position in active (-1 when free)
+        self._free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return len(self.active)
+
+    def spawn(self, x, y, lane_y, health=ENEMY_HEALTH):
+        """Puts an enemy in a free slot. Returns its index, or -1 when the pool is full."""
+        if not self._free:
+            return -1
+        index = self._free.pop()
+        self.x[index] = x
+        self.y[index] = y
+        self.lane_y[index] = lane_y
+        self.vel_x[index] = 0.0
+        self.health[index] = health
+        self.peck_cooldown[index] = PECK_COOLDOWN
+        self.hit_by_attack[index] = 0
+        self.facing_right[index] = True
+        self.frame[index] = 0
+        self.animation_timer[index] = index % ANIMATION_SPEED # So the horde doesn't flap in unison
+        self._position[index] = len(self.active)
+        self.active.append(index)
+        return index
+
+    def despawn(self, index):
+        # Swap with the last live enemy so removal doesn't shift the list
+        position = self._position[index]
+        last = self.active.pop()
+        if last != index:
+            self.active[position] = last
+            self._position[last] = position
+        self._position[index] = -1
+        self._free.append(index)
+        self.despawned.append(index)
+
+    def is_active(self, index):
+        return self._position[index] != -1
+
+class SpatialHash:
+    """
+    Uniform grid over the arena for broadphase collision checks.
+
+    Each entity is filed under the cell holding its center, so query() only has to widen the
+    box by half an entity to find everything that might overlap it, and never returns duplicates.
+    Cells are cleared and refilled every step; only the cells that were used get cleared.
+    """
+    def __init__(self, cell_size, left, top, right, bottom):
+        self.cell_size = cell_size
+        self.left = left
+        self.top = top
+        self.cols = (right - left) // cell_size + 1
+        self.rows = (bottom - top) // cell_size + 1
+        self.cells = [[] for _ in range(self.cols * self.rows)]
+        self._filled = []
+
+    def _col(self, x):
+        return min(max(int((x - self.left) // self.cell_size), 0), self.cols - 1)
+
+    def _row(self, y):
+        return min(max(int((y - self.top) // self.cell_size), 0), self.rows - 1)
+
+    def clear(self):
+        cells = self.cells
+        for cell in self._filled:
+            cells[cell].clear()
+        self._filled.clear()
+
+    def insert(self, entity, center_x, center_y):
+        cell = self._row(center_y) * self.cols + self._col(center_x)
+        bucket = self.cells[cell]
+        if not bucket:
+            self._filled.append(cell)
+        bucket.append(entity)
+
+    def remove(self, entity, center_x, center_y):
+        """Takes entity out of the cell it was inserted under (center_x, center_y as passed to insert)."""
+        self.cells[self._row(center_y) * self.cols + self._col(center_x)].remove(entity)
+
+    def query(self, left, top, right, bottom, out):
+        """Fills out (a reused list) with every entity whose center cell touches the box."""
+        out.clear()
+        cells = self.cells
+        first_col, last_col = self._col(left), self._col(right)
+        for row in range(self._row(top), self._row(bottom) + 1):
+            base = row * self.cols
+            for cell in range(base + first_col, base + last_col + 1):
+                if cells[cell]:
+                    out.extend(cells[cell])
+        return out
+
+class Horde:
+    """
+    Enemies chasing one FighterState: they spawn at the screen edges, peck the fighter while
+    touching it and die to its attacks. The fighter itself is stepped by the caller
+    (fightSimulation.update_fighter), before step().
+    """
+    def __init__(self, capacity=config.HORDE_POOL_SIZE, max_active=config.HORDE_MAX_ACTIVE,
+                 spawn_rate=config.HORDE_SPAWN_RATE, spawn_rate_growth=config.HORDE_SPAWN_RATE_GROWTH,
+                 ai_groups=config.HORDE_AI_GROUPS, cell_size=config.HORDE_GRID_CELL_SIZE, seed=None):
+        """
+        Args:
+            capacity (int): Pool size, the most enemies that can ever be alive.
+            max_active (int): Spawning pauses at this many live enemies.
+            spawn_rate (float): Enemies per second at the start...
+            spawn_rate_growth (float): ...plus this many per second for every second survived.
+            ai_groups (int): The AI re-thinks for 1/ai_groups of the horde each step.
+            cell_size (int): Spatial hash cell size in pixels.
+        """
+        self.pool = EnemyPool(capacity)
+        self.grid = SpatialHash(cell_size, -SPAWN_MARGIN - ENEMY_WIDTH, LANE_TOP - ENEMY_HEIGHT,
+                                config.SCREEN_WIDTH + SPAWN_MARGIN + ENEMY_WIDTH, LANE_BOTTOM)
+        self.max_active = min(max_active, capacity)
+        self.spawn_rate = spawn_rate
+        self.spawn_rate_growth = spawn_rate_growth
+        self.ai_groups = max(1, ai_groups)
+        self.peck_damage = PECK_DAMAGE
+        self.rng = random.Random(seed)
+
+        self.frame = 0
+        self.kills = 0
+        self._spawn_credit = 0.0
+        self._attack_id = 0
+        self._was_attacking = False
+        self._candidates = [] # Reused for every grid query
+
+        # Per step counters, for the stage's readout and the benchmarks
+        self.stats = {"candidates": 0, "box_tests": 0, "pecks": 0, "hits": 0}
+
+    # --- SPAWNING ---
+
+    def spawn(self, count, fighter_centerx=None):
+        """Spawns up to count enemies just off screen (on the side away from fighter_centerx if given)."""
+        spawned = 0
+        rng = self.rng
+        for _ in range(count):
+            if len(self.pool) >= self.max_active:
+                break
+            if fighter_centerx is None:
+                from_left = rng.random() < 0.5
+            else:
+                # Mostly from the far side, so enemies don't appear on top of the fighter
+                from_left = (fighter_centerx > config.SCREEN_WIDTH / 2) != (rng.random() < 0.25)
+            x = -SPAWN_MARGIN - rng.random() * SPAWN_MARGIN if from_left else config.SCREEN_WIDTH + rng.random() * SPAWN_MARGIN
+            lane_y = rng.uniform(LANE_TOP, LANE_BOTTOM) - ENEMY_HEIGHT
+            if self.pool.spawn(x, lane_y, lane_y) == -1:
+                break
+            spawned += 1
+        return spawned
+
+    def _spawn_step(self, fighter):
+        rate = self.spawn_rate + self.spawn_rate_growth * self.frame / config.SIMULATION_HZ
+        self._spawn_credit += rate / config.SIMULATION_HZ
+        if self._spawn_credit >= 1.0:
+            count = int(self._spawn_credit)
+            self._spawn_credit -= count
+            self.spawn(count, fighter.x + fighter.width // 2)
+
+    # --- STEP ---
+
+    def step(self, fighter, mark=None):
+        """
+        Advances the horde by one step against fighter. Returns how much damage the fighter took.
+
+        mark is an optional profiler hook, called with "ai" and "collisions".
+        """
+        pool = self.pool
+        stats = self.stats
+        stats["candidates"] = stats["box_tests"] = stats["pecks"] = stats["hits"] = 0
+        pool.despawned.clear()
+        self._spawn_step(fighter)
+
+        target_x = fighter.x + fighter.width // 2
+        self._think(target_x)
+        self._move()
+        if mark: mark("ai")
+
+        # Rebuild the broadphase grid from this step's positions
+        grid = self.grid
+        grid.clear()
+        half_w, half_h = ENEMY_WIDTH / 2, ENEMY_HEIGHT / 2
+        xs, ys = pool.x, pool.y
+        for index in pool.active:
+            grid.insert(index, xs[index] + half_w, ys[index] + half_h)
+
+        self._resolve_attack(fighter, target_x)
+        damage = self._resolve_pecks(fighter, target_x)
+        if mark: mark("collisions")
+        self.frame += 1
+        return damage
+
+    def _think(self, target_x):
+        """AI for this step's group: pick a chase direction and push away from close neighbours."""
+        pool = self.pool
+        active = pool.active
+        xs, ys, vel_x = pool.x, pool.y, pool.vel_x
+        grid = self.grid
+        candidates = self._candidates
+        half_w = ENEMY_WIDTH / 2
+        reach = BODY_WIDTH / 2
+        for position in range(self.frame % self.ai_groups, len(active), self.ai_groups):
+            index = active[position]
+            x, y = xs[index], ys[index]
+            dist_x = target_x - (x + half_w)
+            velocity = ENEMY_SPEED if dist_x > reach else -ENEMY_SPEED if dist_x < -reach else 0.0
+
+            # Separation: neighbours come from the grid built last step (enemies killed since are
+            # taken out of it, ones spawned since aren't in it yet)
+            push = 0.0
+            grid.query(x - SEPARATION, y - SEPARATION, x + ENEMY_WIDTH + SEPARATION, y + ENEMY_HEIGHT + SEPARATION, candidates)
+            for other in candidates:
+                if other == index:
+                    continue
+                dx = x - xs[other]
+                if -SEPARATION < dx < SEPARATION and -SEPARATION < y - ys[other] < SEPARATION:
+                    push += 1.0 if dx > 0 or (dx == 0 and index > other) else -1.0
+            vel_x[index] = velocity + max(-ENEMY_SPEED, min(ENEMY_SPEED, push * 0.75))
+
+    def _move(self):
+        """Movement, lane drift, timers and animation for every live enemy."""
+        pool = self.pool
+        xs, ys, lane_y, vel_x = pool.x, pool.y, pool.lane_y, pool.vel_x
+        peck_cooldown, facing_right = pool.peck_cooldown, pool.facing_right
+        frame, animation_timer = pool.frame, pool.animation_timer
+        for index in pool.active:
+            velocity = vel_x[index]
+            xs[index] += velocity
+            ys[index] += (lane_y[index] - ys[index]) * 0.1
+            if velocity > 0: facing_right[index] = True
+            elif velocity < 0: facing_right[index] = False
+            if peck_cooldown[index] > 0:
+                peck_cooldown[index] -= 1
+            animation_timer[index] += 1
+            if animation_timer[index] >= ANIMATION_SPEED:
+                animation_timer[index] = 0
+                if velocity:
+                    frame[index] = (frame[index] + 1) % ENEMY_FRAME_COUNT
+
+    def _resolve_attack(self, fighter, target_x):
+        """The fighter's attack hits every enemy in the swing box once per swing."""
+        if fighter.is_attacking and not self._was_attacking:
+            self._attack_id += 1
+        self._was_attacking = fighter.is_attacking
+        if not fighter.is_attacking:
+            return
+
+        if fighter.facing_right:
+            left, right = target_x, target_x + SWING_REACH
+        else:
+            left, right = target_x - SWING_REACH, target_x
+        top, bottom = fighter.y + fighter.height // 2, LANE_BOTTOM
+
+        pool = self.pool
+        xs, ys, health, hit_by_attack = pool.x, pool.y, pool.health, pool.hit_by_attack
+        grid = self.grid
+        candidates = grid.query(left - ENEMY_WIDTH / 2, top - ENEMY_HEIGHT / 2,
+                                right + ENEMY_WIDTH / 2, bottom + ENEMY_HEIGHT / 2, self._candidates)
+        self.stats["candidates"] += len(candidates)
+        box_tests = 0
+        attack_id = self._attack_id
+        for index in candidates:
+            if hit_by_attack[index] == attack_id:
+                continue
+            box_tests += 1
+            x, y = xs[index], ys[index]
+            if x >= right or x + ENEMY_WIDTH <= left or y >= bottom or y + ENEMY_HEIGHT <= top:
+                continue
+            hit_by_attack[index] = attack_id
+            self.stats["hits"] += 1
+            health[index] -= 1
+            if health[index] <= 0:
+                pool.despawn(index)
+                grid.remove(index, x + ENEMY_WIDTH / 2, y + ENEMY_HEIGHT / 2) # Filed at this position this step
+                self.kills += 1
+            else:
+                xs[index] += KNOCKBACK if fighter.facing_right else -KNOCKBACK
+        self.stats["box_tests"] += box_tests
+
+    def _resolve_pecks(self, fighter, target_x):
+        """Enemies touching the fighter's body peck it (each one at most every PECK_COOLDOWN steps)."""
+        left, right = target_x - BODY_WIDTH // 2, target_x + BODY_WIDTH // 2
+        top, bottom = fighter.y + fighter.height // 2, fighter.y + fighter.height + 30 # Feet reach into the lane
+        pool = self.pool
+        xs, ys, peck_cooldown = pool.x, pool.y, pool.peck_cooldown
+        candidates = self.grid.query(left - ENEMY_WIDTH / 2, top - ENEMY_HEIGHT / 2,
+                                     right + ENEMY_WIDTH / 2, bottom + ENEMY_HEIGHT / 2, self._candidates)
+        self.stats["candidates"] += len(candidates)
+        box_tests = 0
+        damage = 0
+        for index in candidates:
+            if peck_cooldown[index]:
+                continue
+            box_tests += 1
+            x, y = xs[index], ys[index]
+            if x >= right or x + ENEMY_WIDTH <= left or y >= bottom or y + ENEMY_HEIGHT <= top:
+                continue
+            peck_cooldown[index] = PECK_COOLDOWN
+            self.stats["pecks"] += 1
+            if self.peck_damage and fightSimulation.take_damage(fighter, self.peck_damage):
+                damage += self.peck_damage
+        self.stats["box_tests"] += box_tests
+        return damage
@@ -0,0 +1,344 @@
+# fightingLogic/netplay.py
+"""
+Rollback netcode for two-player fights over UDP (see netplayMatch.py).
+
+Both sides run the same deterministic Match and only exchange input bits (fightSimulation.INPUT_*).
+Each step the local input is sent right away and the step is simulated with the remote input if it
+has arrived, otherwise with a prediction (no new presses or releases). The match is snapshotted
+before every step; when a remote input turns out different from the prediction, the match is
+restored to that step and re-simulated up to the present. Running more than max_rollback steps
+ahead of the last confirmed remote input stalls instead, so rollbacks stay short.
+
+Packets are tiny and unreliable by design: every input packet repeats all local inputs the peer
+hasn't acknowledged yet, so a lost packet is covered by the next one.
+
+LossyLink wraps the socket and can add latency, jitter and packet loss for testing on localhost.
+"""
+import heapq
+import json
+import random
+import socket
+import struct
+import time
+from array import array
+
+import config
+from fightingLogic import fightSimulation
+
+MAGIC = b"ZJNP"
+VERSION = 1
+PACKET_HEADER = struct.Struct("<4sBB")  # magic, version, packet type
+INPUT_HEADER = struct.Struct("<IIB")    # first frame in the packet, frames received from the peer, input count
+MAX_INPUTS_PER_PACKET = 255
+
+PACKET_HELLO = 1 # Client -> host: JSON with the client's character
+PACKET_START = 2 # Host -> client: JSON with everything both sides need to build the same match
+PACKET_INPUT = 3
+PACKET_QUIT = 4
+
+HELLO_RESEND_SECONDS = 0.25
+
+def _packet(packet_type, payload=b""):
+    return PACKET_HEADER.pack(MAGIC, VERSION, packet_type) + payload
+
+def _parse(data):
+    """Returns (packet type, payload), or (None, None) for anything that isn't ours."""
+    if len(data) < PACKET_HEADER.size:
+        return None, None
+    magic, version, packet_type = PACKET_HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        return None, None
+    return packet_type, data[PACKET_HEADER.size:]
+
+class LossyLink:
+    """
+    A non-blocking UDP socket to one peer that can delay, jitter and drop outgoing packets.
+
+    latency_ms is added to every packet sent from this side (so with the same settings on both
+    sides the round trip grows by twice that), jitter_ms varies it by up to that much either way
+    (which also reorders packets) and loss is the chance a packet is dropped.
+    """
+    def __init__(self, bind_address, peer_address=None, latency_ms=0, jitter_ms=0, loss=0.0, seed=None):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(bind_address)
+        self.sock.setblocking(False)
+        self.peer_address = peer_address # The host learns it from the first packet
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self._delayed = [] # Heap of (send time, sequence, packet)
+        self._sequence = 0
+        self.stats = {"sent": 0, "received": 0, "dropped": 0}
+
+    def send(self, data):
+        if self.loss and self.rng.random() < self.loss:
+            self.stats["dropped"] += 1
+            return
+        if self.latency or self.jitter:
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            self._sequence += 1
+            heapq.heappush(self._delayed, (time.perf_counter() + delay, self._sequence, data))
+            self._send_due()
+        else:
+            self._send_now(data)
+
+    def _send_now(self, data):
+        try:
+            self.sock.sendto(data, self.peer_address)
+            self.stats["sent"] += 1
+        except OSError:
+            pass # Nobody listening (yet): same as a lost packet
+
+    def _send_due(self):
+        now = time.perf_counter()
+        while self._delayed and self._delayed[0][0] <= now:
+            self._send_now(heapq.heappop(self._delayed)[2])
+
+    def receive(self):
+        """Sends whatever delayed packets are due, then returns every datagram waiting (with its address)."""
+        self._send_due()
+        packets = []
+        while True:
+            try:
+                data, address = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return packets
+            except OSError:
+                continue # e.g. Windows reporting an earlier send to a closed port
+            self.stats["received"] += 1
+            packets.append((data, address))
+
+    def close(self):
+        self.sock.close()
+
+def host_handshake(link, start_info, timeout=None):
+    """
+    Waits for a client's hello and answers with start_info (a JSON-able dict, which gets the
+    client's hello merged in under "client"). Returns the client's hello.
+    """
+    deadline = None if timeout is None else time.perf_counter() + timeout
+    while deadline is None or time.perf_counter() < deadline:
+        for data, address in link.receive():
+            packet_type, payload = _parse(data)
+            if packet_type == PACKET_HELLO:
+                link.peer_address = address
+                hello = json.loads(payload)
+                start_info["client"] = hello
+                link.send(_packet(PACKET_START, json.dumps(start_info).encode()))
+                return hello
+        time.sleep(0.005)
+    raise ConnectionError("No client connected")
+
+def client_handshake(link, hello, timeout=config.NETPLAY_TIMEOUT_SECONDS):
+    """Sends hello to the host until it answers. Returns the host's start info."""
+    deadline = time.perf_counter() + timeout
+    next_hello = 0.0
+    payload = _packet(PACKET_HELLO, json.dumps(hello).encode())
+    while time.perf_counter() < deadline:
+        if time.perf_counter() >= next_hello:
+            link.send(payload)
+            next_hello = time.perf_counter() + HELLO_RESEND_SECONDS
+        for data, _ in link.receive():
+            packet_type, start_payload = _parse(data)
+            if packet_type == PACKET_START:
+                return json.loads(start_payload)
+        time.sleep(0.005)
+    raise ConnectionError(f"Host {link.peer_address[0]}:{link.peer_address[1]} didn't answer")
+
+class RollbackSession:
+    """
+    Steps a two-fighter Match in lockstep with a remote peer, predicting and rolling back.
+
+    match should have no AI controllers (both fighters are driven by input). Call advance() once
+    per simulation step with the local player's INPUT_* bits.
+    """
+    def __init__(self, match, local_index, link, max_rollback=config.NETPLAY_MAX_ROLLBACK,
+                 input_delay=config.NETPLAY_INPUT_DELAY, timeout=config.NETPLAY_TIMEOUT_SECONDS,
+                 start_info=None):
+        """
+        Args:
+            match (fightSimulation.Match): The match, in the same starting state on both sides.
+            local_index (int): Which fighter this side controls (0 host, 1 client).
+            link (LossyLink): Connected to the peer.
+            max_rollback (int): Most steps simulated ahead of confirmed remote input.
+            input_delay (int): Steps between reading local input and applying it; hides that much
+                latency without any rollback.
+            timeout (float): Seconds without hearing from the peer before giving up.
+            start_info (dict): On the host, what host_handshake sent; sent again if the client's
+                hello shows up again (the first answer was lost).
+        """
+        self.match = match
+        self.local_index = local_index
+        self.link = link
+        self.max_rollback = max_rollback
+        self.input_delay = input_delay
+        self.timeout = timeout
+        self._start_packet = _packet(PACKET_START, json.dumps(start_info).encode()) if start_info else None
+
+        self.frame = 0           # Next step to simulate
+        self.local_inputs = array("H", [0] * input_delay) # By step, including the delayed ones
+        self.remote_inputs = {}  # Step -> remote input, for steps that may still be (re)simulated
+        self.received = 0        # Remote inputs received so far (without gaps)
+        self.peer_received = 0   # How many of our inputs the peer has
+        self._predicted = {}     # Step -> remote input it was simulated with
+        self._snapshots = [None] * (max_rollback + 2) # Match state before each recent step
+        self._forgotten = 0      # Steps before this are final and their inputs dropped
+        self._held_input = 0     # Local input from stalled steps, applied on the next one
+        self._winner_step = None
+        self._last_heard = None  # Set on the first advance(), the countdown may run before that
+        self.peer_quit = False
+
+        self.stats = {"rollbacks": 0, "resimulated": 0, "max_depth": 0, "stalls": 0,
+                      "predicted": 0, "resimulated_per_second": 0}
+        self._rate_started = time.perf_counter()
+        self._rate_resimulated = 0
+
+    # --- NETWORK ---
+
+    def _send_inputs(self):
+        first = max(self.peer_received, len(self.local_inputs) - MAX_INPUTS_PER_PACKET)
+        inputs = self.local_inputs[first:]
+        payload = INPUT_HEADER.pack(first, self.received, len(inputs)) + inputs.tobytes()
+        self.link.send(_packet(PACKET_INPUT, payload))
+
+    def _receive(self):
+        """Takes in every packet waiting. Returns the earliest already simulated step that was mispredicted, or None."""
+        mispredicted = None
+        for data, _ in self.link.receive():
+            packet_type, payload = _parse(data)
+            if packet_type is None:
+                continue
+            self._last_heard = time.perf_counter()
+            if packet_type == PACKET_QUIT:
+                self.peer_quit = True
+            elif packet_type == PACKET_HELLO and self._start_packet:
+                self.link.send(self._start_packet)
+            elif packet_type == PACKET_INPUT:
+                first, peer_received, count = INPUT_HEADER.unpack_from(payload)
+                self.peer_received = max(self.peer_received, peer_received)
+                inputs = array("H")
+                inputs.frombytes(payload[INPUT_HEADER.size:INPUT_HEADER.size + 2 * count])
+                for step, bits in enumerate(inputs, start=first):
+                    if step < self.received or step in self.remote_inputs:
+                        continue
+                    self.remote_inputs[step] = bits
+                    if step < self.frame and self._predicted.get(step) != bits:
+                        mispredicted = step if mispredicted is None else min(mispredicted, step)
+        while self.received in self.remote_inputs:
+            self.received += 1
+        return mispredicted
+
+    def _catch_up(self):
+        """Takes in the peer's packets and re-simulates from the first mispredicted step."""
+        mispredicted = self._receive()
+        if mispredicted is not None:
+            self._rollback(mispredicted)
+        # Steps simulated with confirmed input are final: their inputs are no longer needed
+        for step in range(self._forgotten, self.confirmed + 1):
+            self.remote_inputs.pop(step, None)
+            self._predicted.pop(step, None)
+        self._forgotten = max(self._forgotten, self.confirmed + 1)
+
+    @property
+    def confirmed(self):
+        """Last step simulated with the peer's real input (every step before it was too)."""
+        return min(self.received, self.frame) - 1
+
+    # --- SIMULATION ---
+
+    def _simulate(self, step):
+        """Snapshots the match, then runs one step with the local input and the remote one (or its prediction)."""
+        self._snapshots[step % len(self._snapshots)] = self.match.snapshot()
+        remote = self.remote_inputs.get(step)
+        if remote is None:
+            remote = 0 # Prediction: no new presses or releases, the remote player keeps doing what they were doing
+            self.stats["predicted"] += 1
+        self._predicted[step] = remote
+        inputs = (self.local_inputs[step], remote) if self.local_index == 0 else (remote, self.local_inputs[step])
+        fightSimulation.apply_input(self.match.fighters[0], inputs[0])
+        fightSimulation.apply_input(self.match.fighters[1], inputs[1])
+        self.match.step()
+        if self.match.winner is not None and self._winner_step is None:
+            self._winner_step = step
+
+    def _rollback(self, step):
+        depth = self.frame - step
+        self.match.restore(self._snapshots[step % len(self._snapshots)])
+        if self._winner_step is not None and self._winner_step >= step:
+            self._winner_step = None
+        for resimulated in range(step, self.frame):
+            self._simulate(resimulated)
+        self.stats["rollbacks"] += 1
+        self.stats["resimulated"] += depth
+        self.stats["max_depth"] = max(self.stats["max_depth"], depth)
+
+    def advance(self, local_bits):
+        """
+        Runs the next step (plus any rollback the latest packets call for). Returns False if it
+        stalled waiting for the peer (local_bits are kept for the next step), True otherwise.
+        Raises ConnectionError if the peer has been silent for longer than the timeout.
+        """
+        now = time.perf_counter()
+        if self._last_heard is None:
+            self._last_heard = now
+        self._catch_up()
+        self._update_rate()
+        if self.peer_quit and self.winner is None and self.frame >= self.received:
+            raise ConnectionError("The other player left")
+        if now - self._last_heard > self.timeout:
+            raise ConnectionError("Lost connection to the other player")
+
+        if self.frame - self.confirmed > self.max_rollback:
+            # Too far ahead of the peer to keep guessing: wait for it (and keep it informed)
+            self._held_input |= local_bits
+            self.stats["stalls"] += 1
+            self._send_inputs()
+            return False
+        self.local_inputs.append(local_bits | self._held_input)
+        self._held_input = 0
+        self._send_inputs()
+        self._simulate(self.frame)
+        self.frame += 1
+        return True
+
+    @property
+    def winner(self):
+        """The winning fighter's index once the win is confirmed by both sides' input, else None."""
+        if self._winner_step is not None and self._winner_step <= self.confirmed:
+            return self.match.winner
+        return None
+
+    def _update_rate(self):
+        now = time.perf_counter()
+        if now - self._rate_started >= 1.0:
+            resimulated = self.stats["resimulated"]
+            self.stats["resimulated_per_second"] = round((resimulated - self._rate_resimulated) / (now - self._rate_started))
+            self._rate_started, self._rate_resimulated = now, resimulated
+
+    def synchronize(self, timeout=config.NETPLAY_TIMEOUT_SECONDS):
+        """
+        Waits (without advancing) until every simulated step is confirmed and the peer has all our
+        input, rolling back if needed. Returns True if that happened within timeout.
+        """
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            self._catch_up()
+            self._send_inputs() # Also tells the peer how much of its input we have
+            # A peer that quit has stopped listening, it either has everything or gave up
+            if self.received >= self.frame and (self.peer_received >= len(self.local_inputs) or self.peer_quit):
+                return True
+            time.sleep(0.005)
+        return False
+
+    def close(self):
+        """Tells the peer we're leaving, after making sure it has our last inputs if it can."""
+        if self.peer_quit:
+            return
+        self.synchronize(timeout=1.0)
+        for _ in range(3): # Unreliable, so say it a few times
+            self.link.send(_packet(PACKET_QUIT))
+        deadline = time.perf_counter() + self.link.latency + self.link.jitter + 0.05
+        while time.perf_counter() < deadline: # Let delayed packets go out
+            self.link.receive()
+            time.sleep(0.005)
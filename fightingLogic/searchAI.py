@@ -0,0 +1,196 @@
+# fightingLogic/searchAI.py
+"""
+A harder opponent AI that looks ahead instead of reacting (config.OPPONENT_AI = "lookahead").
+
+Every few steps it snapshots both fighters (FighterState.snapshot(), a flat tuple of slot values)
+and beam-searches sequences of held actions a few hundred milliseconds into the future, stepping
+the real fight rules on the fighters themselves and restoring them afterwards. The first action
+of the sequence with the best health differential is played until the next decision.
+
+The search stops early when it runs out of its node budget or its time budget, so a decision
+never costs much more than config.SEARCH_AI_BUDGET_MS. The node budget is measured once for
+the machine (calibrate()) and stored in replays, so replays don't depend on how fast the
+machine replaying them is.
+"""
+import time
+
+import config
+from fightingLogic import fightSimulation
+from fightingLogic.fightSimulation import update_fighter, resolve_hits, attack_connects
+
+# Scoring: damage dealt minus damage taken (taking damage counts a bit more), a bonus for hits
+# towards the mid/super thresholds, and a small pull towards striking range
+DAMAGE_TAKEN_WEIGHT = 1.2
+HIT_COUNT_WEIGHT = 0.5
+DISTANCE_WEIGHT = 0.01
+
+# Positions of the fields the score reads in a FighterState.snapshot() tuple
+_X = fightSimulation.FighterState.DYNAMIC_FIELDS.index("x")
+_HEALTH = fightSimulation.FighterState.DYNAMIC_FIELDS.index("health")
+_HIT_COUNT = fightSimulation.FighterState.DYNAMIC_FIELDS.index("attack_hit_count")
+
+def _available_actions(f):
+    """Actions f can hold for one search step (attacks start on its first step only)."""
+    if f.is_attacking:
+        return ("wait",) # Attacks can't be cancelled and moving is ignored until they end
+    actions = ["wait", "forward", "back", "basic_attack"]
+    if f.on_ground:
+        actions.append("jump")
+    if f.attack_hit_count >= f.stats.MID_ATTACK_THRESHOLD:
+        actions.append("mid")
+    if f.attack_hit_count >= f.stats.SUPER_ATTACK_THRESHOLD:
+        actions.append("super")
+    return actions
+
+def _hold_action(f, action, target_centerx, first_step):
+    """Plays one step of a held action on f. Returns the attack to start, if any."""
+    toward = 1 if target_centerx > f.centerx else -1
+    if action == "forward":
+        fightSimulation.move(f, toward)
+    elif action == "back":
+        fightSimulation.move(f, -toward)
+    elif not first_step:
+        return None
+    elif action == "wait":
+        fightSimulation.stop_move(f)
+    elif action == "jump":
+        fightSimulation.jump(f)
+    else:
+        fightSimulation.stop_move(f)
+        return action
+    return None
+
+class LookaheadAI:
+    """
+    Match controller (see fightSimulation.Match) that beam-searches held actions.
+
+    stats holds "searches", "nodes" (search tree nodes expanded, in total), "last_nodes",
+    "last_ms" and "cut_short" (searches stopped by the node or time budget).
+    """
+    def __init__(self, budget_ms=config.SEARCH_AI_BUDGET_MS, horizon_steps=config.SEARCH_AI_HORIZON_STEPS,
+                 action_steps=config.SEARCH_AI_ACTION_STEPS, beam_width=config.SEARCH_AI_BEAM_WIDTH,
+                 node_budget=None, connects=attack_connects):
+        """
+        Args:
+            budget_ms (float): Time one decision may take; None for no time limit (replays).
+            horizon_steps (int): How many steps ahead the search looks.
+            action_steps (int): Steps each action is held, also the steps between decisions.
+            beam_width (int): Action sequences kept at each depth.
+            node_budget (int): Most nodes per decision; None to calibrate() on the first one.
+            connects (callable): Hit check used while searching. The plain rect check is a lot
+                cheaper than the stage's pixel masks and close enough for planning.
+        """
+        self.budget_ms = budget_ms
+        self.action_steps = max(1, action_steps)
+        self.depth = max(1, horizon_steps // self.action_steps)
+        self.beam_width = beam_width
+        self.node_budget = node_budget
+        self.connects = connects
+        self.action = "wait"
+        self._steps_left = 0
+        self.stats = {"searches": 0, "nodes": 0, "last_nodes": 0, "last_ms": 0.0, "cut_short": 0}
+
+    def __call__(self, match, index):
+        f = match.fighters[index]
+        target = match.fighters[1 - index]
+        first_step = self._steps_left <= 0
+        if first_step:
+            if self.node_budget is None:
+                self.calibrate(match, index)
+            self.action = self.search(match, index)
+            self._steps_left = self.action_steps
+        self._steps_left -= 1
+        return _hold_action(f, self.action, target.centerx, first_step)
+
+    # --- SEARCH ---
+
+    def _expand(self, match, index, state, action):
+        """
+        Restores the fighters to state, plays action for action_steps steps (the other fighter
+        keeps doing what it was doing) and returns the resulting state.
+        """
+        fighters = match.fighters
+        f, target = fighters[index], fighters[1 - index]
+        f.restore(state[index])
+        target.restore(state[1 - index])
+        first, second = fighters
+        rules, connects = match.rules, self.connects
+        for step in range(self.action_steps):
+            if step:
+                update_fighter(first)
+                update_fighter(second)
+            attack = _hold_action(f, action, target.centerx, step == 0)
+            if attack:
+                fightSimulation.attack(f, attack.replace("_attack", ""))
+            resolve_hits(first, second, rules, connects)
+        update_fighter(first) # The next action starts after the next physics update
+        update_fighter(second)
+        return (first.snapshot(), second.snapshot())
+
+    def _score(self, match, index, root, state):
+        me, other = state[index], state[1 - index]
+        dealt = root[1 - index][_HEALTH] - other[_HEALTH]
+        taken = root[index][_HEALTH] - me[_HEALTH]
+        distance = abs(other[_X] - me[_X])
+        return (dealt - DAMAGE_TAKEN_WEIGHT * taken
+                + HIT_COUNT_WEIGHT * (me[_HIT_COUNT] - root[index][_HIT_COUNT])
+                - DISTANCE_WEIGHT * abs(distance - match.fighters[index].stats.ai_stop_threshold))
+
+    def search(self, match, index):
+        """Returns the first action of the best action sequence found within the budgets."""
+        started = time.perf_counter()
+        deadline = None if self.budget_ms is None else started + self.budget_ms / 1000.0
+        fighters = match.fighters
+        root = (fighters[0].snapshot(), fighters[1].snapshot())
+        node_budget = self.node_budget or float("inf")
+        nodes = 0
+        cut_short = False
+
+        # Beam entries: (score, first action, state)
+        beam = [(0.0, None, root)]
+        best = (float("-inf"), "wait")
+        for _ in range(self.depth):
+            children = []
+            for _, first_action, state in beam:
+                fighters[index].restore(state[index])
+                for action in _available_actions(fighters[index]):
+                    if nodes >= node_budget or (deadline is not None and time.perf_counter() >= deadline):
+                        cut_short = True
+                        break
+                    child = self._expand(match, index, state, action)
+                    nodes += 1
+                    children.append((self._score(match, index, root, child), first_action or action, child))
+                if cut_short:
+                    break
+            if children:
+                children.sort(key=lambda child: child[0], reverse=True)
+                beam = children[:self.beam_width]
+                if not cut_short or beam[0][0] > best[0]:
+                    best = (beam[0][0], beam[0][1])
+            if cut_short:
+                break
+
+        fighters[0].restore(root[0])
+        fighters[1].restore(root[1])
+        stats = self.stats
+        stats["searches"] += 1
+        stats["nodes"] += nodes
+        stats["last_nodes"] = nodes
+        stats["last_ms"] = (time.perf_counter() - started) * 1000.0
+        stats["cut_short"] += cut_short
+        return best[1]
+
+    def calibrate(self, match, index, samples=50):
+        """Sets node_budget to the nodes that fit in budget_ms on this machine."""
+        if self.budget_ms is None:
+            return
+        fighters = match.fighters
+        root = (fighters[0].snapshot(), fighters[1].snapshot())
+        started = time.perf_counter()
+        for _ in range(samples):
+            self._expand(match, index, root, "forward")
+        per_node_ms = (time.perf_counter() - started) * 1000.0 / samples
+        fighters[0].restore(root[0])
+        fighters[1].restore(root[1])
+        # Scoring and bookkeeping cost a bit on top of the expansions
+        self.node_budget = max(1, int(self.budget_ms / per_node_ms * 0.8))
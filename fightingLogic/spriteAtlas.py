@@ -0,0 +1,88 @@
+# fightingLogic/spriteAtlas.py
+"""
+Runtime side of atlasPacker.py: fighter frames handed out as subsurfaces of one packed atlas.
+
+The index lists, per character, which atlas rectangles make up each animation (for both
+facings) and where each trimmed frame sits inside its full SPRITE_FRAME_SIZE cell. A character
+is only served from the atlas while its sprite sheet still matches the hash it was packed from
+and the frame layout hasn't changed; otherwise callers slice the sheet as before.
+"""
+import json
+import os
+
+import config
+import assetCache
+import bakedAssets
+
+INDEX_VERSION = 2
+
+_index = None # Loaded on first use; {} when there is no usable index
+
+def get_index():
+    global _index
+    if _index is None:
+        try:
+            with open(config.SPRITE_ATLAS_INDEX) as index_file:
+                _index = json.load(index_file)
+        except (OSError, ValueError):
+            _index = {}
+        if _index.get("version") != INDEX_VERSION:
+            _index = {}
+    return _index
+
+def reload_index():
+    """Forgets the loaded index (after atlasPacker.py has rewritten it)."""
+    global _index
+    _index = None
+
+def layout_signature(layout):
+    """The frame layout in the form it is stored in the index, for comparing the two."""
+    return {state: [list(cell) for cell in cells] for state, cells in layout.items()}
+
+def atlas_image_path():
+    return os.path.join(os.path.dirname(config.SPRITE_ATLAS_INDEX), get_index()["image"])
+
+def atlas_key():
+    """Asset cache key of the atlas image."""
+    return assetCache.asset_cache.make_key(atlas_image_path(), pixel_format=assetCache.FORMAT_ALPHA)
+
+def has_character(character_name, sheet_path, layout):
+    """True if the atlas holds up to date frames for character_name."""
+    index = get_index()
+    entry = index.get("characters", {}).get(character_name)
+    if not entry or entry["source"] != sheet_path or index["layout"] != layout_signature(layout):
+        return False
+    try:
+        return bakedAssets.baked_assets.source_hash(sheet_path) == entry["source_hash"]
+    except OSError:
+        return False
+
+def load_character(character_name, sheet_path, layout):
+    """
+    Returns (animations, offsets, flipped_animations, flipped_offsets) dicts keyed by state plus
+    the sheet's background color for hit masks (None if the sheet has transparency), or None if
+    the atlas doesn't have up to date frames for this character.
+    """
+    if not has_character(character_name, sheet_path, layout):
+        return None
+    try:
+        atlas = assetCache.load_image(atlas_image_path(), pixel_format=assetCache.FORMAT_ALPHA)
+    except Exception as e: # Same fallback as Spritesheet: any failure means slicing the sheet instead
+        print(f"Sprite atlas unusable ({e}), slicing {sheet_path} instead")
+        return None
+
+    index = get_index()
+    frames = {} # frame id -> subsurface, so frames shared between states stay one object
+    def frame(frame_id):
+        if frame_id not in frames:
+            frames[frame_id] = atlas.subsurface(index["frames"][frame_id]["rect"])
+        return frames[frame_id]
+
+    entry = index["characters"][character_name]
+    result = []
+    for facing in ("right", "left"):
+        states = entry[facing]
+        result.append({state: [frame(i) for i in ids] for state, ids in states.items()})
+        result.append({state: [tuple(index["frames"][i]["offset"]) for i in ids] for state, ids in states.items()})
+    result.append(tuple(entry["mask_key"]) if entry["mask_key"] else None)
+    return tuple(result)
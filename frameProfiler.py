@@ -0,0 +1,145 @@
+# frameProfiler.py
+import math
+import time
+from array import array
+
+import pygame
+import config
+import textCache
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile (fraction 0.95 for p95) of a sorted, non-empty list."""
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+class FrameProfiler:
+    """
+    Times each phase of a frame (events, update, AI, drawing, ...) into a ring buffer.
+
+    Call begin_frame() at the top of the loop, mark("phase") after each phase and end_frame()
+    after presenting. While disabled every call returns straight away, so the profiler can stay
+    in production builds. F3 (see handle_event) turns it on together with its overlay.
+    """
+    def __init__(self, capacity=config.PROFILER_HISTORY_FRAMES, enabled=config.PROFILER_ENABLED):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.show_overlay = enabled
+        self.csv_path = config.PROFILER_CSV_PATH
+
+        self.phase_names = []
+        self._phase_times = {} # phase -> array of per frame milliseconds (ring buffer)
+        self._frame_times = array("d", [0.0] * capacity)
+        self._current = {}
+        self.frames_recorded = 0
+        self._frame_start = 0.0
+        self._last_mark = 0.0
+
+        self._overlay_lines = []
+        self._overlay_refresh_at = 0
+
+    # --- RECORDING ---
+
+    def begin_frame(self):
+        if not self.enabled: return
+        self._frame_start = self._last_mark = time.perf_counter()
+        self._current.clear()
+
+    def mark(self, phase):
+        """Adds the time since the previous mark (or begin_frame) to phase."""
+        if not self.enabled: return
+        now = time.perf_counter()
+        self._current[phase] = self._current.get(phase, 0.0) + (now - self._last_mark) * 1000.0
+        self._last_mark = now
+
+    def end_frame(self):
+        if not self.enabled: return
+        slot = self.frames_recorded % self.capacity
+        self._frame_times[slot] = (time.perf_counter() - self._frame_start) * 1000.0
+        for phase in self.phase_names:
+            self._phase_times[phase][slot] = self._current.get(phase, 0.0)
+        for phase in self._current:
+            if phase not in self._phase_times:
+                # New phase: earlier frames spent no time in it
+                self.phase_names.append(phase)
+                self._phase_times[phase] = array("d", [0.0] * self.capacity)
+                self._phase_times[phase][slot] = self._current[phase]
+        self.frames_recorded += 1
+
+    # --- CONTROLS ---
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.show_overlay = enabled
+
+    def handle_event(self, event):
+        """F3 toggles profiling and the overlay. Returns True if the event was used."""
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.set_enabled(not self.enabled)
+            return True
+        return False
+
+    # --- REPORTING ---
+
+    def _recent(self, samples):
+        count = min(self.frames_recorded, self.capacity)
+        if self.frames_recorded <= self.capacity:
+            return list(samples[:count])
+        start = self.frames_recorded % self.capacity
+        return list(samples[start:]) + list(samples[:start])
+
+    @staticmethod
+    def _summary(values):
+        if not values:
+            return {"mean": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        ordered = sorted(values)
+        return {
+            "mean": sum(ordered) / len(ordered),
+            "p95": percentile(ordered, 0.95),
+            "p99": percentile(ordered, 0.99),
+            "max": ordered[-1],
+        }
+
+    def get_stats(self):
+        """Rolling mean/p95/p99/max in milliseconds for the whole frame and every phase."""
+        stats = {"frame": self._summary(self._recent(self._frame_times))}
+        for phase in self.phase_names:
+            stats[phase] = self._summary(self._recent(self._phase_times[phase]))
+        return stats
+
+    def refresh_overlay(self, extra_lines=()):
+        """Rebuilds the overlay text twice a second. Returns a number that changes when it did."""
+        now = pygame.time.get_ticks()
+        if now >= self._overlay_refresh_at:
+            self._overlay_refresh_at = now + 500
+            lines = ["phase        mean    p95    p99    max (ms)"]
+            for name, s in self.get_stats().items():
+                lines.append(f"{name[:11]:<11} {s['mean']:6.2f} {s['p95']:6.2f} {s['p99']:6.2f} {s['max']:6.2f}")
+            lines.extend(extra_lines)
+            self._overlay_lines = lines
+        return self._overlay_refresh_at
+
+    def draw_overlay(self, screen, topleft=(5, 5)):
+        """Draws the rolling stats (as of the last refresh_overlay) and returns the area covered."""
+        font = textCache.get_font(None, 20)
+        line_height = font.get_linesize()
+        panel = pygame.Rect(topleft[0], topleft[1], 330, line_height * len(self._overlay_lines) + 10)
+        pygame.draw.rect(screen, config.BLACK, panel)
+        for i, line in enumerate(self._overlay_lines):
+            # Rendered directly: the numbers change every refresh, so caching them would only churn textCache
+            screen.blit(font.render(line, True, config.YELLOW), (panel.x + 5, panel.y + 5 + i * line_height))
+        return panel
+
+    def dump_csv(self, path=None):
+        """Writes one row per recorded frame (oldest first). Does nothing if there is no path or no data."""
+        path = path or self.csv_path
+        if not path or not self.frames_recorded:
+            return None
+        frames = self._recent(self._frame_times)
+        columns = [self._recent(self._phase_times[phase]) for phase in self.phase_names]
+        with open(path, "w") as csv_file:
+            csv_file.write(",".join(["frame_ms"] + self.phase_names) + "\n")
+            for i, frame_ms in enumerate(frames):
+                csv_file.write(",".join(f"{value:.4f}" for value in [frame_ms] + [column[i] for column in columns]) + "\n")
+        return path
+
+# Shared profiler used by main.py and the fight stages
+profiler = FrameProfiler()
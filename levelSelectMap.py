@@ -1,74 +1,76 @@
 # levelSelectMap.py
 import pygame
 import config
-
-# Importing stages for level selection
-import stages.stage1
-import stages.stage2
-import stages.stage3
-import stages.bounusStage
-import stages.BoatRideTutorial
+import textCache
+import assetCache
+import assetPreloader
+import stages
+from renderTarget import render_target
+
+MAP_IMAGE_PATH = "assests/AA_Map.png"
+MAP_SOURCE_SIZE = (1200, 1800) # AA_Map.png's own size; the levels' map_rects are in its pixels
+
+def map_display_size():
+    """Size the map is shown at: MAP_SOURCE_SIZE fitted into 90% of the screen, keeping its aspect ratio."""
+    width = config.SCREEN_WIDTH * 0.9
+    height = config.SCREEN_HEIGHT * 0.9
+    aspect_ratio = MAP_SOURCE_SIZE[0] / MAP_SOURCE_SIZE[1]
+    if width / aspect_ratio > height:
+        width = height * aspect_ratio
+    else:
+        height = width / aspect_ratio
+    return int(width), int(height)
 
 class LevelSelectMap:
     def __init__(self):
         """
         Initializes the level selection map with available levels and their clickable areas on the map.
         """
+        # The map is loaded already scaled to the size it is shown at (assetBake.py bakes it that size)
+        self.map_display_width, self.map_display_height = map_display_size()
         self.map_image = None
         self._load_map_image() # Initial load of map image
 
         # These coordinates are relative to the top-left of the AA_Map.png image.
+        # "stage" is an id in stages.STAGE_REGISTRY; the stage itself is only imported when played.
         self.levels_data = {
             "BoatRideTutorial": {
                 "level_num": 0,
                 "map_rect": pygame.Rect(290, 805, 80, 80), #has been placed correctly
                 "tooltip": "Boat Ride Tutorial",
-                "module": stages.BoatRideTutorial, 
+                "stage": "boat_ride_tutorial",
                 "button_color": config.GREEN 
             },
             "KangarooBoogaloo": {
                 "level_num": 1,
                 "map_rect": pygame.Rect(100, 1310, 50, 80), #has been placed correctly
                 "tooltip": "Kangaroo Boogaloo",
-                "module": stages.stage1,
+                "stage": "stage1",
                 "button_color": config.GREEN
             },
             "BirdsOfAFeather": {
                 "level_num": 2,
                 "map_rect": pygame.Rect(350, 1100, 80, 80), #has been placed correctly
                 "tooltip": "Birds of a Feather",
-                "module": stages.stage2,
+                "stage": "stage2",
                 "button_color": config.GREEN
             },
             "DingoAteMyNameTag": {
                 "level_num": 3,
                 "map_rect": pygame.Rect(650, 1000, 90, 80), #has been placed correctly
                 "tooltip": "Dingo Ate My Name Tag",
-                "module": stages.stage3,
+                "stage": "stage3",
                 "button_color": config.GREEN
             },
             "BonusStage": {
                 "level_num": 4,
                 "map_rect": pygame.Rect(600, 500, 80, 80),
                 "tooltip": "The Sting",
-                "module": stages.bounusStage,
+                "stage": "bonus_stage", # Horde survival mode
                 "button_color": config.GREEN
             },
         }
 
-        self.map_display_width = config.SCREEN_WIDTH * 0.9
-        self.map_display_height = config.SCREEN_HEIGHT * 0.9
-
-        # Ensure self.map_image is loaded before scaling calculations
-        if self.map_image:
-            original_width, original_height = self.map_image.get_size()
-            aspect_ratio = original_width / original_height
-
-            if self.map_display_width / aspect_ratio > self.map_display_height:
-                self.map_display_width = int(self.map_display_height * aspect_ratio)
-            else:
-                self.map_display_height = int(self.map_display_width / aspect_ratio)
-
         self.map_rect_on_screen = pygame.Rect(
             (config.SCREEN_WIDTH - self.map_display_width) // 2,
             (config.SCREEN_HEIGHT - self.map_display_height) // 2,
@@ -84,8 +86,8 @@ class LevelSelectMap:
         # --- End of important additions ---
 
         self.hovered_level_name = None
-        self.tooltip_font = pygame.font.Font(None, 30)
-        self.button_font = pygame.font.Font(None, 24)
+        self.tooltip_font = textCache.get_font(None, 30)
+        self.button_font = textCache.get_font(None, 24)
 
         # --- MENU BUTTON ADDITIONS ---
         self.menu_button_rect = pygame.Rect(config.SCREEN_WIDTH - 60, 20, 40, 30)
@@ -97,177 +99,41 @@ class LevelSelectMap:
             "Character Select": None
         }
         self.menu_rect = None
-        self.option_font = pygame.font.Font(None, 30)
+        self.option_font = textCache.get_font(None, 30)
         self._calculate_menu_rects()
         # --- END MENU BUTTON ADDITIONS ---
 
-    def _load_map_image(self):
-        # Your existing _load_map_image function
-        try:
-            self.map_image = pygame.image.load("assests/AA_Map.png").convert_alpha()
-        except pygame.error as e:
-            print(f"Error loading map image (assests/AA_Map.png): {e}")
-            self.map_image = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-            self.map_image.fill(config.RED)
-            print("Using a red placeholder for the map image.")
-
-    def _scale_level_rects(self):
-        # Your existing _scale_level_rects function
-        if not self.map_image:
-            return
-
-        original_map_width, original_map_height = self.map_image.get_size()
-
-        scale_x = self.map_display_width / original_map_width
-        scale_y = self.map_display_height / original_map_height
-
-        for level_name, data in self.levels_data.items():
-            original_rect = data["map_rect"]
-
-            scaled_x = int(original_rect.x * scale_x) + self.map_rect_on_screen.x
-            scaled_y = int(original_rect.y * scale_y) + self.map_rect_on_screen.y
-            scaled_width = int(original_rect.width * scale_x)
-            scaled_height = int(original_rect.height * scale_y)
-
-            data["scaled_rect"] = pygame.Rect(scaled_x, scaled_y, scaled_width, scaled_height)
-
-    def _create_level_buttons(self):
-        """
-        Populates self.level_buttons with (level_name, scaled_rect) tuples.
-        This allows handle_click and draw to easily iterate over clickable level areas.
-        """
-        self.level_buttons = [] # Clear the list just in case (e.g., if called again)
-        for level_name, data in self.levels_data.items():
-            if "scaled_rect" in data: # Ensure scaled_rect exists before adding
-                self.level_buttons.append((level_name, data["scaled_rect"]))
-            else:
-                print(f"Warning: Level '{level_name}' has no 'scaled_rect'. Run _scale_level_rects first.")
-
-    def _calculate_menu_rects(self):
-        # Your existing _calculate_menu_rects function
-        menu_width = 200
-        menu_height = len(self.menu_options) * 40 + 20
-        menu_x = config.SCREEN_WIDTH - menu_width - 20
-        menu_y = self.menu_button_rect.bottom + 10
-        self.menu_rect = pygame.Rect(menu_x, menu_y, menu_width, menu_height)
-
-        y_offset = menu_y + 10
-        for option_name in self.menu_options:
-            text_surface = self.option_font.render(option_name, True, config.WHITE)
-            option_rect = text_surface.get_rect(center=(self.menu_rect.centerx, y_offset + text_surface.get_height() // 2))
-            option_rect.x = menu_x + 10
-            self.menu_options[option_name] = option_rect
-            y_offset += 40
-
-    def handle_click(self, mouse_pos):
-        # Your existing handle_click function
-        if self.menu_button_rect.collidepoint(mouse_pos):
-            self.menu_open = not self.menu_open
-            return None
-
-        if self.menu_open:
-            for option_name, option_rect in self.menu_options.items():
-                if option_rect.collidepoint(mouse_pos):
-                    self.menu_open = False
-                    if option_name == "Character Select":
-                        return "character_select"
-                    elif option_name == "Options":
-                        print("Options button clicked (future functionality)")
-                    elif option_name == "Settings":
-                        print("Settings button clicked (future functionality)")
-            return None
-
-        for level_name, button_rect in self.level_buttons: # This now correctly iterates over self.level_buttons
-            if button_rect.collidepoint(mouse_pos):
-                return level_name
-        return None
-
-    def get_level_info(self, level_name):
-        # Your existing get_level_info function
-        return self.levels_data.get(level_name)
-
-    def update(self, mouse_pos):
-        # Your existing update function
-        self.hovered_level_name = None
-        for level_name, data in self.levels_data.items():
-            if data["scaled_rect"].collidepoint(mouse_pos):
-                self.hovered_level_name = level_name
-                break
-
-    def draw(self, screen):
-        # Your existing draw function
-        screen.fill(config.BLACK)
-
-        if self.map_image:
-            scaled_map = pygame.transform.scale(self.map_image, (self.map_display_width, self.map_display_height))
-            screen.blit(scaled_map, self.map_rect_on_screen.topleft)
-
-        title_font = pygame.font.Font(None, config.FONT_SIZE_MAIN_TITLE - 20)
-        title_surface = title_font.render("Select Your Adventure", True, config.WHITE)
-        title_rect = title_surface.get_rect(center=(config.SCREEN_WIDTH // 2, 40))
-        screen.blit(title_surface, title_rect)
-
-        for level_name, data in self.levels_data.items():
-            button_rect = data["scaled_rect"]
-            button_color = data["button_color"]
-
-            if level_name == "BoatRideTutorial":
-                continue
-
-            if level_name == self.hovered_level_name:
-                pygame.draw.rect(screen, config.WHITE, button_rect.inflate(10, 10), border_radius=5)
-                pygame.draw.rect(screen, button_color, button_rect, border_radius=5)
-            else:
-                pygame.draw.rect(screen, button_color, button_rect, border_radius=5)
-
-            level_text_surface = self.button_font.render(str(data["level_num"]), True, config.WHITE if level_name == self.hovered_level_name else config.BLACK)
-            level_text_rect = level_text_surface.get_rect(center=button_rect.center)
-            screen.blit(level_text_surface, level_text_rect)
-
-        if self.hovered_level_name:
-            tooltip_text = self.levels_data[self.hovered_level_name]["tooltip"]
-            tooltip_surface = self.tooltip_font.render(tooltip_text, True, config.BLACK)
-
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            tooltip_rect = tooltip_surface.get_rect(midbottom=(mouse_x, mouse_y - 5))
-
-            pygame.draw.rect(screen, config.WHITE, tooltip_rect.inflate(10, 5), border_radius=5)
-            screen.blit(tooltip_surface, tooltip_rect)
-        
-        pygame.draw.rect(screen, config.BROWN, self.menu_button_rect, border_radius=5)
-        line_thickness = 3
-        line_padding = 8
-        for i in range(3):
-            y_pos = self.menu_button_rect.y + line_padding + i * (line_thickness + line_padding)
-            pygame.draw.line(screen, config.WHITE,
-                             (self.menu_button_rect.x + line_padding, y_pos),
-                             (self.menu_button_rect.right - line_padding, y_pos),
-                             line_thickness)
-        
-        if self.menu_open:
-            pygame.draw.rect(screen, config.DARK_GREY, self.menu_rect, border_radius=5)
-            pygame.draw.rect(screen, config.WHITE, self.menu_rect, 2, border_radius=5)
+        # --- CACHED STATIC LAYER (map + title) ---
+        self.title_font = textCache.get_font(None, config.FONT_SIZE_MAIN_TITLE - 20)
+        self.static_layer = None
+        self._static_layer_size = None
+        self._static_layer_map = None
 
-            for option_name, option_rect in self.menu_options.items():
-                text_surface = self.option_font.render(option_name, True, config.WHITE)
-                screen.blit(text_surface, text_surface.get_rect(center=option_rect.center))
+        # --- STAGE PRELOADING ---
+        # menuScenes.LevelSelectScene sets player_character so the right sprite sheet is preloaded
+        self.player_character = None
+        self.preloader = assetPreloader.preloader
+        self._last_hover_ticks = pygame.time.get_ticks()
+        self._preload_hovered = None
+        self._idle_preload_done = False
 
     def _load_map_image(self):
         """Loads the main map image for level selection."""
         try:
-            self.map_image = pygame.image.load("assests/AA_Map.png").convert_alpha()
+            self.map_image = assetCache.load_image(MAP_IMAGE_PATH, (self.map_display_width, self.map_display_height),
+                                                   pixel_format=assetCache.FORMAT_ALPHA)
         except pygame.error as e:
-            print(f"Error loading map image (assests/AA_Map.png): {e}")
-            self.map_image = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+            print(f"Error loading map image ({MAP_IMAGE_PATH}): {e}")
+            self.map_image = pygame.Surface((self.map_display_width, self.map_display_height))
             self.map_image.fill(config.RED)
             print("Using a red placeholder for the map image.")
 
     def _scale_level_rects(self):
-        """Scales the defined map_rects to their positions on the actual displayed map."""
+        """Scales the defined map_rects to their positions on the actual displayed map (logical screen coordinates, see renderTarget.py)."""
         if not self.map_image:
             return
 
-        original_map_width, original_map_height = self.map_image.get_size()
+        original_map_width, original_map_height = MAP_SOURCE_SIZE
 
         scale_x = self.map_display_width / original_map_width
         scale_y = self.map_display_height / original_map_height
@@ -326,7 +192,7 @@ class LevelSelectMap:
                     self.menu_open = False # Close menu after selection
                     if option_name == "Character Select":
                         print("DEBUG: Returning to character select screen.")
-                        return "character_select" # Signal back to main.py
+                        return "character_select" # Signal back to menuScenes.LevelSelectScene
                     elif option_name == "Options":
                         print("Options button clicked (future functionality)")
                     elif option_name == "Settings":
@@ -353,25 +219,95 @@ class LevelSelectMap:
             if data["scaled_rect"].collidepoint(mouse_pos):
                 self.hovered_level_name = level_name
                 break
-        
+        self._update_preloading()
+
         # If menu is open, no need to update level hovers, but this is fine.
         # You might want to update menu item hovers here if you add them later.
 
-    def draw(self, screen):
+    def redraw_key(self, mouse_pos):
+        """Everything draw() depends on that changes; the screen only needs drawing when this does."""
+        # The tooltip follows the mouse, so the position only matters while a level is hovered
+        return (self.hovered_level_name, self.menu_open, self.map_image,
+                tuple(mouse_pos) if self.hovered_level_name else None)
+
+    def wake_in_ms(self):
+        """How soon update() has work to do without any input (None: not until something happens)."""
+        if self.preloader.busy():
+            return 0 # Finished images are waiting to be pumped into the cache
+        if not self._idle_preload_done:
+            return max(0, config.PRELOAD_IDLE_MS - (pygame.time.get_ticks() - self._last_hover_ticks))
+        return None
+
+    # --- STAGE PRELOADING ---
+
+    def _level_stage_spec(self, level_name):
+        stage_id = self.levels_data[level_name]["stage"]
+        return stages.get_stage_spec(stage_id) if stage_id else None
+
+    def _level_asset_keys(self, level_name):
+        spec = self._level_stage_spec(level_name)
+        return spec.asset_keys(self.player_character) if spec else []
+
+    def _update_preloading(self):
+        """Starts decoding the hovered level's images, or likely next levels' when the map is idle."""
+        now = pygame.time.get_ticks()
+        hovered = self.hovered_level_name
+        if hovered:
+            self._last_hover_ticks = now
+            if hovered != self._preload_hovered:
+                keys = self._level_asset_keys(hovered)
+                self.preloader.cancel(keep=keys)
+                self.preloader.request(keys)
+                self._idle_preload_done = False
+        elif not self._idle_preload_done and now - self._last_hover_ticks >= config.PRELOAD_IDLE_MS:
+            # Levels nearest (by number) to the last one hovered are the likeliest next picks
+            last_num = self.levels_data[self._preload_hovered]["level_num"] if self._preload_hovered else 0
+            by_distance = sorted(self.levels_data, key=lambda name: abs(self.levels_data[name]["level_num"] - last_num))
+            for level_name in by_distance:
+                self.preloader.request(self._level_asset_keys(level_name), speculative=True)
+            self._idle_preload_done = True
+        self._preload_hovered = hovered or self._preload_hovered
+
+        self.preloader.pump()
+        if hovered:
+            spec = self._level_stage_spec(hovered)
+            if spec and self.preloader.is_ready(spec.asset_keys(self.player_character)):
+                spec.warm_frame_banks(self.player_character)
+
+    def invalidate_static_layer(self):
+        """Forces the static layer to be rebuilt on the next draw (e.g. after swapping map_image)."""
+        self.static_layer = None
+
+    def _build_static_layer(self, display_size):
         """
-        Draws the level selection map screen.
-        :param screen: The Pygame screen surface to draw on.
+        Pre-composes everything on the map screen that does not change from frame to frame.
+        :param display_size: Size of the surface the map will be drawn on.
         """
-        screen.fill(config.BLACK) # Fill background with black
+        layer = pygame.Surface(display_size).convert()
+        layer.fill(config.BLACK) # Fill background with black
 
         if self.map_image:
-            scaled_map = pygame.transform.scale(self.map_image, (self.map_display_width, self.map_display_height))
-            screen.blit(scaled_map, self.map_rect_on_screen.topleft)
+            layer.blit(self.map_image, self.map_rect_on_screen.topleft) # Already loaded at its display size
 
-        title_font = pygame.font.Font(None, config.FONT_SIZE_MAIN_TITLE - 20)
-        title_surface = title_font.render("Select Your Adventure", True, config.WHITE)
+        title_surface = self.title_font.render("Select Your Adventure", True, config.WHITE)
         title_rect = title_surface.get_rect(center=(config.SCREEN_WIDTH // 2, 40))
-        screen.blit(title_surface, title_rect)
+        layer.blit(title_surface, title_rect)
+
+        self.static_layer = layer
+        self._static_layer_size = display_size
+        self._static_layer_map = self.map_image
+
+    def draw(self, screen):
+        """
+        Draws the level selection map screen.
+        :param screen: The Pygame screen surface to draw on.
+        """
+        # Rebuild the static layer only when the display size or map image changed
+        display_size = screen.get_size()
+        if (self.static_layer is None or self._static_layer_size != display_size
+                or self._static_layer_map is not self.map_image):
+            self._build_static_layer(display_size)
+        screen.blit(self.static_layer, (0, 0))
 
         # Draw the buttons for each level
         for level_name, data in self.levels_data.items():
@@ -391,22 +327,23 @@ class LevelSelectMap:
                 pygame.draw.rect(screen, button_color, button_rect, border_radius=5)
 
             # Draw level number or name on the button
-            level_text_surface = self.button_font.render(str(data["level_num"]), True, config.WHITE if level_name == self.hovered_level_name else config.BLACK)
+            level_text_surface = textCache.render_text(self.button_font, str(data["level_num"]), config.WHITE if level_name == self.hovered_level_name else config.BLACK)
             level_text_rect = level_text_surface.get_rect(center=button_rect.center)
             screen.blit(level_text_surface, level_text_rect)
 
         # Draw tooltips if a level is hovered
         if self.hovered_level_name:
             tooltip_text = self.levels_data[self.hovered_level_name]["tooltip"]
-            tooltip_surface = self.tooltip_font.render(tooltip_text, True, config.BLACK)
+            tooltip_surface = textCache.render_text(self.tooltip_font, tooltip_text, config.BLACK)
 
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = render_target.mouse_pos()
             tooltip_rect = tooltip_surface.get_rect(midbottom=(mouse_x, mouse_y - 5))
 
             pygame.draw.rect(screen, config.WHITE, tooltip_rect.inflate(10, 5), border_radius=5)
             screen.blit(tooltip_surface, tooltip_rect)
-        
+
         # --- DRAW MENU BUTTON (Tree Brown Lines) ---
+        # Drawn every frame rather than in the static layer so it stays on top of the tooltip
         pygame.draw.rect(screen, config.BROWN, self.menu_button_rect, border_radius=5)
         line_thickness = 3
         line_padding = 8
@@ -416,14 +353,14 @@ class LevelSelectMap:
                              (self.menu_button_rect.x + line_padding, y_pos),
                              (self.menu_button_rect.right - line_padding, y_pos),
                              line_thickness)
-        
+
         # --- DRAW MENU (if open) ---
         if self.menu_open:
             pygame.draw.rect(screen, config.GREY, self.menu_rect, border_radius=5)
             pygame.draw.rect(screen, config.WHITE, self.menu_rect, 2, border_radius=5) # Outline
 
             for option_name, option_rect in self.menu_options.items():
-                text_surface = self.option_font.render(option_name, True, config.WHITE)
+                text_surface = textCache.render_text(self.option_font, option_name, config.WHITE)
                 screen.blit(text_surface, text_surface.get_rect(center=option_rect.center))
 
 
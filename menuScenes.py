@@ -0,0 +1,139 @@
+# menuScenes.py
+"""
+The menu screens as scenes (see sceneManager.py): main menu -> character select -> level select,
+which launches the stages. Drawing itself stays in screens.py and levelSelectMap.py.
+"""
+import pygame
+import config
+import screens
+import stages
+import levelSelectMap
+import startupTimeline
+from sceneManager import Scene
+from renderTarget import render_target
+
+CHARACTERS = ("The Boat Man", "The Log Lady") # Left and right on the character select screen
+
+class MainMenuScene(Scene):
+    redraw_on_demand = True
+
+    def __init__(self, screen):
+        self.screen = screen
+
+    def handle_event(self, event):
+        if event.type != pygame.MOUSEBUTTONDOWN:
+            return
+        if screens.story_button_rect.collidepoint(event.pos):
+            self.manager.push(CharacterSelectScene(self.screen))
+        elif screens.levels_button_rect.collidepoint(event.pos):
+            self.manager.push(LevelSelectScene(self.screen, None))
+
+    def resume(self, result=None):
+        if result: # Story mode: a character was picked, on to the levels
+            self.manager.push(LevelSelectScene(self.screen, result))
+
+    def draw(self, screen):
+        screen.fill(config.BLACK)
+        screens.draw_main_menu(screen)
+
+class CharacterSelectScene(Scene):
+    """Pops with the picked character's name."""
+    redraw_on_demand = True
+
+    def __init__(self, screen, selected_character=None):
+        self.screen = screen
+        self.selected_character = selected_character
+
+    def enter(self):
+        screens.load_character_select_assets()
+
+    def handle_event(self, event):
+        if event.type != pygame.MOUSEBUTTONDOWN:
+            return
+        if screens.male_character_rect.collidepoint(event.pos):
+            self.manager.pop(CHARACTERS[0])
+        elif screens.female_character_rect.collidepoint(event.pos):
+            self.manager.pop(CHARACTERS[1])
+
+    def redraw_key(self):
+        return self.selected_character
+
+    def draw(self, screen):
+        screen.fill(config.BLACK)
+        screens.draw_character_select_screen(screen, self.selected_character)
+
+class LevelSelectScene(Scene):
+    """
+    The map. Clicking a level prepares its stage in the background (the map stays up and
+    responsive meanwhile) and pushes it; fights come back here when they end.
+    """
+    redraw_on_demand = True
+
+    def __init__(self, screen, selected_character):
+        self.screen = screen
+        self.selected_character = selected_character
+        self.map = None
+
+    def enter(self):
+        # Decoding the map is slow, so it is only built the first time the screen is opened
+        with startupTimeline.measure("LevelSelectMap()"):
+            self.map = levelSelectMap.LevelSelectMap()
+        self.map.player_character = self.selected_character # Picks which sprite sheet to preload
+
+    def exit(self):
+        self.map.preloader.cancel()
+        self.map = None
+
+    def suspend(self):
+        # Nothing on the map is needed during a fight; don't let speculative decoding compete with it
+        self.map.preloader.cancel()
+
+    def resume(self, result=None):
+        if result in CHARACTERS: # Back from character select (fights pop with "level_select")
+            self.selected_character = result
+            self.map.player_character = result
+
+    def handle_event(self, event):
+        if event.type != pygame.MOUSEBUTTONDOWN:
+            return
+        action_result = self.map.handle_click(event.pos)
+        if action_result == "character_select":
+            self.manager.push(CharacterSelectScene(self.screen, self.selected_character))
+        elif action_result:
+            self._launch_level(action_result)
+
+    def _launch_level(self, level_name):
+        stage_id = self.map.get_level_info(level_name).get("stage")
+        if not stage_id:
+            return
+        character = self.selected_character
+        try:
+            # The registry imports the stage module the first time it is played; its images were
+            # most likely preloaded while the level was hovered
+            spec = stages.get_stage_spec(stage_id)
+        except Exception as e:
+            print(f"Error launching stage: {e}")
+            return
+
+        def build_stage():
+            try:
+                return stages.get_stage_class(stage_id)(self.screen, character)
+            except Exception as e:
+                print(f"Error launching stage: {e}")
+                return None
+
+        self.manager.push_when_ready(build_stage, spec.asset_keys(character),
+                                     warm=lambda: spec.warm_frame_banks(character))
+
+    def update(self):
+        self.map.update(render_target.mouse_pos())
+
+    def wake_in_ms(self):
+        return self.map.wake_in_ms()
+
+    def redraw_key(self):
+        return self.map.redraw_key(render_target.mouse_pos())
+
+    def draw(self, screen):
+        # The map paints the whole screen from its cached layer, so there is no clear here
+        self.map.draw(screen)
@@ -0,0 +1,146 @@
+# netplayMatch.py
+"""
+Two-player fights over UDP with rollback netcode (see fightingLogic.netplay).
+
+One side hosts (left fighter, picks the stage), the other joins (right fighter). The latency,
+jitter and loss options add an artificial bad connection on this side's outgoing packets, for
+trying it out on one machine.
+
+Examples:
+    python netplayMatch.py --host                                # waits on config.NETPLAY_PORT
+    python netplayMatch.py --join 127.0.0.1 --latency 60 --jitter 15 --loss 0.05
+
+    # Headless check with two processes: bots play 1200 steps, then both sides print the state
+    # they ended in, which has to be identical
+    python netplayMatch.py --host --headless --steps 1200 &
+    python netplayMatch.py --join 127.0.0.1 --headless --steps 1200 --latency 80 --jitter 20 --loss 0.1
+"""
+import argparse
+import copy
+import hashlib
+import random
+import sys
+import time
+
+import config
+from fightingLogic import fightSimulation, netplay
+
+HOST_CHARACTER = "The Boat Man"
+CLIENT_CHARACTER = "The Log Lady"
+
+# Bot input: chance per step of each press (releases follow a held key after a while)
+BOT_CHANCES = ((fightSimulation.INPUT_PUNCH, 0.04), (fightSimulation.INPUT_JUMP, 0.01))
+BOT_WALK_CHANCE = 0.03
+BOT_WALK_FORWARD = 0.7 # Walks mostly toward the other fighter so the two actually meet
+
+def parse_address(text):
+    host, _, port = text.partition(":")
+    return host, int(port or config.NETPLAY_PORT)
+
+def bot_inputs(seed, local_index):
+    """Endless random input bits, walking back and forth and swinging now and then."""
+    rng = random.Random(seed)
+    forward, back = fightSimulation.INPUT_RIGHT_DOWN, fightSimulation.INPUT_LEFT_DOWN
+    if local_index == 1:
+        forward, back = back, forward
+    held = 0
+    while True:
+        bits = 0
+        if held and rng.random() < BOT_WALK_CHANCE * 2:
+            bits |= fightSimulation.INPUT_LEFT_UP if held == fightSimulation.INPUT_LEFT_DOWN else fightSimulation.INPUT_RIGHT_UP
+            held = 0
+        elif not held and rng.random() < BOT_WALK_CHANCE:
+            held = forward if rng.random() < BOT_WALK_FORWARD else back
+            bits |= held
+        for bit, chance in BOT_CHANCES:
+            if rng.random() < chance:
+                bits |= bit
+        yield bits
+
+def run_headless(session, steps, seed):
+    """Plays steps steps in real time with bot input, then waits until both sides agree on every input."""
+    step_seconds = 1.0 / config.SIMULATION_HZ
+    inputs = bot_inputs(seed, session.local_index)
+    next_step = time.perf_counter()
+    started = next_step
+    while session.frame < steps:
+        session.advance(next(inputs)) # Input from stalled steps is held by the session
+        next_step += step_seconds
+        time.sleep(max(0.0, next_step - time.perf_counter()))
+    elapsed = time.perf_counter() - started
+    synchronized = session.synchronize()
+
+    state = session.match.snapshot()
+    checksum = hashlib.sha1(repr(state).encode()).hexdigest()[:16]
+    stats = session.stats
+    print(f"steps {session.frame} in {elapsed:.1f}s, synchronized {synchronized}, state {checksum}")
+    print(f"health {[f.health for f in session.match.fighters]}, winner {session.match.winner}")
+    print(f"rollbacks {stats['rollbacks']} ({stats['resimulated']} steps resimulated, "
+          f"{stats['resimulated'] / elapsed:.1f}/s, deepest {stats['max_depth']}), "
+          f"predicted {stats['predicted']}, stalls {stats['stalls']}")
+    print(f"packets sent {session.link.stats['sent']}, received {session.link.stats['received']}, "
+          f"dropped by the shim {session.link.stats['dropped']}")
+    session.close()
+    return 0 if synchronized else 1
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play a two-player fight over the network.")
+    side = parser.add_mutually_exclusive_group(required=True)
+    side.add_argument("--host", nargs="?", type=int, const=config.NETPLAY_PORT, metavar="PORT", help="Wait for the other player on PORT")
+    side.add_argument("--join", metavar="HOST[:PORT]", help="Connect to a host")
+    parser.add_argument("--character", help=f"Your fighter (default {HOST_CHARACTER!r} hosting, {CLIENT_CHARACTER!r} joining)")
+    parser.add_argument("--stage", default="stage1", help="Stage id to fight on (host only)")
+    parser.add_argument("--latency", type=float, default=0, help="Extra one way latency in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="Random latency variation in ms (+/-)")
+    parser.add_argument("--loss", type=float, default=0, help="Fraction of outgoing packets to drop")
+    parser.add_argument("--headless", action="store_true", help="No window: a bot plays --steps steps, then the final state is printed")
+    parser.add_argument("--steps", type=int, default=1200, help="Steps a headless match lasts")
+    parser.add_argument("--seed", type=int, help="Seed for the shim and the bot")
+    args = parser.parse_args(argv)
+
+    local_index = 0 if args.host is not None else 1
+    if args.host is not None:
+        link = netplay.LossyLink(("", args.host), latency_ms=args.latency, jitter_ms=args.jitter, loss=args.loss, seed=args.seed)
+        print(f"Waiting for the other player on port {args.host}...")
+        start_info = {"stage": args.stage, "character": args.character or HOST_CHARACTER,
+                      "simulation_hz": config.SIMULATION_HZ, "pixel_perfect_hits": config.PIXEL_PERFECT_HITS,
+                      "input_buffer_steps": config.INPUT_BUFFER_STEPS, "input_motion_steps": config.INPUT_MOTION_STEPS}
+        client = netplay.host_handshake(link, start_info)
+        host_character, client_character = start_info["character"], client["character"]
+    else:
+        link = netplay.LossyLink(("", 0), parse_address(args.join), latency_ms=args.latency,
+                                 jitter_ms=args.jitter, loss=args.loss, seed=args.seed)
+        try:
+            start_info = netplay.client_handshake(link, {"character": args.character or CLIENT_CHARACTER})
+        except ConnectionError as e:
+            print(e)
+            return 1
+        # Both sides have to simulate under the same settings
+        config.SIMULATION_HZ = start_info["simulation_hz"]
+        config.PIXEL_PERFECT_HITS = start_info["pixel_perfect_hits"]
+        config.INPUT_BUFFER_STEPS = start_info["input_buffer_steps"]
+        config.INPUT_MOTION_STEPS = start_info["input_motion_steps"]
+        host_character, client_character = start_info["character"], start_info["client"]["character"]
+    print(f"{host_character} (host) vs {client_character}")
+    host_start_info = start_info if local_index == 0 else None
+
+    if args.headless:
+        match = fightSimulation.Match(controllers=(None, None))
+        session = netplay.RollbackSession(match, local_index, link, start_info=host_start_info)
+        return run_headless(session, args.steps, args.seed)
+
+    import pygame
+    import stages
+    from stages.netplayStage import NetplayStage
+    pygame.init()
+    screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    pygame.display.set_caption(f"Zoo-Jacked netplay ({'host' if local_index == 0 else 'client'})")
+    spec = copy.copy(stages.get_stage_spec(start_info["stage"]))
+    spec.countdown_seconds = config.NETPLAY_COUNTDOWN_SECONDS
+    game = NetplayStage(screen, spec, host_character, client_character, link, local_index, host_start_info)
+    game.run()
+    pygame.quit()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+# redrawScheduler.py
+import pygame
+import config
+
+# Events that mean the window contents were lost or resized, so the screen must be drawn again
+_EXPOSE_EVENTS = {pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED}
+
+class RedrawScheduler:
+    """
+    Draws menu screens (everything but the fights) only when something on them changed.
+
+    Each loop the caller describes what its screen currently shows as a key (screen name, hovered
+    button, open menu, selection...). get_events() sleeps in pygame.event.wait while the last
+    drawn frame is still up to date, so a menu nobody touches costs next to no CPU; needs_redraw()
+    says whether the key changed, and frame_drawn() caps the frame rate while it keeps changing.
+    """
+    def __init__(self, active_fps=config.MENU_FPS_CAP, max_sleep_ms=config.MENU_MAX_SLEEP_MS):
+        self.active_fps = active_fps
+        self.max_sleep_ms = max_sleep_ms
+        self.clock = pygame.time.Clock()
+        self._drawn_key = None
+        self._stale = True # Nothing drawn yet
+        self.stats = {"frames_drawn": 0, "frames_skipped": 0, "sleeps": 0}
+
+    def invalidate(self):
+        """Forces the next frame to be drawn (e.g. after a fight drew over the screen)."""
+        self._stale = True
+
+    def get_events(self, wake_in_ms=None):
+        """
+        Returns the waiting events. If the screen is up to date and there are none, first sleeps
+        until one arrives, wake_in_ms passes (for screens with work to do, like pumping
+        preloaded images) or max_sleep_ms passes, whichever comes first.
+        """
+        events = pygame.event.get()
+        if not events and not self._stale:
+            timeout = self.max_sleep_ms if wake_in_ms is None else min(wake_in_ms, self.max_sleep_ms)
+            # Never shorter than one active frame, so a screen that is busy but unchanged doesn't spin
+            timeout = max(int(timeout), 1000 // self.active_fps)
+            self.stats["sleeps"] += 1
+            event = pygame.event.wait(timeout)
+            if event.type != pygame.NOEVENT:
+                events = [event] + pygame.event.get()
+        for event in events:
+            if event.type in _EXPOSE_EVENTS:
+                self._stale = True
+        return events
+
+    def needs_redraw(self, key):
+        """True if the screen has to be drawn to show key."""
+        if self._stale or key != self._drawn_key:
+            return True
+        self.stats["frames_skipped"] += 1
+        return False
+
+    def frame_drawn(self, key):
+        """Call after presenting a frame that shows key. Waits out the rest of the frame at active_fps."""
+        self._drawn_key = key
+        self._stale = False
+        self.stats["frames_drawn"] += 1
+        self.clock.tick(self.active_fps)
@@ -0,0 +1,166 @@
+# renderTarget.py
+"""
+Where frames are drawn before they reach the window.
+
+The game works in logical coordinates (config.SCREEN_WIDTH x SCREEN_HEIGHT) everywhere: the
+simulation, hit detection, HUD layout and the menus' clickable rects. Fights are drawn at an
+internal resolution of the logical size times the render scale (config.RENDER_SCALE, see
+stages.stageRenderer for how), menus at the logical size; either way the frame is scaled to the
+window when presented. At scale 1 with a window of the logical size (the defaults) the window is
+drawn into directly and none of this costs anything.
+
+With config.DYNAMIC_RESOLUTION the render scale follows the measured fight frame time
+(DynamicResolution), so a slow machine trades sharpness for holding config.FPS_CAP.
+"""
+import math
+import weakref
+
+import pygame
+import config
+from frameProfiler import percentile
+
+class RenderTarget:
+    """
+    Canvases at the internal (fights) and logical (menus) resolution and the mapping between
+    them and the window. generation changes with the render scale, so renderers know to rebuild
+    whatever they scaled.
+    """
+    def __init__(self, scale=config.RENDER_SCALE, dynamic=config.DYNAMIC_RESOLUTION):
+        self.logical_size = (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+        self.scale = None
+        self.generation = 0
+        self._canvas = None
+        self._logical_canvas = None
+        self._scaled_images = weakref.WeakKeyDictionary() # Source image -> copy at the render scale
+        self.set_scale(scale)
+        self.dynamic = DynamicResolution(self) if dynamic else None
+
+    def set_scale(self, scale):
+        scale = min(1.0, max(config.RENDER_SCALE_MIN, scale))
+        if scale == self.scale:
+            return
+        self.scale = scale
+        self.generation += 1
+        self._canvas = None
+        self._scaled_images = weakref.WeakKeyDictionary()
+
+    @property
+    def internal_size(self):
+        return (max(1, round(self.logical_size[0] * self.scale)), max(1, round(self.logical_size[1] * self.scale)))
+
+    @property
+    def scaled(self):
+        """True when fights are drawn at a resolution other than the logical one."""
+        return self.internal_size != self.logical_size
+
+    # --- CANVASES ---
+
+    def _window(self):
+        return pygame.display.get_surface()
+
+    def fight_canvas(self):
+        """Surface fights draw on, at the internal resolution (the window itself when nothing is scaled)."""
+        window = self._window()
+        if self.internal_size == window.get_size():
+            return window
+        if self._canvas is None or self._canvas.get_size() != self.internal_size:
+            self._canvas = pygame.Surface(self.internal_size).convert()
+        return self._canvas
+
+    def menu_canvas(self):
+        """Surface menus draw on, at the logical resolution (the window itself if it has that size)."""
+        window = self._window()
+        if window.get_size() == self.logical_size:
+            return window
+        if self._logical_canvas is None:
+            self._logical_canvas = pygame.Surface(self.logical_size).convert()
+        return self._logical_canvas
+
+    def present(self, canvas, rects=None):
+        """Puts canvas on the window: only rects if it is the window itself, otherwise scaled as a whole."""
+        window = self._window()
+        if canvas is window:
+            if rects is None:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
+            return
+        pygame.transform.scale(canvas, window.get_size(), window)
+        pygame.display.flip()
+
+    # --- COORDINATES ---
+
+    def scale_rect(self, rect):
+        """Internal resolution rect covering the logical rect (rounded outwards, so nothing is left behind)."""
+        s = self.scale
+        left, top = math.floor(rect[0] * s), math.floor(rect[1] * s)
+        right, bottom = math.ceil((rect[0] + rect[2]) * s), math.ceil((rect[1] + rect[3]) * s)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def scale_pos(self, pos):
+        return (round(pos[0] * self.scale), round(pos[1] * self.scale))
+
+    def scaled_image(self, image):
+        """image at the render scale, scaled once and kept for as long as the image is."""
+        scaled = self._scaled_images.get(image)
+        if scaled is None:
+            size = (max(1, round(image.get_width() * self.scale)), max(1, round(image.get_height() * self.scale)))
+            scaled = pygame.transform.smoothscale(image, size) if image.get_bitsize() >= 24 else pygame.transform.scale(image, size)
+            self._scaled_images[image] = scaled
+        return scaled
+
+    def window_to_logical(self, pos):
+        """Window position (mouse) to logical coordinates."""
+        window_w, window_h = self._window().get_size()
+        return (pos[0] * self.logical_size[0] // window_w, pos[1] * self.logical_size[1] // window_h)
+
+    def mouse_pos(self):
+        """pygame.mouse.get_pos() in logical coordinates."""
+        return self.window_to_logical(pygame.mouse.get_pos())
+
+    def logical_event(self, event):
+        """event with its pos in logical coordinates (the same event if the window has the logical size)."""
+        if "pos" not in event.dict or self._window().get_size() == self.logical_size:
+            return event
+        return pygame.event.Event(event.type, dict(event.dict, pos=self.window_to_logical(event.pos)))
+
+    # --- DYNAMIC RESOLUTION ---
+
+    def frame_done(self, frame_ms):
+        """Called after every fight frame with the time it took to make (not counting the frame cap's wait)."""
+        if self.dynamic:
+            self.dynamic.frame_done(frame_ms)
+
+class DynamicResolution:
+    """
+    Lowers the render scale a step when frames take too long for config.FPS_CAP and raises it
+    again when there is plenty of room. Decisions are made on the 90th percentile of a window
+    of frames, with a gap between the two thresholds so the scale doesn't flip back and forth.
+    """
+    def __init__(self, target, steps=config.DYNAMIC_RESOLUTION_STEPS, window_frames=config.DYNAMIC_RESOLUTION_WINDOW_FRAMES):
+        self.target = target
+        self.steps = sorted(steps, reverse=True)
+        self.window_frames = window_frames
+        self.budget_ms = 1000.0 / config.FPS_CAP
+        self._frame_times = []
+        self.changes = 0
+
+    def frame_done(self, frame_ms):
+        self._frame_times.append(frame_ms)
+        if len(self._frame_times) < self.window_frames:
+            return
+        times = sorted(self._frame_times)
+        self._frame_times = []
+        p90 = percentile(times, 0.9)
+        index = min(range(len(self.steps)), key=lambda i: abs(self.steps[i] - self.target.scale))
+        if p90 > self.budget_ms * config.DYNAMIC_RESOLUTION_LOWER_AT and index + 1 < len(self.steps):
+            index += 1
+        elif p90 < self.budget_ms * config.DYNAMIC_RESOLUTION_RAISE_AT and index > 0:
+            index -= 1
+        else:
+            return
+        self.target.set_scale(self.steps[index])
+        self.changes += 1
+
+# Shared render target (everything draws through it)
+render_target = RenderTarget()
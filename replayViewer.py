@@ -0,0 +1,182 @@
+# replayViewer.py
+"""
+Plays back or verifies a fight recorded by the game (config.REPLAY_RECORDING, see fightingLogic.fightReplay).
+
+A replay is the fight's seed plus every simulation step's input, so playback rebuilds the same
+stage, seeds it and feeds the recorded input to the same _simulation_step the game ran. Fast
+forward runs several steps per drawn frame; seeking back re-simulates from the start (a few
+thousand headless steps take well under a second).
+
+Keys while playing: Space pause, Left/Right seek 5 seconds, Up/Down change speed, Esc quit.
+
+Examples:
+    python replayViewer.py replays/20260101-120000_Stage1.zjr
+    python replayViewer.py replays/20260101-120000_Stage1.zjr --speed 4 --seek 30
+    python replayViewer.py replays/*.zjr --verify   # headless, exit code 1 if any replay diverges
+"""
+import argparse
+import importlib
+import os
+import sys
+
+import pygame
+import config
+import textCache
+from fightingLogic import fightReplay
+
+SPEEDS = (0.25, 0.5, 1, 2, 4, 8, 16)
+SEEK_SECONDS = 5
+MAX_STEPS_PER_FRAME = 1000 # Fast forward limit, so the window stays responsive
+
+class ReplayRun:
+    """A stage rebuilt from a replay header, advanced step by step with the recorded input."""
+    def __init__(self, screen, replay):
+        header = replay.header
+        # The fight has to run under the settings it was recorded with
+        config.SIMULATION_HZ = header["simulation_hz"]
+        config.PIXEL_PERFECT_HITS = header["pixel_perfect_hits"]
+        config.REPLAY_RECORDING = False
+        config.OPPONENT_AI = header.get("opponent_ai", "reactive")
+        # Recorded before attacks were buffered and motions existed: neither
+        config.INPUT_BUFFER_STEPS = header.get("input_buffer_steps", 0)
+        config.INPUT_MOTION_STEPS = header.get("input_motion_steps", 0)
+        module_name, class_name = header["stage"].split(":")
+        stage_class = getattr(importlib.import_module(module_name), class_name)
+        self.stage = stage_class(screen, header["player"], header["opponent"])
+        self.stage.reseed(header["seed"])
+        search_ai = getattr(self.stage, "search_ai", None)
+        if search_ai:
+            # Same amount of searching as when it was recorded, however fast this machine is
+            search_ai.node_budget = header["search_node_budget"]
+            search_ai.budget_ms = None
+        self.replay = replay
+        self.step = 0
+        self.winner = None
+
+    @property
+    def finished(self):
+        return self.winner is not None or self.step >= self.replay.steps
+
+    def advance(self, steps):
+        """Runs up to steps simulation steps (fewer at the end of the replay or once someone wins)."""
+        for _ in range(steps):
+            if self.finished:
+                return
+            self.winner = self.stage._simulation_step(*self.replay.input_at(self.step))
+            self.step += 1
+
+def verify(path):
+    """Re-simulates a replay headlessly. Returns True if it ends exactly like the recorded fight."""
+    try:
+        replay = fightReplay.Replay.load(path)
+    except (OSError, ValueError) as e:
+        print(f"{path}: {e}")
+        return False
+    if replay.footer is None:
+        print(f"{path}: no result recorded (the game didn't close the replay), {replay.steps} steps replayed unchecked")
+        return True
+
+    run = ReplayRun(pygame.display.get_surface(), replay)
+    run.advance(replay.steps)
+    expected = dict(replay.footer)
+    expected_steps = expected.pop("steps")
+    actual = run.stage._replay_summary()
+    if run.step != expected_steps or actual != expected:
+        print(f"{path}: MISMATCH after {run.step}/{expected_steps} steps: got {actual}, recorded {expected}")
+        return False
+    print(f"{path}: ok ({run.step} steps, {actual})")
+    return True
+
+def play(screen, replay, speed_index, seek_seconds):
+    hz = replay.header["simulation_hz"]
+    clock = pygame.time.Clock()
+    step_ms = 1000.0 / hz
+    run = ReplayRun(screen, replay)
+    run.advance(int(seek_seconds * hz))
+    paused = False
+    accumulator = 0.0
+    last_ticks = pygame.time.get_ticks()
+
+    def status():
+        seconds, total = run.step // hz, replay.steps // hz
+        state = "PAUSED" if paused else ("END" if run.finished else f"x{SPEEDS[speed_index]:g}")
+        return f"{seconds // 60}:{seconds % 60:02d} / {total // 60}:{total % 60:02d}   {state}"
+
+    def draw_status(target):
+        font = textCache.get_font(None, 30)
+        text = textCache.render_text(font, status(), config.WHITE)
+        panel = text.get_rect(midbottom=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT - 10)).inflate(16, 10)
+        pygame.draw.rect(target, config.BLACK, panel)
+        target.blit(text, text.get_rect(center=panel.center))
+        return panel
+
+    while True:
+        seek_to = None
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return 0
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_SPACE:
+                paused = not paused
+            elif event.key == pygame.K_UP:
+                speed_index = min(speed_index + 1, len(SPEEDS) - 1)
+            elif event.key == pygame.K_DOWN:
+                speed_index = max(speed_index - 1, 0)
+            elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                direction = 1 if event.key == pygame.K_RIGHT else -1
+                seek_to = max(0, min(replay.steps, (seek_to or run.step) + direction * SEEK_SECONDS * hz))
+
+        if seek_to is not None:
+            if seek_to < run.step: # The simulation only runs forward: start over and catch up
+                run = ReplayRun(screen, replay)
+            run.advance(seek_to - run.step)
+            accumulator = 0.0
+
+        now_ticks = pygame.time.get_ticks()
+        if not paused:
+            accumulator += (now_ticks - last_ticks) * SPEEDS[speed_index]
+        last_ticks = now_ticks
+        steps = int(accumulator // step_ms)
+        if steps:
+            accumulator -= steps * step_ms
+            run.advance(min(steps, MAX_STEPS_PER_FRAME)) # Rendered once, however many steps ran
+        if run.finished:
+            accumulator = 0.0
+
+        stage = run.stage
+        hud_items = stage._get_hud_items() + [("replay_status", status(), draw_status)]
+        stage.renderer.draw_frame(stage.all_sprites, hud_items)
+        stage.renderer.present()
+        clock.tick(config.FPS_CAP)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play back or verify recorded fights.")
+    parser.add_argument("replays", nargs="+", help="Replay file(s); playback shows the first one")
+    parser.add_argument("--verify", action="store_true", help="Re-simulate headlessly and check every replay's result")
+    parser.add_argument("--speed", type=float, default=1, choices=SPEEDS, help="Playback speed")
+    parser.add_argument("--seek", type=float, default=0, help="Start playback this many seconds in")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    try:
+        if args.verify:
+            results = [verify(path) for path in args.replays]
+            print(f"{sum(results)}/{len(results)} replays verified")
+            return 0 if all(results) else 1
+        pygame.display.set_caption(f"Replay: {os.path.basename(args.replays[0])}")
+        try:
+            replay = fightReplay.Replay.load(args.replays[0])
+        except (OSError, ValueError) as e:
+            print(e)
+            return 1
+        return play(screen, replay, SPEEDS.index(args.speed), args.seek)
+    finally:
+        pygame.quit()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+# sceneManager.py
+"""
+One game loop for every screen: menus, the fight countdown, the fight and the winner screen are
+Scenes on a stack, and SceneManager.run() drives whichever one is on top.
+
+Scenes switch with push()/pop()/replace()/quit(); the switch happens between frames, calling the
+scenes' enter/exit/suspend/resume hooks, each of which is timed so hitches when changing screens
+show up (config.SCENE_TIMING_LOG, the F3 overlay). push_when_ready() prepares the next scene while
+the current one stays on screen: its images are decoded on the asset preloader's worker thread
+and the scene is only built and pushed once they are in the cache.
+"""
+import time
+
+import pygame
+import config
+import assetPreloader
+import startupTimeline
+from frameProfiler import profiler
+from redrawScheduler import RedrawScheduler
+from renderTarget import render_target
+
+class Scene:
+    """
+    Base class for one screen. Every hook is optional.
+
+    Menus set redraw_on_demand: they are only drawn when redraw_key() changes and the loop sleeps
+    in between (see redrawScheduler.py). Other scenes are drawn every frame, capped at config.FPS_CAP.
+    Scenes work in logical coordinates: event positions are mapped from the window, and menus
+    are given a logical size canvas to draw on (see renderTarget.py). Every event has a received
+    attribute, the time.perf_counter() it was taken off the queue; event_types limits which
+    events SDL queues at all while the scene is on top (None for all of them).
+    """
+    redraw_on_demand = False
+    event_types = None
+    manager = None # Set by the SceneManager before enter()
+
+    @property
+    def name(self):
+        return type(self).__name__
+
+    def enter(self):
+        """The scene was put on the stack. Load what it needs that wasn't loaded in __init__."""
+
+    def exit(self):
+        """The scene was taken off the stack for good. Release what it holds."""
+
+    def suspend(self):
+        """Another scene was pushed on top of this one."""
+
+    def resume(self, result=None):
+        """The scene on top was popped; result is what it passed to pop()."""
+
+    def handle_event(self, event):
+        pass
+
+    def update(self):
+        pass
+
+    def wake_in_ms(self):
+        """On demand scenes: how soon update() has work to do without any input (None: not until input)."""
+        return None
+
+    def redraw_key(self):
+        """On demand scenes: everything draw() depends on; the scene is only drawn when this changes."""
+        return None
+
+    def draw(self, screen):
+        pass
+
+    def present(self):
+        render_target.present(render_target.menu_canvas())
+
+class SceneManager:
+    """
+    Runs a stack of Scenes in one loop (see the module docstring).
+
+    timings keeps the last config.SCENE_TIMING_HISTORY scene switches, each a list of
+    (scene name, hook, ms) for the hooks it ran.
+    """
+    def __init__(self, screen, preloader=None):
+        self.screen = screen
+        self.preloader = preloader or assetPreloader.preloader
+        self.stack = []
+        self.timings = []
+        self.result = None
+        self._transitions = [] # Queued (kind, argument) switches, applied between frames
+        self._switch_record = [] # Timings of the switch being queued, see _apply_transitions
+        self._preparing = None # (requesting scene, factory, asset keys, warm up, started)
+        self._received = [] # Events taken off the queue while waiting out the frame cap
+        self._event_types = None # What SDL is letting onto the queue
+
+    # --- SWITCHING SCENES ---
+
+    def push(self, scene):
+        """Puts scene on top of the current one, which is suspended."""
+        self._transitions.append(("push", scene))
+
+    def pop(self, result=None):
+        """Leaves the current scene and resumes the one below with result (run() returns it if there is none)."""
+        self._transitions.append(("pop", result))
+
+    def replace(self, scene):
+        """Leaves the current scene for scene."""
+        self._transitions.append(("replace", scene))
+
+    def quit(self):
+        """Leaves every scene; run() returns "quit"."""
+        self._transitions.append(("quit", "quit"))
+
+    def push_when_ready(self, factory, asset_keys=(), warm=None):
+        """
+        Pushes factory() once asset_keys are in the asset cache, decoding them in the background
+        meanwhile. warm() runs just before factory(), for work that needs the images (slicing
+        frames and the like). factory may return None to cancel. The current scene keeps running
+        until then; if it is left first, the preparation is dropped.
+        """
+        asset_keys = list(asset_keys)
+        self.preloader.cancel(keep=asset_keys)
+        self.preloader.request(asset_keys)
+        self._preparing = (self.stack[-1] if self.stack else None, factory, asset_keys, warm, time.perf_counter())
+
+    def _update_preparation(self):
+        if self._preparing is None:
+            return
+        requester, factory, asset_keys, warm, started = self._preparing
+        if self.stack and self.stack[-1] is not requester:
+            self._preparing = None
+            return
+        self.preloader.pump()
+        # If the preloader gave up on an image, the scene's own load reports the error
+        if not self.preloader.is_ready(asset_keys) and self.preloader.busy():
+            return
+        self._preparing = None
+        record = [("(next scene)", "prepare", (time.perf_counter() - started) * 1000.0)]
+        build_started = time.perf_counter()
+        if warm:
+            warm()
+        scene = factory()
+        if scene is None:
+            return
+        record.append((scene.name, "build", (time.perf_counter() - build_started) * 1000.0))
+        self._switch_record = record
+        self.push(scene)
+
+    def _call(self, record, scene, hook, *args):
+        started = time.perf_counter()
+        getattr(scene, hook)(*args)
+        record.append((scene.name, hook, (time.perf_counter() - started) * 1000.0))
+
+    def _apply_transitions(self):
+        """Runs queued switches (hooks may queue more, e.g. a stage pushing its countdown in enter)."""
+        record, self._switch_record = self._switch_record, []
+        while self._transitions:
+            kind, argument = self._transitions.pop(0)
+            if kind == "push":
+                if self.stack:
+                    self._call(record, self.stack[-1], "suspend")
+                self.stack.append(argument)
+                argument.manager = self
+                self._call(record, argument, "enter")
+            elif kind == "replace":
+                if self.stack:
+                    self._call(record, self.stack.pop(), "exit")
+                self.stack.append(argument)
+                argument.manager = self
+                self._call(record, argument, "enter")
+            elif kind == "pop":
+                if self.stack:
+                    self._call(record, self.stack.pop(), "exit")
+                if self.stack:
+                    self._call(record, self.stack[-1], "resume", argument)
+                else:
+                    self.result = argument
+            else:
+                while self.stack:
+                    self._call(record, self.stack.pop(), "exit")
+                self.result = argument
+                self._transitions.clear()
+        if record:
+            self._record_timings(record)
+
+    def _record_timings(self, record):
+        self.timings.append(record)
+        del self.timings[:-config.SCENE_TIMING_HISTORY]
+        if config.SCENE_TIMING_LOG:
+            for name, hook, ms in record:
+                print(f"[scene] {ms:8.1f} ms  {name}.{hook}")
+
+    def timing_summary(self):
+        """One line about the last scene switch, for the profiler overlay."""
+        if not self.timings:
+            return "last switch -"
+        record = self.timings[-1]
+        slowest = max(record, key=lambda entry: entry[2] if entry[1] != "prepare" else 0.0)
+        total = sum(ms for _, hook, ms in record if hook != "prepare") # Preparing doesn't block
+        return f"last switch {total:6.1f} ms, slowest {slowest[0]}.{slowest[1]} {slowest[2]:.1f} ms"
+
+    # --- MAIN LOOP ---
+
+    def run(self, scene):
+        """Runs scene (and whatever it switches to) until the stack is empty. Returns the last pop()'s result."""
+        clock = pygame.time.Clock()
+        scheduler = RedrawScheduler() # Menus only
+        self.push(scene)
+        self._apply_transitions()
+        try:
+            while self.stack:
+                scene = self.stack[-1]
+                self._filter_events(scene.event_types)
+                loop_started = time.perf_counter()
+                if self._received:
+                    events, self._received = self._received + pygame.event.get(), []
+                elif scene.redraw_on_demand:
+                    events = scheduler.get_events(self._wake_in_ms(scene))
+                else:
+                    events = pygame.event.get()
+
+                profiler.begin_frame()
+                frame_started = time.perf_counter()
+                for event in events:
+                    event = render_target.logical_event(event)
+                    if not hasattr(event, "received"):
+                        event.received = frame_started
+                    if event.type == pygame.QUIT:
+                        self.quit()
+                    elif not profiler.handle_event(event):
+                        scene.handle_event(event)
+                    if self._transitions:
+                        break # The rest of the events were meant for this scene
+                profiler.mark("events")
+
+                if not self._transitions:
+                    self._update_preparation()
+                if not self._transitions:
+                    scene.update()
+                profiler.mark("update")
+
+                # Switch scenes instead of drawing a frame of one that was just left
+                if self._transitions:
+                    self._apply_transitions()
+                    scheduler.invalidate()
+                    profiler.mark("scene switch")
+                    profiler.end_frame()
+                    continue
+
+                if scene.redraw_on_demand:
+                    overlay_key = profiler.refresh_overlay([self.timing_summary()]) if profiler.show_overlay else None
+                    redraw_key = (scene.redraw_key(), overlay_key)
+                    if scheduler.needs_redraw(redraw_key):
+                        canvas = render_target.menu_canvas()
+                        scene.draw(canvas)
+                        if profiler.show_overlay:
+                            profiler.draw_overlay(canvas)
+                        self._present(scene)
+                        scheduler.frame_drawn(redraw_key)
+                        profiler.mark("idle")
+                else:
+                    scene.draw(self.screen)
+                    self._present(scene)
+                    render_target.frame_done((time.perf_counter() - frame_started) * 1000.0) # For dynamic resolution
+                    self._wait_for_frame(clock, loop_started)
+                    profiler.mark("idle")
+                profiler.end_frame()
+        finally:
+            # Scenes release what they hold even if the loop was left by an exception
+            self._transitions = [("quit", self.result)] if self.stack else []
+            self._apply_transitions()
+            self._filter_events(None)
+        return self.result
+
+    def _filter_events(self, event_types):
+        """Lets only event_types onto the SDL queue (None: everything)."""
+        if event_types == self._event_types:
+            return
+        self._event_types = event_types
+        if event_types is None:
+            pygame.event.set_allowed(None)
+        else:
+            pygame.event.set_blocked(None)
+            pygame.event.set_allowed(list(event_types))
+
+    def _wait_for_frame(self, clock, loop_started):
+        """
+        clock.tick(config.FPS_CAP), which caps rendering only (fights keep their own simulation
+        clock), except that events arriving meanwhile are taken off the queue and stamped straight
+        away, so their received time says when they came in rather than when the wait ended.
+        """
+        frame_ms = 1000.0 / config.FPS_CAP
+        while True:
+            wait_ms = int(frame_ms - (time.perf_counter() - loop_started) * 1000.0)
+            if wait_ms <= 1: # clock.tick sleeps off the rest
+                break
+            event = pygame.event.wait(wait_ms)
+            if event.type == pygame.NOEVENT:
+                break
+            event.received = time.perf_counter()
+            self._received.append(event)
+        clock.tick(config.FPS_CAP)
+
+    def _wake_in_ms(self, scene):
+        wake_in_ms = scene.wake_in_ms()
+        if self._preparing is not None:
+            wake_in_ms = 0 # Decoded images are waiting to be pumped
+        if profiler.show_overlay: # Its numbers refresh twice a second
+            wake_in_ms = 500 if wake_in_ms is None else min(wake_in_ms, 500)
+        return wake_in_ms
+
+    def _present(self, scene):
+        profiler.mark("draw")
+        scene.present()
+        startupTimeline.report() # Only prints once, after the first frame
+        profiler.mark("present")
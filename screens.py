@@ -1,6 +1,9 @@
 # screens.py
 import pygame
 import config # Import our config file
+import textCache
+import assetCache
+import startupTimeline
 
 # --- Image Loading (Now loaded centrally, but still managed in screens.py init) ---
 # We'll keep these global variables as the loaded surfaces
@@ -12,42 +15,49 @@ female_character_img = None
 # LevelSelectMap instance
 level_select_map = None # Will be initialized in main.py
 
-# LevelSelectMap instance
-level_select_map = None # Will be initialized in main.py
-
 def load_game_assets():
-    """Loads and scales all necessary game images."""
-    global boot_up_screen_img, dialog_bg_img, male_character_img, female_character_img
+    """Loads the boot up screen, the only image the first frame (the main menu) needs."""
+    global boot_up_screen_img
     try:
-        boot_up_screen_img = pygame.image.load("assests/bootUpscreen.jpg").convert()
-        dialog_bg_img = pygame.image.load("assests/DiologBG.jpg").convert()
-
-        # Assuming EmployeePlaceHolder_Female.bmp is a JPG/PNG now
-        raw_male_character_img = pygame.image.load("sprites/EmployeePlaceHolder_Male.png").convert_alpha()
-        raw_female_character_img = pygame.image.load("sprites/EmployeePlaceHolder_Female.bmp").convert_alpha()
+        boot_up_screen_img = assetCache.load_image("assests/bootUpscreen.jpg")
+    except pygame.error as e:
+        _asset_load_failed(e)
 
-        # These lines need to be consistently indented, typically 4 spaces from the 'try'
-        male_character_img = raw_male_character_img
-        female_character_img = raw_female_character_img
+def load_character_select_assets():
+    """Loads the character select images on first use and lays them out."""
+    global dialog_bg_img, male_character_img, female_character_img
+    if male_character_rect is not None:
+        return
+    try:
+        with startupTimeline.measure("character select assets"):
+            dialog_bg_img = assetCache.load_image("assests/DiologBG.jpg")
 
+            # Assuming EmployeePlaceHolder_Female.bmp is a JPG/PNG now
+            male_character_img = assetCache.load_image("assests/sprites/EmployeePlaceHolder_Male.png", pixel_format=assetCache.FORMAT_ALPHA)
+            female_character_img = assetCache.load_image("assests/sprites/EmployeePlaceHolder_Female.bmp", pixel_format=assetCache.FORMAT_ALPHA)
     except pygame.error as e:
-        print(f"Error loading image: {e}")
-        print("Please ensure your image files are in the correct folders ('assests' or 'sprites') and named correctly.")
-        pygame.quit()
-        exit()
-
-# --- Initial Setup for Screens ---
-# Fonts
-main_title_font = pygame.font.Font(None, config.FONT_SIZE_MAIN_TITLE)
-button_font = pygame.font.Font(None, config.FONT_SIZE_BUTTON)
-character_button_font = pygame.font.Font(None, config.FONT_SIZE_CHAR_BUTTON)
+        _asset_load_failed(e)
+    setup_character_select_rects()
 
-# Main Menu Text Surfaces
-main_title_text_surface = main_title_font.render("Zoo-jacked", True, config.RED)
-main_title_text_rect = main_title_text_surface.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 - 100))
+def _asset_load_failed(e):
+    print(f"Error loading image: {e}")
+    print("Please ensure your image files are in the correct folders ('assests' or 'sprites') and named correctly.")
+    pygame.quit()
+    exit()
 
-story_text_surface = button_font.render("Story Mode", True, config.BLACK)
-levels_text_surface = button_font.render("Levels", True, config.BLACK)
+# --- Initial Setup for Screens ---
+# Fonts and text are created on first draw, so importing this module doesn't need pygame.font yet
+main_title_font = None
+button_font = None
+character_button_font = None
+
+def _get_fonts():
+    global main_title_font, button_font, character_button_font
+    if button_font is None:
+        main_title_font = textCache.get_font(None, config.FONT_SIZE_MAIN_TITLE)
+        button_font = textCache.get_font(None, config.FONT_SIZE_BUTTON)
+        character_button_font = textCache.get_font(None, config.FONT_SIZE_CHAR_BUTTON)
+    return main_title_font, button_font
 
 # Main Menu Button Rects
 story_button_rect = pygame.Rect(config.SCREEN_WIDTH // 2 - config.BUTTON_WIDTH - 20, 500, config.BUTTON_WIDTH, config.BUTTON_HEIGHT)
@@ -85,6 +95,12 @@ def setup_character_select_rects():
 # --- Main Menu Screen Drawing Function ---
 def draw_main_menu(screen):
     """Draws the main menu screen elements."""
+    main_title_font, button_font = _get_fonts()
+    main_title_text_surface = textCache.render_text(main_title_font, "Zoo-jacked", config.RED)
+    main_title_text_rect = main_title_text_surface.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 - 100))
+    story_text_surface = textCache.render_text(button_font, "Story Mode", config.BLACK)
+    levels_text_surface = textCache.render_text(button_font, "Levels", config.BLACK)
+
     screen.blit(boot_up_screen_img, (0, 0))
     screen.blit(main_title_text_surface, main_title_text_rect)
 
@@ -100,13 +116,14 @@ def draw_main_menu(screen):
 # --- Story Mode (Character Selection) Screen Drawing Function ---
 def draw_character_select_screen(screen, selected_character):
     """Draws the character selection screen elements."""
+    load_character_select_assets()
     screen.blit(dialog_bg_img, (0, 0))
 
     screen.blit(male_character_img, male_character_rect)
     screen.blit(female_character_img, female_character_rect)
 
     if selected_character:
-        selected_text = button_font.render(f"Selected: {selected_character}", True, config.BLACK) # Corrected!
+        selected_text = textCache.render_text(_get_fonts()[1], f"Selected: {selected_character}", config.BLACK) # Corrected!
         selected_text_rect = selected_text.get_rect(center=(config.SCREEN_WIDTH // 2, 100))
         pygame.draw.rect(screen, config.WHITE, selected_text_rect.inflate(20, 10), border_radius=5)
         screen.blit(selected_text, selected_text_rect)
@@ -114,7 +131,7 @@ def draw_character_select_screen(screen, selected_character):
 # --- Game Over/Level Cleared (Example, not implemented yet) ---
 def draw_game_over_screen(screen):
     screen.fill(config.BLACK)
-    font = pygame.font.Font(None, 74)
-    text_surface = font.render("Game Over!", True, config.RED)
+    font = textCache.get_font(None, 74)
+    text_surface = textCache.render_text(font, "Game Over!", config.RED)
     text_rect = text_surface.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2))
     screen.blit(text_surface, text_rect)
\ No newline at end of file
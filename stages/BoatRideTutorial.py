@@ -1,177 +1,22 @@
 # stages/BoatRideTutorial.py
 import pygame
-import config
-import random
-from fightingLogic.fightingLogic import Player, draw_controls_overlay 
-from fightingLogic.winnerScreen import WinnerScreen
-
-class BoatRideTutorial:
-    def __init__(self, screen, player_character_name, opponent_character_name):
-        self.screen = screen
-        self.player_character_name = player_character_name
-        self.opponent_character_name = opponent_character_name
-        self.background_image = None
-
-        self.player = None
-        self.opponent = None
-        self.all_sprites = pygame.sprite.Group() 
-
-        self._load_background_image()
-        self._setup_characters()
-
-    def _load_background_image(self):
-        try:
-            # Matching your folder name: "assests"
-            self.background_image = pygame.image.load("assests/Croc_Tutorial.jpg").convert()
-            self.background_image = pygame.transform.scale(self.background_image, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-        except pygame.error as e:
-            print(f"Error loading background image: {e}")
-            self.background_image = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-            self.background_image.fill((34, 139, 34))
-
-    def _setup_characters(self):
-        player_initial_x = config.SCREEN_WIDTH * 0.2
-        opponent_initial_x = config.SCREEN_WIDTH * 0.8
-        ground_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
-
-        self.player = Player(self.player_character_name, player_initial_x, ground_y, is_player_controlled=True)
-        self.opponent = Player(self.opponent_character_name, opponent_initial_x, ground_y, is_player_controlled=False)
-
-        self.all_sprites.add(self.player)
-        self.all_sprites.add(self.opponent)
-
-    def run(self):
-        clock = pygame.time.Clock()
-        
-        # --- TIMER SETUP ---
-        countdown_seconds = 10
-        start_ticks = pygame.time.get_ticks() 
-        
-        waiting_to_start = True
-        running = True
-        next_game_state = "level_select"
-
-        while running:
-            # 1. Timer Logic
-            if waiting_to_start:
-                # Calculate remaining time
-                seconds_passed = (pygame.time.get_ticks() - start_ticks) // 1000
-                current_timer = max(0, countdown_seconds - seconds_passed)
-                
-                if current_timer <= 0:
-                    waiting_to_start = False
-            
-            # 2. Event Handling
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return "quit"
-                
-                # Input only works after countdown
-                if not waiting_to_start:
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_q:
-                            running = False
-                        
-                        # Player Controls
-                        if event.key == pygame.K_a: self.player.move(-1)
-                        elif event.key == pygame.K_s: self.player.move(1)
-                        elif event.key == pygame.K_SPACE: self.player.jump()
-                        
-                        # Combat Keys
-                        elif event.key == pygame.K_j: self.player.attack("basic")
-                        elif event.key == pygame.K_w:
-                            if self.player.attack_hit_count >= self.player.MID_ATTACK_THRESHOLD:
-                                self.player.attack("mid")
-                        elif event.key == pygame.K_e:
-                            if self.player.attack_hit_count >= self.player.SUPER_ATTACK_THRESHOLD:
-                                self.player.attack("super")
-
-                    elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                        self.player.attack("basic")
-
-                    elif event.type == pygame.KEYUP:
-                        if event.key in [pygame.K_a, pygame.K_s]:
-                            self.player.stop_move()
-
-            # 3. Game State Updates (Only runs after countdown)
-            if not waiting_to_start:
-                self.all_sprites.update()
-                
-                # AI Logic for Opponent
-                ai_action = self.opponent.handle_ai(self.player.rect, self.player.is_attacking)
-                if ai_action:
-                    # Clean the action string (e.g., "basic_attack" -> "basic")
-                    self.opponent.attack(ai_action.replace("_attack", ""))
-
-                self._check_collisions()
-
-                # Death Check
-                if self.player.health <= 0 or self.opponent.health <= 0:
-                    winner = self.player.character_name if self.opponent.health <= 0 else self.opponent.character_name
-                    winner_screen = WinnerScreen(self.screen, winner)
-                    return winner_screen.run()
-
-        # --- 4. Drawing ---
-            if self.background_image:
-                self.screen.blit(self.background_image, (0, 0))
-            
-            self.all_sprites.draw(self.screen)
-            self._draw_health_bar(self.screen, self.player, (50, 40), (0, 0, 255)) 
-            self._draw_health_bar(self.screen, self.opponent, (config.SCREEN_WIDTH - 250, 40), (255, 0, 0))
-
-            # --- ADD THIS PART HERE ---
-            if waiting_to_start:
-                # 1. Darken the screen and show the big numbers
-                self._draw_countdown_overlay(current_timer)
-                # 2. Draw the actual button instructions on top
-                draw_controls_overlay(self.screen) 
-
-            pygame.display.flip()
-            clock.tick(60)
-
-        return next_game_state
-
-    def _check_collisions(self):
-        """Logic for checking if attacks hit their target."""
-        if self.player.is_attacking and not self.player.has_dealt_hit_this_attack:
-            # We inflate the rect to give the punch some reach
-            attack_rect = self.player.rect.inflate(60, 0)
-            if attack_rect.colliderect(self.opponent.rect):
-                if self.opponent.take_damage(self.player.BASIC_ATTACK_DAMAGE):
-                    self.player.attack_hit_count += 1
-                    self.player.has_dealt_hit_this_attack = True
-
-    def _draw_health_bar(self, screen, character, position, color):
-        bar_width, bar_height = 200, 25
-        health_percentage = max(0, character.health / 45.0)
-        current_bar_width = int(bar_width * health_percentage)
-
-        # Background (Grey)
-        pygame.draw.rect(screen, (50, 50, 50), (position[0], position[1], bar_width, bar_height), border_radius=5)
-        # Health (Blue/Red)
-        pygame.draw.rect(screen, color, (position[0], position[1], current_bar_width, bar_height), border_radius=5)
-        # Border
-        pygame.draw.rect(screen, (0, 0, 0), (position[0], position[1], bar_width, bar_height), 2, border_radius=5)
-
-    def _draw_countdown_overlay(self, time_left):
-        """Creates a dimming effect and centered text for the 10s countdown."""
-        # Create a translucent surface
-        overlay = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 160)) 
-        self.screen.blit(overlay, (0, 0))
-        
-        # Draw the big number
-        font = pygame.font.SysFont("Arial", 120, bold=True)
-        text_surf = font.render(str(time_left), True, (255, 215, 0)) # Gold
-        text_rect = text_surf.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2))
-        
-        # Draw "GET READY" text
-        sub_font = pygame.font.SysFont("Arial", 40)
-        sub_surf = sub_font.render("FIGHT STARTING...", True, (255, 255, 255))
-        sub_rect = sub_surf.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 + 100))
-        
-        self.screen.blit(text_surf, text_rect)
-        self.screen.blit(sub_surf, sub_rect)
+from stages.stageEngine import FightStage, StageSpec, RULES_TUTORIAL
+
+SPEC = StageSpec(
+    name="Boat Ride Tutorial",
+    background_path="assests/Croc_Tutorial.jpg",
+    background_fallback_color=(34, 139, 34),
+    rules=RULES_TUTORIAL,
+    countdown_dim_alpha=160,
+    countdown_subtitle="FIGHT STARTING...",
+    health_bar_back_color=(50, 50, 50),
+    health_bar_colors=((0, 0, 255), (255, 0, 0)),
+    show_health_text=False,
+)
+
+class BoatRideTutorial(FightStage):
+    def __init__(self, screen, player_character_name, opponent_character_name=None):
+        super().__init__(screen, SPEC, player_character_name, opponent_character_name)
 
 # Testing block
 if __name__ == "__main__":
@@ -179,4 +24,4 @@ if __name__ == "__main__":
     test_screen = pygame.display.set_mode((1000, 700))
     stage = BoatRideTutorial(test_screen, "Player 1", "AI Enemy")
     stage.run()
-    pygame.quit()
\ No newline at end of file
+    pygame.quit()
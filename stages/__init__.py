@@ -0,0 +1,35 @@
+# stages/__init__.py
+"""
+Registry of the playable stages.
+
+Stage modules pull in the whole fight engine, so they are only imported the first time a stage's
+class or spec is asked for; importing this package (or levelSelectMap) stays cheap.
+"""
+import importlib
+import sys
+
+import startupTimeline
+
+# stage id -> (module, class name)
+STAGE_REGISTRY = {
+    "boat_ride_tutorial": ("stages.BoatRideTutorial", "BoatRideTutorial"),
+    "stage1": ("stages.stage1", "Stage1"),
+    "stage2": ("stages.stage2", "Stage2"),
+    "stage3": ("stages.stage3", "Stage3"),
+    "bonus_stage": ("stages.bounusStage", "BonusStage"),
+}
+
+def _load_module(stage_id):
+    module_name = STAGE_REGISTRY[stage_id][0]
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    with startupTimeline.measure(f"import {module_name}"):
+        return importlib.import_module(module_name)
+
+def get_stage_class(stage_id):
+    """Returns the FightStage subclass for stage_id, importing its module on first use."""
+    return getattr(_load_module(stage_id), STAGE_REGISTRY[stage_id][1])
+
+def get_stage_spec(stage_id):
+    """Returns the StageSpec for stage_id, importing its module on first use."""
+    return _load_module(stage_id).SPEC
@@ -0,0 +1,183 @@
+# stages/bounusStage.py
+import time
+from collections import deque
+import pygame
+import config
+import textCache
+import assetCache
+from frameProfiler import profiler
+from fightingLogic import fightSimulation, hordeSimulation
+from fightingLogic.fightingLogic import Player, get_frame_bank
+from stages.stageEngine import FightStage, StageSpec
+
+ENEMY_SHEET_PATH = "assests/sprites/defualt_chicken.png"
+ENEMY_SHEET_GRID = (3, 3)            # Chickens per row/column on the sheet
+ENEMY_SHEET_BACKGROUND = (238, 238, 238) # The sheet's grey checkerboard...
+ENEMY_SHEET_TOLERANCE = 16               # ...is keyed out within this distance
+
+_enemy_frames = None # (right facing frames, left facing frames), built once
+
+def get_enemy_frames(sheet_path=ENEMY_SHEET_PATH):
+    """Walk cycle of the horde enemy for both facings, cut from the sheet's first row and scaled."""
+    global _enemy_frames
+    if _enemy_frames is None:
+        size = (hordeSimulation.ENEMY_WIDTH, hordeSimulation.ENEMY_HEIGHT)
+        try:
+            sheet = assetCache.load_image(sheet_path, pixel_format=assetCache.FORMAT_ALPHA)
+        except pygame.error as e:
+            print(f"Error loading enemy sprite sheet ({sheet_path}): {e}")
+            fallback = pygame.Surface(size, pygame.SRCALPHA)
+            fallback.fill((255, 200, 0, 220))
+            _enemy_frames = ([fallback] * hordeSimulation.ENEMY_FRAME_COUNT,) * 2
+            return _enemy_frames
+
+        tolerance = ENEMY_SHEET_TOLERANCE
+        background = pygame.mask.from_threshold(sheet, ENEMY_SHEET_BACKGROUND, (tolerance, tolerance, tolerance, 255))
+        background.invert()
+        keyed = background.to_surface(setsurface=sheet, unsetcolor=(0, 0, 0, 0))
+
+        cell_w, cell_h = sheet.get_width() // ENEMY_SHEET_GRID[0], sheet.get_height() // ENEMY_SHEET_GRID[1]
+        right = []
+        for column in range(hordeSimulation.ENEMY_FRAME_COUNT):
+            cell = keyed.subsurface((column * cell_w, 0, cell_w, cell_h))
+            bounds = cell.get_bounding_rect() or cell.get_rect()
+            right.append(pygame.transform.smoothscale(cell.subsurface(bounds), size))
+        # The chickens on the sheet face left
+        _enemy_frames = ([pygame.transform.flip(frame, True, False) for frame in right], right)
+    return _enemy_frames
+
+class HordeSpec(StageSpec):
+    """A StageSpec whose opponents are a horde of small enemies instead of one fighter."""
+    def __init__(self, name, background_path, enemy_sheet_path=ENEMY_SHEET_PATH, **kwargs):
+        super().__init__(name, background_path, opponent_name=None, **kwargs)
+        self.enemy_sheet_path = enemy_sheet_path
+
+    def asset_keys(self, player_character_name, opponent_character_name=None):
+        keys = super().asset_keys(player_character_name)
+        keys.append(assetCache.asset_cache.make_key(self.enemy_sheet_path, pixel_format=assetCache.FORMAT_ALPHA))
+        return keys
+
+    def warm_frame_banks(self, player_character_name, opponent_character_name=None):
+        get_frame_bank(player_character_name)
+        get_enemy_frames(self.enemy_sheet_path)
+
+SPEC = HordeSpec(
+    name="The Sting",
+    background_path="assests/TheStingBG.png",
+    countdown_seconds=5,
+    countdown_subtitle="SURVIVE THE HORDE!",
+)
+
+class EnemySprite(pygame.sprite.Sprite):
+    """Display slot for one pooled enemy; the stage keeps one per pool slot."""
+    def __init__(self, image):
+        super().__init__()
+        self.image = image
+        self.rect = image.get_rect()
+
+class BonusStage(FightStage):
+    """
+    Survival mode: the player fights an endless, growing horde (hordeSimulation.Horde).
+
+    Every enemy sprite is created up front, one per pool slot, and only moved in and out of the
+    sprite group as enemies spawn and die. The HUD shows live enemies, frame rate and kills.
+    """
+    READOUT_INTERVAL_MS = 250
+
+    def __init__(self, screen, player_character_name, opponent_character_name=None):
+        super().__init__(screen, SPEC, player_character_name)
+
+    def _setup_characters(self):
+        ground_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
+        self.player = Player(self.player_character_name, config.SCREEN_WIDTH * 0.5, ground_y, is_player_controlled=True)
+        self.all_sprites.add(self.player)
+        self.opponent = None
+        self.match = None
+        self.search_ai = None
+        self.hit_test = None
+        self.show_hit_masks = False
+
+        self.horde = hordeSimulation.Horde(seed=self.seed)
+        self.enemy_frames = get_enemy_frames(self.spec.enemy_sheet_path)
+        self.enemy_sprites = [EnemySprite(self.enemy_frames[0][0]) for _ in range(self.horde.pool.capacity)]
+
+        self._frame_times = deque() # perf_counter of the last second's frames, for the FPS readout
+        self._readout = ""
+        self._readout_updated = 0
+
+    def exit(self):
+        super().exit()
+        self.enemy_sprites = [] # Dead enemies' sprites aren't in all_sprites
+
+    def reseed(self, seed):
+        self.seed = seed
+        self.horde.rng.seed(seed)
+
+    def _simulation_step(self, bits=0):
+        """Advances the player and the horde by one fixed step. Returns the winner once the player is down."""
+        mark = profiler.mark if profiler.enabled else None
+        fightSimulation.apply_input(self.player.fighter, bits)
+        fightSimulation.update_fighter(self.player.fighter)
+        if mark: mark("update")
+        self.horde.step(self.player.fighter, mark)
+        self.player.sync_view()
+        self._sync_enemy_sprites()
+        if self.player.health <= 0:
+            return "The Horde"
+        return None
+
+    def _replay_summary(self):
+        return {"health": [self.player.health], "kills": self.horde.kills, "enemies": len(self.horde.pool)}
+
+    def _sync_enemy_sprites(self):
+        pool = self.horde.pool
+        sprites = self.enemy_sprites
+        group = self.all_sprites
+        right, left = self.enemy_frames
+        xs, ys, frames, facing_right = pool.x, pool.y, pool.frame, pool.facing_right
+        for index in pool.despawned:
+            sprites[index].kill()
+        for index in pool.active:
+            sprite = sprites[index]
+            sprite.image = (right if facing_right[index] else left)[frames[index]]
+            sprite.rect.topleft = (int(xs[index]), int(ys[index]))
+            if not sprite.alive(): # Spawned this step
+                group.add(sprite)
+
+    def _get_hud_items(self):
+        return [
+            ("player_health", self.player.health, self._draw_player_health_bar),
+            ("horde_readout", self._update_readout(), self._draw_readout),
+        ]
+
+    def _update_readout(self):
+        """Entity count / FPS / kills line, refreshed a few times a second. Called once per frame."""
+        now = time.perf_counter()
+        self._frame_times.append(now)
+        while now - self._frame_times[0] > 1.0:
+            self._frame_times.popleft()
+        ticks = pygame.time.get_ticks()
+        if ticks - self._readout_updated >= self.READOUT_INTERVAL_MS or not self._readout:
+            elapsed = now - self._frame_times[0]
+            fps = (len(self._frame_times) - 1) / elapsed if elapsed > 0 else 0.0
+            seconds = self.horde.frame // config.SIMULATION_HZ
+            self._readout = (f"Enemies {len(self.horde.pool):3d}   FPS {fps:3.0f}   "
+                             f"Defeated {self.horde.kills}   {seconds // 60}:{seconds % 60:02d}")
+            self._readout_updated = ticks
+        return self._readout
+
+    def _draw_readout(self, screen):
+        font = textCache.get_font(None, 30)
+        text = textCache.render_text(font, self._readout, config.WHITE)
+        panel = text.get_rect(topright=(config.SCREEN_WIDTH - 20, 20)).inflate(16, 10)
+        pygame.draw.rect(screen, config.BLACK, panel)
+        screen.blit(text, text.get_rect(center=panel.center))
+        return panel
+
+# For direct testing
+if __name__ == "__main__":
+    pygame.init()
+    test_screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    game = BonusStage(test_screen, "The Boat Man")
+    game.run()
+    pygame.quit()
@@ -0,0 +1,74 @@
+# stages/netplayStage.py
+import pygame
+import config
+import textCache
+from fightingLogic import netplay
+from stages.stageEngine import FightStage
+
+class NetplayStage(FightStage):
+    """
+    A two-player fight over the network (see netplayMatch.py and fightingLogic.netplay).
+
+    Fighter 0 (left) belongs to the host and fighter 1 (right) to the client. Both sides run the
+    same match; the local player's input goes through a RollbackSession instead of straight into
+    the match, and the HUD shows how much rolling back the connection costs.
+    """
+    def __init__(self, screen, spec, host_character_name, client_character_name, link, local_index, start_info=None):
+        self.link = link
+        self.local_index = local_index
+        self._start_info = start_info
+        super().__init__(screen, spec, host_character_name, client_character_name)
+
+    def _setup_characters(self):
+        super()._setup_characters()
+        self.match.controllers = [None, None] # No AI: the second fighter is the other player
+        self.search_ai = None
+        self.player.is_player_controlled = self.local_index == 0
+        self.opponent.is_player_controlled = self.local_index == 1
+        self.session = netplay.RollbackSession(self.match, self.local_index, self.link, start_info=self._start_info)
+        # A replay would need both players' confirmed input in step order, which only the
+        # session knows; networked fights aren't recorded for now
+        self.recorder = False
+        self._netplay_readout = ""
+
+    def run(self):
+        try:
+            return super().run()
+        except ConnectionError as e:
+            print(e)
+            return "level_select"
+
+    def exit(self):
+        super().exit()
+        self.session.close()
+
+    def _handle_player_input(self, event):
+        self._queue_input(event) # Always this side's fighter, left or right
+
+    def _simulation_step(self, bits=0):
+        """Advances the networked match by one step. Returns the winner's name once both sides agree on it."""
+        rollbacks = self.session.stats["rollbacks"]
+        self.session.advance(bits)
+        rolled_back = self.session.stats["rollbacks"] != rollbacks
+        self.player.sync_view(force_frame=rolled_back)
+        self.opponent.sync_view(force_frame=rolled_back)
+        winner = self.session.winner
+        if winner is None:
+            return None
+        return self._winner_name(winner)
+
+    def _get_hud_items(self):
+        stats = self.session.stats
+        self._netplay_readout = (f"Rollbacks {stats['rollbacks']}   Resimulated/s {stats['resimulated_per_second']}   "
+                                 f"Stalls {stats['stalls']}")
+        items = super()._get_hud_items()
+        items.append(("netplay_readout", self._netplay_readout, self._draw_netplay_readout))
+        return items
+
+    def _draw_netplay_readout(self, screen):
+        font = textCache.get_font(None, 26)
+        text = textCache.render_text(font, self._netplay_readout, config.WHITE)
+        panel = text.get_rect(midtop=(config.SCREEN_WIDTH // 2, 10)).inflate(12, 8)
+        pygame.draw.rect(screen, config.BLACK, panel)
+        screen.blit(text, text.get_rect(center=panel.center))
+        return panel
@@ -0,0 +1,465 @@
+# stages/stageEngine.py
+import os
+import random
+import time
+from collections import deque
+import pygame
+import config
+import textCache
+import assetCache
+from frameProfiler import profiler
+from surfacePool import surface_pool
+from fightInput import InputQueue, FIGHT_EVENT_TYPES
+from fightingLogic import fightSimulation, fightReplay, searchAI
+from fightingLogic.fightSimulation import RULES_VERSUS, RULES_TUTORIAL
+from fightingLogic.fightingLogic import Player, MaskHitTest, draw_controls_overlay, character_asset_keys, get_frame_bank
+from fightingLogic.winnerScreen import WinnerScreen
+from sceneManager import Scene, SceneManager
+from renderTarget import render_target
+from stages.stageRenderer import StageRenderer
+
+class StageSpec:
+    """Everything that makes one fight stage different from another."""
+    def __init__(self, name, background_path, background_fallback_color=config.GREEN,
+                 opponent_name="The Log Lady", rules=RULES_VERSUS, countdown_seconds=10,
+                 countdown_dim_alpha=150, countdown_subtitle=None,
+                 health_bar_back_color=config.GREY, health_bar_colors=(config.BLUE, config.RED),
+                 show_health_text=True):
+        """
+        Args:
+            name (str): Display name of the stage.
+            background_path (str): Background image, scaled to the screen size.
+            background_fallback_color (tuple): Fill color used if the background can't be loaded.
+            opponent_name (str): AI opponent fought on this stage.
+            rules (str): RULES_VERSUS or RULES_TUTORIAL.
+            countdown_seconds (int): Length of the pre-fight countdown.
+            countdown_dim_alpha (int): Opacity of the dim layer behind the countdown.
+            countdown_subtitle (str): Optional text shown under the countdown number.
+            health_bar_back_color (tuple): Color of the empty part of the health bars.
+            health_bar_colors (tuple): (player, opponent) health fill colors.
+            show_health_text (bool): Draw "Name: HP" above the health bars.
+        """
+        self.name = name
+        self.background_path = background_path
+        self.background_fallback_color = background_fallback_color
+        self.opponent_name = opponent_name
+        self.rules = rules
+        self.countdown_seconds = countdown_seconds
+        self.countdown_dim_alpha = countdown_dim_alpha
+        self.countdown_subtitle = countdown_subtitle
+        self.health_bar_back_color = health_bar_back_color
+        self.health_bar_colors = health_bar_colors
+        self.show_health_text = show_health_text
+
+    def asset_keys(self, player_character_name, opponent_character_name=None):
+        """Asset cache keys a FightStage for this spec loads (background and both characters' sprites)."""
+        keys = [assetCache.asset_cache.make_key(self.background_path, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT))]
+        for character_name in (player_character_name, opponent_character_name or self.opponent_name):
+            keys.extend(character_asset_keys(character_name))
+        return keys
+
+    def warm_frame_banks(self, player_character_name, opponent_character_name=None):
+        """Slices both fighters' animation frames and hit masks ahead of time (their sheets should be cached by now)."""
+        for character_name in (player_character_name, opponent_character_name or self.opponent_name):
+            bank = get_frame_bank(character_name)
+            if config.PIXEL_PERFECT_HITS:
+                bank.build_masks()
+
+class FightStage(Scene):
+    """
+    Runs a one-on-one fight for any StageSpec, as a scene (see sceneManager.py).
+
+    Game logic is stepped at a fixed config.SIMULATION_HZ rate, independent of how fast frames
+    are drawn: slow frames run several simulation steps (up to config.MAX_SIMULATION_STEPS_PER_FRAME)
+    instead of slowing the fight down. Entering the stage pushes its CountdownScene on top; the
+    stage replaces itself with the WinnerScreen once someone wins. Input goes through an
+    InputQueue, which hands each step the events that arrived during it (see fightInput.py).
+    """
+    event_types = FIGHT_EVENT_TYPES
+
+    def __init__(self, screen, spec, player_character_name, opponent_character_name=None):
+        self.screen = screen
+        self.spec = spec
+        self.player_character_name = player_character_name
+        self.opponent_character_name = opponent_character_name or spec.opponent_name
+        self.background_image = None
+
+        self.player = None
+        self.opponent = None
+        self.all_sprites = pygame.sprite.RenderUpdates()
+
+        # Everything random in the fight comes from this seed, so seed + inputs replay it exactly
+        self.seed = random.randrange(2 ** 32)
+        self.input = InputQueue()
+        self._steps_run = 0     # Simulation steps since the fight started, what input is stamped with
+        self.recorder = None    # fightReplay.ReplayWriter while config.REPLAY_RECORDING
+        self._accumulator = 0.0 # Milliseconds not simulated yet
+        self._last_ticks = 0
+
+        self._load_background_image()
+        self._setup_characters()
+        self.renderer = StageRenderer(self.screen, self.background_image)
+
+    def _load_background_image(self):
+        try:
+            # Matches your folder spelling: "assests"
+            self.background_image = assetCache.load_image(self.spec.background_path, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        except pygame.error as e:
+            print(f"Error loading background image ({self.spec.background_path}): {e}")
+            self.background_image = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+            self.background_image.fill(self.spec.background_fallback_color)
+
+    def _setup_characters(self):
+        player_initial_x = config.SCREEN_WIDTH * 0.2
+        opponent_initial_x = config.SCREEN_WIDTH * 0.8
+        ground_y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
+
+        self.player = Player(self.player_character_name, player_initial_x, ground_y, is_player_controlled=True)
+        self.opponent = Player(self.opponent_character_name, opponent_initial_x, ground_y, is_player_controlled=False)
+
+        self.all_sprites.add(self.player)
+        self.all_sprites.add(self.opponent)
+
+        # The fight itself is simulated headlessly, the Players only display it
+        self.match = fightSimulation.Match(self.player.fighter, self.opponent.fighter, rules=self.spec.rules,
+                                           seed=self.seed)
+        self.search_ai = None
+        if config.OPPONENT_AI == "lookahead":
+            self.search_ai = searchAI.LookaheadAI()
+            self.search_ai.calibrate(self.match, 1) # Now rather than on the first decision mid fight
+            if config.REPLAY_RECORDING:
+                # Only the node budget (stored in the replay) may cut a search short, or a slow
+                # frame would make a decision the replay can't reproduce
+                self.search_ai.budget_ms = None
+            self.match.controllers[1] = self.search_ai
+            self._search_nodes_seen = 0
+            self._search_nodes_per_frame = deque(maxlen=config.FPS_CAP) # About the last second
+        self.hit_test = None
+        self.show_hit_masks = False
+        if config.PIXEL_PERFECT_HITS:
+            self.hit_test = MaskHitTest([(self.player.fighter, self.player.frame_bank),
+                                         (self.opponent.fighter, self.opponent.frame_bank)])
+            self.match.connects = self.hit_test
+
+    def reseed(self, seed):
+        """Restarts the fight's random numbers from seed (replays use the recorded one)."""
+        self.seed = seed
+        self.match.rng.seed(seed)
+
+    def run(self):
+        """Plays the stage on its own (no menus around it). Returns "quit" or "level_select"."""
+        return SceneManager(self.screen).run(self)
+
+    # --- SCENE HOOKS ---
+
+    def enter(self):
+        self._accumulator = 0.0
+        self.manager.push(CountdownScene(self)) # Gameplay inputs are locked until it finishes
+
+    def resume(self, result=None):
+        # The simulation clock starts when the countdown is over
+        self._last_ticks = pygame.time.get_ticks()
+        self.input.clear()
+        self.renderer.request_full_redraw()
+
+    def exit(self):
+        self._stop_recording()
+        profiler.dump_csv()
+        if config.INPUT_LATENCY_LOG:
+            print(self.input.summary_line())
+        # The fight's sprites, background and renderer go now, not whenever the stage is collected
+        # (shared images stay in the asset cache for the next fight)
+        self.all_sprites.empty()
+        self.background_image = None
+        self.renderer = None
+
+    def handle_event(self, event):
+        if self._handle_debug_keys(event):
+            return
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_q:
+            self.manager.pop("level_select")
+        self._handle_player_input(event)
+
+    def _handle_debug_keys(self, event):
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == pygame.K_F2:
+            self.renderer.toggle_dirty_rects() # Compare against full redraws
+            return True
+        if event.key == pygame.K_F4 and self.hit_test:
+            self.show_hit_masks = not self.show_hit_masks
+            return True
+        return False
+
+    def update(self):
+        """Game logic update, in fixed steps."""
+        step_ms = 1000.0 / config.SIMULATION_HZ
+        now_ticks = pygame.time.get_ticks()
+        self._accumulator += now_ticks - self._last_ticks
+        self._last_ticks = now_ticks
+
+        steps = 0
+        while self._accumulator >= step_ms:
+            self._accumulator -= step_ms
+            steps += 1
+            # The frame's last step also takes input stamped for steps that haven't run yet
+            last = self._accumulator < step_ms or steps >= config.MAX_SIMULATION_STEPS_PER_FRAME
+            bits = self.input.take(self._steps_run, last)
+            if self.recorder is None and config.REPLAY_RECORDING:
+                self._start_recording()
+            if self.recorder:
+                self.recorder.record(bits)
+            winner = self._simulation_step(bits)
+            self._steps_run += 1
+            if winner is not None:
+                self.manager.replace(WinnerScreen(self.screen, winner))
+                return
+            if steps >= config.MAX_SIMULATION_STEPS_PER_FRAME:
+                # Too far behind to catch up: let the fight slow down rather than spiral
+                self._accumulator = 0.0
+                break
+
+    def draw(self, screen, full_redraw=False):
+        """Background, fighters and health bars (full_redraw for frames with overlays on top)."""
+        self.renderer.draw_frame(self.all_sprites, self._get_hud_items(),
+                                 full_redraw=full_redraw or self.show_hit_masks,
+                                 mark=profiler.mark if profiler.enabled else None)
+        if self.show_hit_masks:
+            self.renderer.draw_overlay(lambda surface: self.hit_test.draw_debug(surface, self.match.fighters))
+        profiler.mark("overlays")
+
+    def present(self):
+        self.renderer.present()
+        self.input.presented()
+
+    # Key -> INPUT_* bit for presses (releases only matter for the movement keys)
+    KEY_INPUTS = {
+        pygame.K_a: fightSimulation.INPUT_LEFT_DOWN,
+        pygame.K_s: fightSimulation.INPUT_RIGHT_DOWN,
+        pygame.K_SPACE: fightSimulation.INPUT_JUMP,
+        pygame.K_j: fightSimulation.INPUT_PUNCH,
+        pygame.K_w: fightSimulation.INPUT_MID,
+        pygame.K_e: fightSimulation.INPUT_SUPER,
+    }
+    KEY_RELEASE_INPUTS = {
+        pygame.K_a: fightSimulation.INPUT_LEFT_UP,
+        pygame.K_s: fightSimulation.INPUT_RIGHT_UP,
+    }
+
+    def _handle_player_input(self, event):
+        """
+        Turns one input event into INPUT_* bits for the simulation step it arrived during, which
+        applies them (see fightSimulation.apply_input). Going through bits is what makes fights
+        recordable.
+        """
+        if self.player.is_player_controlled:
+            self._queue_input(event)
+
+    def _queue_input(self, event):
+        bits = self._input_bits(event)
+        if not bits:
+            return
+        # The simulation clock runs on pygame ticks; event.received is a perf_counter() time
+        step_ms = 1000.0 / config.SIMULATION_HZ
+        ticks = pygame.time.get_ticks() - (time.perf_counter() - event.received) * 1000.0
+        step = self._steps_run + max(0, int((self._accumulator + ticks - self._last_ticks) // step_ms))
+        self.input.add(bits, event.received, step)
+
+    def _input_bits(self, event):
+        if event.type == pygame.KEYDOWN:
+            return self.KEY_INPUTS.get(event.key, 0)
+        # Mouse Attack
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            return fightSimulation.INPUT_CLICK
+        # Stop Movement
+        if event.type == pygame.KEYUP:
+            return self.KEY_RELEASE_INPUTS.get(event.key, 0)
+        return 0
+
+    def _simulation_step(self, bits=0):
+        """
+        Advances the fight by one fixed step with the player's INPUT_* bits. Returns the winner's
+        name once someone is out of health.
+        """
+        fightSimulation.apply_input(self.player.fighter, bits)
+        # Physics, enemy AI decision, hits and the win/loss check
+        winner = self.match.step(mark=profiler.mark if profiler.enabled else None)
+        self.player.sync_view()
+        self.opponent.sync_view()
+        if winner is None:
+            return None
+        return self._winner_name(winner)
+
+    def _winner_name(self, winner):
+        """Name shown for match winner index 0 or 1 (level select can start a fight with no character picked)."""
+        return (self.player, self.opponent)[winner].character_name or ("Player", "Opponent")[winner]
+
+    def _replay_summary(self):
+        """How the fight stands, stored at the end of a replay so playback can be checked against it."""
+        return {"health": [self.player.health, self.opponent.health], "winner": self.match.winner}
+
+    def _start_recording(self):
+        os.makedirs(config.REPLAY_DIR, exist_ok=True)
+        if config.REPLAY_MAX_FILES is not None:
+            # Room for this fight's replay, so a machine left running doesn't fill its disk
+            fightReplay.prune_replays(config.REPLAY_DIR, max(0, config.REPLAY_MAX_FILES - 1))
+        stage_class = type(self)
+        header = {
+            "stage": f"{stage_class.__module__}:{stage_class.__qualname__}",
+            "player": self.player_character_name,
+            "opponent": self.opponent_character_name,
+            "seed": self.seed,
+            "simulation_hz": config.SIMULATION_HZ,
+            "pixel_perfect_hits": config.PIXEL_PERFECT_HITS,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "players": 1,
+            "opponent_ai": config.OPPONENT_AI,
+            "input_buffer_steps": config.INPUT_BUFFER_STEPS,
+            "input_motion_steps": config.INPUT_MOTION_STEPS,
+        }
+        if self.search_ai:
+            header["search_node_budget"] = self.search_ai.node_budget # Replays search exactly as much
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}_{stage_class.__name__}{fightReplay.FILE_EXTENSION}"
+        try:
+            self.recorder = fightReplay.ReplayWriter(os.path.join(config.REPLAY_DIR, name), header)
+        except OSError as e:
+            print(f"Replay recording disabled ({e})")
+            self.recorder = False # Don't retry every step
+
+    def _stop_recording(self):
+        if self.recorder:
+            self.recorder.close(self._replay_summary())
+            print(f"Replay saved to {self.recorder.path} ({self.recorder.steps} steps)")
+        self.recorder = None
+
+    def _get_hud_items(self):
+        """HUD entries for the renderer: (name, value that changes its look, draw function)."""
+        items = [
+            ("player_health", self.player.health, self._draw_player_health_bar),
+            ("opponent_health", self.opponent.health, self._draw_opponent_health_bar),
+        ]
+        if self.search_ai:
+            nodes = self.search_ai.stats["nodes"]
+            self._search_nodes_per_frame.append(nodes - self._search_nodes_seen)
+            self._search_nodes_seen = nodes
+        if profiler.show_overlay:
+            width, height = render_target.internal_size
+            extra = [f"renderer    {'dirty rects' if self.renderer.dirty_rects_enabled else 'full redraw'}, {width}x{height}"
+                     f"{' (dynamic)' if render_target.dynamic else ''}"]
+            if self.hit_test:
+                stats = self.hit_test.stats
+                extra.append(f"hit tests   {stats['tests']} ({stats['rect_rejects']} rect rejects, {stats['hits']} hits)")
+            if self.search_ai:
+                history = self._search_nodes_per_frame
+                extra.append(f"search ai   {sum(history) / len(history):.1f} nodes/frame, max {max(history)} "
+                             f"({self.search_ai.stats['cut_short']} cut short)")
+            extra.append(self.input.summary_line())
+            extra.append(surface_pool.summary_line())
+            extra.append(textCache.summary_line())
+            if self.manager:
+                extra.append(self.manager.timing_summary())
+            items.append(("profiler", profiler.refresh_overlay(extra), self._draw_profiler_overlay))
+        return items
+
+    def _draw_profiler_overlay(self, screen):
+        return profiler.draw_overlay(screen, (10, 100)) # Below the health bars
+
+    def _draw_player_health_bar(self, screen):
+        return self._draw_health_bar(screen, self.player, (50, 40), self.spec.health_bar_colors[0])
+
+    def _draw_opponent_health_bar(self, screen):
+        return self._draw_health_bar(screen, self.opponent, (config.SCREEN_WIDTH - 250, 40), self.spec.health_bar_colors[1])
+
+    def _draw_health_bar(self, screen, character, position, color):
+        """Draws a health bar (and optionally the character's name) and returns the area it covered."""
+        bar_width, bar_height = 200, 25
+        health_perc = max(0, character.health / 45.0)
+        bar_rect = pygame.Rect(position[0], position[1], bar_width, bar_height)
+
+        # Background
+        pygame.draw.rect(screen, self.spec.health_bar_back_color, bar_rect, border_radius=5)
+        # Health Fill
+        pygame.draw.rect(screen, color, (position[0], position[1], int(bar_width * health_perc), bar_height), border_radius=5)
+        # Outline
+        pygame.draw.rect(screen, config.BLACK, bar_rect, 2, border_radius=5)
+
+        if not self.spec.show_health_text:
+            return bar_rect
+
+        font = textCache.get_font(None, 24)
+        name_text = textCache.render_text(font, f"{character.character_name}: {int(character.health)} HP", config.BLACK)
+        name_rect = screen.blit(name_text, (position[0], position[1] - 25))
+        return name_rect.union(bar_rect)
+
+    def _compose_countdown_overlay(self, overlay, time_left):
+        """
+        Fills overlay with a dim background and a large timer, in premultiplied alpha for a
+        pygame.BLEND_PREMULTIPLIED blit (see CountdownScene).
+        """
+        overlay.fill((0, 0, 0, self.spec.countdown_dim_alpha)) # Translucent black
+
+        font = textCache.get_font("Arial", 120, bold=True)
+        # Use Gold color for the timer
+        text_surf = textCache.render_text(font, str(time_left), (255, 215, 0), premultiplied=True)
+        text_rect = text_surf.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2))
+        overlay.blit(text_surf, text_rect, special_flags=pygame.BLEND_PREMULTIPLIED)
+
+        if self.spec.countdown_subtitle:
+            sub_font = textCache.get_font("Arial", 40)
+            sub_surf = textCache.render_text(sub_font, self.spec.countdown_subtitle, (255, 255, 255), premultiplied=True)
+            sub_rect = sub_surf.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 + 100))
+            overlay.blit(sub_surf, sub_rect, special_flags=pygame.BLEND_PREMULTIPLIED)
+
+class CountdownScene(Scene):
+    """
+    The seconds before a fight: the stage stands still under the countdown and the controls.
+
+    Both overlays are composed into one pooled surface, which is only redone when the number
+    changes; the controls part is composed once, in enter(). Each frame is then a single blit.
+    """
+    event_types = FIGHT_EVENT_TYPES
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.time_left = stage.spec.countdown_seconds
+        self._start_ticks = 0
+        self._controls = None
+        self._overlay = None
+        self._overlay_time = None # time_left the overlay shows
+
+    def enter(self):
+        self._start_ticks = pygame.time.get_ticks()
+        size = (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+        self._controls = surface_pool.acquire(size, pygame.SRCALPHA)
+        self._controls.fill((0, 0, 0, 0))
+        draw_controls_overlay(self._controls)
+        self._overlay = surface_pool.acquire(size, pygame.SRCALPHA)
+
+    def exit(self):
+        surface_pool.release(self._controls)
+        surface_pool.release(self._overlay)
+        self._controls = self._overlay = None
+
+    def handle_event(self, event):
+        self.stage._handle_debug_keys(event)
+
+    def update(self):
+        seconds_passed = (pygame.time.get_ticks() - self._start_ticks) // 1000
+        self.time_left = max(0, self.stage.spec.countdown_seconds - seconds_passed)
+        if self.time_left <= 0:
+            self.manager.pop()
+
+    def draw(self, screen):
+        self.stage.draw(screen, full_redraw=True) # The overlays cover the whole screen
+        if self._overlay_time != self.time_left:
+            self.stage._compose_countdown_overlay(self._overlay, self.time_left)
+            self._overlay.blit(self._controls, (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+            self._overlay_time = self.time_left
+        self.stage.renderer.draw_overlay(self._blit_overlay, premultiplied=True)
+        profiler.mark("overlays")
+
+    def _blit_overlay(self, surface):
+        surface.blit(self._overlay, (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    def present(self):
+        self.stage.renderer.present()
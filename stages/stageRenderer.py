@@ -0,0 +1,235 @@
+# stages/stageRenderer.py
+import pygame
+import config
+from renderTarget import render_target
+from surfacePool import surface_pool
+
+class StageRenderer:
+    """
+    Draws a fight stage, either as a full redraw or by only refreshing dirty rectangles.
+
+    In dirty rect mode the background is restored only under the fighters' old positions
+    and under HUD items whose contents changed, and the frame is presented with
+    pygame.display.update(rects) instead of a full flip.
+
+    Sprites, HUD items and overlays are all placed in logical coordinates. When the render
+    target draws fights below the logical resolution (see renderTarget.py), the background and
+    sprite frames are drawn from copies scaled once, and HUD items and overlays are drawn on a
+    logical size layer whose touched area is scaled onto the canvas.
+    """
+    def __init__(self, screen, background_image, dirty_rects=None, target=None):
+        self.screen = screen
+        self.background_image = background_image
+        self.target = target or render_target
+        self.dirty_rects_enabled = config.DIRTY_RECT_RENDERING if dirty_rects is None else dirty_rects
+
+        self._hud_items = {} # name -> (key, rect last drawn)
+        self._dirty = []
+        self._frame_is_full = True
+        self._full_redraw_pending = True # First frame always paints the whole screen
+
+        # Set up by _sync_target() for the target's current render scale
+        self.canvas = None
+        self._generation = None
+        self._scaling = False
+        self._background = None
+        self._sprite_rects = {} # sprite -> (canvas rect, logical rect) last drawn at, while scaling
+        self._layer = None      # Logical size layer for HUD items and overlays, while scaling
+
+    def toggle_dirty_rects(self):
+        """Switches between dirty rect and full redraw modes (handy for comparing the two)."""
+        self.dirty_rects_enabled = not self.dirty_rects_enabled
+        self._full_redraw_pending = True
+
+    def request_full_redraw(self):
+        """Makes the next frame repaint (and present) the whole screen."""
+        self._full_redraw_pending = True
+
+    def _sync_target(self):
+        """Picks up a new render scale: another canvas, the background scaled to it and a full redraw."""
+        if self._generation == self.target.generation:
+            return
+        self._generation = self.target.generation
+        self.canvas = self.target.fight_canvas()
+        self._scaling = self.canvas.get_size() != self.target.logical_size
+        self._background = self.background_image
+        if self._scaling and self.background_image:
+            self._background = self.target.scaled_image(self.background_image)
+        self._sprite_rects = {}
+        self._hud_items = {}
+        self._full_redraw_pending = True
+
+    def draw_frame(self, sprites, hud_items=(), full_redraw=False, mark=None):
+        """
+        Draws one frame of the stage (background, sprites, then HUD on top).
+
+        Args:
+            sprites (pygame.sprite.RenderUpdates): The fighters.
+            hud_items (iterable): (name, key, draw_fn) tuples. draw_fn(screen) draws the item and
+                returns the pygame.Rect it touched; it is only called again when key changes or
+                a sprite overlaps the item.
+            full_redraw (bool): Force this frame to be fully repainted, e.g. while a
+                full-screen overlay is shown. The frame after it is repainted too.
+            mark (callable): Optional profiler hook, called with "background", "sprites" and "hud".
+        """
+        self._sync_target()
+        self._frame_is_full = full_redraw or self._full_redraw_pending or not self.dirty_rects_enabled
+        # Anything drawn over the whole screen this frame has to be erased by the next one
+        self._full_redraw_pending = full_redraw
+        self._dirty = []
+        if self._scaling:
+            self._draw_frame_scaled(sprites, hud_items, mark)
+            return
+        canvas = self.canvas
+
+        if self._frame_is_full:
+            if self.background_image:
+                canvas.blit(self.background_image, (0, 0))
+            if mark: mark("background")
+            sprites.draw(canvas)
+            if mark: mark("sprites")
+            self._hud_items = {}
+            for name, key, draw_fn in hud_items:
+                self._hud_items[name] = (key, draw_fn(canvas))
+            if mark: mark("hud")
+            return
+
+        # 1. Restore the background under every rect that is about to change
+        sprite_regions = [rect for rect in sprites.spritedict.values() if rect]
+        sprite_regions.extend(sprite.rect for sprite in sprites)
+        sprites.clear(canvas, self.background_image)
+
+        # HUD items that are no longer shown (e.g. a closed debug overlay) just get erased
+        shown = {item[0] for item in hud_items}
+        for name in [name for name in self._hud_items if name not in shown]:
+            rect = self._hud_items.pop(name)[1]
+            canvas.blit(self.background_image, rect, rect)
+            self._dirty.append(rect)
+
+        redraw_hud = []
+        for name, key, draw_fn in hud_items:
+            last = self._hud_items.get(name)
+            if last is not None and last[0] == key and last[1].collidelist(sprite_regions) == -1:
+                continue
+            if last is not None:
+                canvas.blit(self.background_image, last[1], last[1])
+                self._dirty.append(last[1])
+            redraw_hud.append((name, key, draw_fn))
+        if mark: mark("background")
+
+        # 2. Draw sprites, then the HUD items that were restored
+        self._dirty.extend(sprites.draw(canvas))
+        if mark: mark("sprites")
+        for name, key, draw_fn in redraw_hud:
+            rect = draw_fn(canvas)
+            self._hud_items[name] = (key, rect)
+            self._dirty.append(rect)
+        if mark: mark("hud")
+
+    def _draw_frame_scaled(self, sprites, hud_items, mark):
+        """draw_frame below the logical resolution; the same steps with rects mapped to the canvas."""
+        canvas, background, scale_rect = self.canvas, self._background, self.target.scale_rect
+        sprites.lostsprites = [] # Only RenderUpdates.clear() would empty it
+
+        if self._frame_is_full:
+            if background:
+                canvas.blit(background, (0, 0))
+            if mark: mark("background")
+            self._draw_sprites_scaled(sprites)
+            if mark: mark("sprites")
+            self._hud_items = {}
+            for name, key, draw_fn in hud_items:
+                self._hud_items[name] = (key, self._draw_logical(draw_fn))
+            if mark: mark("hud")
+            return
+
+        # 1. Restore the background under every rect that is about to change
+        sprite_regions = []
+        for sprite, (canvas_rect, logical_rect) in list(self._sprite_rects.items()):
+            sprite_regions.append(logical_rect)
+            canvas.blit(background, canvas_rect, canvas_rect)
+            self._dirty.append(canvas_rect)
+            if not sprites.has(sprite):
+                del self._sprite_rects[sprite]
+        sprite_regions.extend(sprite.rect for sprite in sprites)
+
+        shown = {item[0] for item in hud_items}
+        for name in [name for name in self._hud_items if name not in shown]:
+            rect = scale_rect(self._hud_items.pop(name)[1])
+            canvas.blit(background, rect, rect)
+            self._dirty.append(rect)
+
+        redraw_hud = []
+        for name, key, draw_fn in hud_items:
+            last = self._hud_items.get(name)
+            if last is not None and last[0] == key and last[1].collidelist(sprite_regions) == -1:
+                continue
+            if last is not None:
+                rect = scale_rect(last[1])
+                canvas.blit(background, rect, rect)
+                self._dirty.append(rect)
+            redraw_hud.append((name, key, draw_fn))
+        if mark: mark("background")
+
+        # 2. Draw sprites, then the HUD items that were restored
+        self._dirty.extend(self._draw_sprites_scaled(sprites))
+        if mark: mark("sprites")
+        for name, key, draw_fn in redraw_hud:
+            rect = self._draw_logical(draw_fn)
+            self._hud_items[name] = (key, rect)
+            self._dirty.append(scale_rect(rect))
+        if mark: mark("hud")
+
+    def _draw_sprites_scaled(self, sprites):
+        canvas, target = self.canvas, self.target
+        drawn = []
+        for sprite in sprites:
+            rect = canvas.blit(target.scaled_image(sprite.image), target.scale_pos(sprite.rect.topleft))
+            self._sprite_rects[sprite] = (rect, sprite.rect.copy())
+            drawn.append(rect)
+        return drawn
+
+    def _draw_logical(self, draw_fn, premultiplied=False):
+        """
+        Runs draw_fn(surface) in logical coordinates and returns the rect it reports. While
+        scaling it draws on the layer, and the reported area (all of it for None) is scaled
+        onto the canvas. premultiplied: draw_fn blits with pygame.BLEND_PREMULTIPLIED, and so
+        does the layer.
+        """
+        if not self._scaling:
+            return draw_fn(self.canvas)
+        if self._layer is None:
+            self._layer = pygame.Surface(self.target.logical_size, pygame.SRCALPHA)
+        layer = self._layer
+        rect = draw_fn(layer)
+        region = (rect or layer.get_rect()).clip(layer.get_rect())
+        if region.width and region.height:
+            dest = self.target.scale_rect(region)
+            flags = pygame.BLEND_PREMULTIPLIED if premultiplied else 0
+            if rect is None: # Whole layer overlays come every frame, scale them into a pooled surface
+                with surface_pool.scratch(dest.size, pygame.SRCALPHA) as scaled:
+                    pygame.transform.smoothscale(layer, dest.size, scaled)
+                    self.canvas.blit(scaled, dest, special_flags=flags)
+            else:
+                self.canvas.blit(pygame.transform.smoothscale(layer.subsurface(region), dest.size), dest, special_flags=flags)
+        layer.fill((0, 0, 0, 0), region)
+        return rect
+
+    def draw_overlay(self, draw_fn, premultiplied=False):
+        """
+        Draws a full-screen overlay (countdown, controls, debug views) over the frame.
+        draw_fn(surface) draws in logical coordinates; premultiplied if it blits pre-composed
+        premultiplied alpha surfaces with pygame.BLEND_PREMULTIPLIED. Use with
+        draw_frame(full_redraw=True).
+        """
+        def draw_everywhere(surface):
+            draw_fn(surface)
+            return None # Scale the whole layer
+        self._draw_logical(draw_everywhere, premultiplied)
+
+    def present(self):
+        """Puts the frame on the display, updating only dirty regions when possible."""
+        if self._frame_is_full:
+            self.target.present(self.canvas)
+        elif self._dirty:
+            self.target.present(self.canvas, self._dirty)
@@ -0,0 +1,57 @@
+# startupTimeline.py
+"""
+Records how long each startup step takes, to see what is still on the path to the first frame.
+
+main.py imports this module first, calls mark() after every import/load and report() once the
+first frame is on screen. Work that is deferred until later (building the level select map,
+importing a stage) is timed with measure() and printed as it happens.
+Printing is controlled by config.STARTUP_TIMELINE_LOG.
+"""
+import time
+from contextlib import contextmanager
+
+import config
+
+_started = time.perf_counter()
+_last_mark = _started
+_entries = [] # (ms since startup, ms taken, label)
+_reported = False
+
+def _record(now, taken, label):
+    entry = ((now - _started) * 1000.0, taken * 1000.0, label)
+    _entries.append(entry)
+    if _reported and config.STARTUP_TIMELINE_LOG:
+        print(f"[startup] {entry[0]:9.1f} ms  {entry[1]:8.1f} ms  {label} (deferred)")
+
+def mark(label):
+    """Records that label just finished; its cost is the time since the previous mark."""
+    global _last_mark
+    now = time.perf_counter()
+    _record(now, now - _last_mark, label)
+    _last_mark = now
+
+@contextmanager
+def measure(label):
+    """Times the body of a with block as one entry (for work done on demand)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        now = time.perf_counter()
+        _record(now, now - started, label)
+
+def report():
+    """Call once the first frame is on screen: marks it and prints the timeline so far."""
+    global _reported
+    if _reported:
+        return
+    mark("first frame")
+    _reported = True
+    if config.STARTUP_TIMELINE_LOG:
+        print("[startup]     at (ms)  took (ms)  step")
+        for at, taken, label in _entries:
+            print(f"[startup] {at:9.1f} ms  {taken:8.1f} ms  {label}")
+
+def get_entries():
+    """Returns the recorded (ms since startup, ms taken, label) entries."""
+    return list(_entries)
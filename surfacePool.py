@@ -0,0 +1,95 @@
+# surfacePool.py
+from contextlib import contextmanager
+
+import pygame
+import config
+from assetCache import surface_bytes
+
+
+class SurfacePool:
+    """
+    Scratch surfaces handed out by size and flags, so large temporary surfaces (full screen
+    overlays, scaling targets) are allocated once and reused instead of made every frame.
+
+    acquire() a surface, draw on it (its old contents are still there) and release() it when
+    done; scratch() does both around a with block. Released surfaces are kept for the next
+    acquire of the same size and flags, up to budget_bytes, least recently released dropped first.
+    """
+
+    def __init__(self, budget_bytes=config.SURFACE_POOL_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self._free = []     # (size, flags, surface, bytes), least recently released first
+        self._in_use = {}   # id(surface) -> (size, flags, bytes)
+        self.bytes_free = 0
+        self.bytes_in_use = 0
+        self.allocations = 0
+        self.reuses = 0
+        self.evictions = 0
+
+    def acquire(self, size, flags=0):
+        """Returns a surface of size with flags (e.g. pygame.SRCALPHA), reused if one is free."""
+        size = (int(size[0]), int(size[1]))
+        for index, (free_size, free_flags, surface, nbytes) in enumerate(self._free):
+            if free_size == size and free_flags == flags:
+                del self._free[index]
+                self.bytes_free -= nbytes
+                self.reuses += 1
+                break
+        else:
+            surface = pygame.Surface(size, flags)
+            nbytes = surface_bytes(surface)
+            self.allocations += 1
+        self._in_use[id(surface)] = (size, flags, nbytes)
+        self.bytes_in_use += nbytes
+        return surface
+
+    def release(self, surface):
+        """Gives back a surface from acquire(). Nothing may draw on or keep it afterwards."""
+        size, flags, nbytes = self._in_use.pop(id(surface))
+        self.bytes_in_use -= nbytes
+        self._free.append((size, flags, surface, nbytes))
+        self.bytes_free += nbytes
+        while self.bytes_free > self.budget_bytes:
+            self.bytes_free -= self._free.pop(0)[3]
+            self.evictions += 1
+
+    @contextmanager
+    def scratch(self, size, flags=0):
+        """with surface_pool.scratch(size, flags) as surface: ... (released afterwards)."""
+        surface = self.acquire(size, flags)
+        try:
+            yield surface
+        finally:
+            self.release(surface)
+
+    def clear(self):
+        """Drops every free surface (statistics are kept)."""
+        self._free = []
+        self.bytes_free = 0
+
+    def get_stats(self):
+        """Returns allocation/reuse counters and the pixel memory the pool holds."""
+        return {
+            "allocations": self.allocations,
+            "reuses": self.reuses, # Allocations avoided
+            "evictions": self.evictions,
+            "in_use": len(self._in_use),
+            "free": len(self._free),
+            "bytes_held": self.bytes_in_use + self.bytes_free,
+            "bytes_free": self.bytes_free,
+            "budget_bytes": self.budget_bytes,
+        }
+
+    def summary_line(self):
+        """Pool stats as one line, for the profiler overlay."""
+        return (f"surf pool   {self.reuses} reused, {self.allocations} allocated, "
+                f"{(self.bytes_in_use + self.bytes_free) / (1024 * 1024):.1f} MB held")
+
+
+# Shared pool used by the fight overlays and the stage renderer
+surface_pool = SurfacePool()
+
+
+def get_stats():
+    """Returns the shared surface pool statistics."""
+    return surface_pool.get_stats()
@@ -0,0 +1,89 @@
+# textCache.py
+from collections import OrderedDict
+
+import pygame
+import config
+
+# One Font instance per (face, size, bold, italic)
+_font_pool = {}
+
+# (font, text, color, antialias) -> rendered surface, least recently used first
+_rendered_text = OrderedDict()
+
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "fonts_created": 0}
+
+
+def get_font(name, size, bold=False, italic=False):
+    """
+    Returns the shared Font for a face/size/style, creating it on first use.
+
+    Args:
+        name (str | None): System font name (e.g. "Arial"), or None for pygame's default font.
+        size (int): Font size.
+        bold (bool): Bold style.
+        italic (bool): Italic style.
+    """
+    key = (name, size, bold, italic)
+    font = _font_pool.get(key)
+    if font is None:
+        if name is None:
+            font = pygame.font.Font(None, size)
+            font.set_bold(bold)
+            font.set_italic(italic)
+        else:
+            font = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+        _font_pool[key] = font
+        _stats["fonts_created"] += 1
+    return font
+
+
+def render_text(font, text, color, antialias=True, premultiplied=False):
+    """
+    Renders text with a pooled font, reusing the surface if this exact string was drawn before.
+
+    The returned surface is shared, so callers must not draw onto it. premultiplied returns it
+    with premultiplied alpha, for blits with pygame.BLEND_PREMULTIPLIED.
+    """
+    key = (font, text, tuple(color), antialias, premultiplied)
+    surface = _rendered_text.get(key)
+    if surface is not None:
+        _rendered_text.move_to_end(key)
+        _stats["hits"] += 1
+        return surface
+
+    _stats["misses"] += 1
+    surface = font.render(text, antialias, color)
+    if premultiplied:
+        # Rendered text can have padded rows, which premul_alpha() garbles; copies don't
+        surface = surface.copy().premul_alpha()
+    _rendered_text[key] = surface
+    if len(_rendered_text) > config.TEXT_CACHE_MAX_ENTRIES:
+        _rendered_text.popitem(last=False)
+        _stats["evictions"] += 1
+    return surface
+
+
+def clear():
+    """Drops every cached text surface (the font pool is kept)."""
+    _rendered_text.clear()
+
+
+def get_stats():
+    """Returns font pool size and rendered text cache hit/miss counters."""
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        "fonts": len(_font_pool),
+        "cached_surfaces": len(_rendered_text),
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "hit_rate": _stats["hits"] / lookups if lookups else 0.0,
+        "evictions": _stats["evictions"],
+        "fonts_created": _stats["fonts_created"],
+    }
+
+
+def summary_line():
+    """Text cache stats as one line, for the profiler overlay."""
+    stats = get_stats()
+    return (f"text cache  {stats['hit_rate']:.1%} hits ({stats['misses']} rendered), "
+            f"{stats['cached_surfaces']} surfaces")